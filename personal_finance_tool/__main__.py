@@ -0,0 +1,7 @@
+# __main__.py
+"""Entry point for `python -m personal_finance_tool` (see cli.py)."""
+import sys
+
+from .cli import main
+
+sys.exit(main())
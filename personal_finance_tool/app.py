@@ -1,10 +1,27 @@
 # app.py
+import queue
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog
+from tkinter import ttk, messagebox, simpledialog, filedialog
 from datetime import datetime
 from ui.tabs import create_tabs
-from core.budget import set_budget, check_budget_alerts
-# from core.report import show_spending_pie_chart  # Removed due to unknown symbol
+from ui.dialogs import PerformanceDialog
+from ui.scheduler import RefreshScheduler
+from core.budget import set_budget
+from core.alerts import get_alert_engine, format_alert
+from core.importer import import_file
+from core.executor import QueryExecutor
+from core.profiler import profiled_action
+# core.report is imported on first use in show_report(); matplotlib only when a chart is first drawn
+
+# Report menu entries: (label, function name in core.report)
+REPORTS = [
+    ("📊 Spending by Category", "show_spending_pie_chart"),
+    ("💰 Income vs Expenses", "show_income_vs_expense_chart"),
+    ("📈 Monthly Trend", "show_monthly_trend_chart"),
+    ("📋 Category Breakdown", "show_category_breakdown_report"),
+]
+
+ALERT_POLL_MS = 200    # how often the Tk thread picks up queued budget alerts
 
 class FinanceApp:
     def __init__(self, root):
@@ -13,9 +30,18 @@ class FinanceApp:
         self.root.geometry("800x600")
         self.root.configure(bg="#f0f0f0")
 
+        # Database work for the tabs runs off the Tk thread
+        self.executor = QueryExecutor(self.root)
+
+        # Budget alerts can be raised on any thread (e.g. an import running on
+        # the executor); they are queued and shown together by the Tk thread
+        self.alerts = get_alert_engine()
+        self.alerts.subscribe(self.on_budget_alert)
+        self.pending_alerts = queue.SimpleQueue()
+        self.root.after(ALERT_POLL_MS, self.poll_budget_alerts)
+
         self.create_widgets()
-        self.refresh_transactions()
-        self.refresh_budget_summary()
+        self.refresh_all()
 
     def create_widgets(self):
         """Create the main UI with tabs."""
@@ -33,23 +59,40 @@ class FinanceApp:
         self.tabs = self.tabs_data['tabs']
         self.notebook = self.tabs_data['notebook']  # Store notebook reference
 
+        # Views refresh once per idle tick, and only while their tab is shown
+        self.scheduler = RefreshScheduler(self.root, self.notebook)
+        self.scheduler.register('transactions', self.tabs['view'].refresh_transactions, self.tabs['view'].frame)
+        self.scheduler.register('budget', self.tabs['budget'].refresh_budget_summary, self.tabs['budget'].frame)
+        self.scheduler.register('categories', self.tabs['add'].refresh_categories, self.tabs['add'].frame)
+
         # Buttons Frame (outside tabs)
         btn_frame = tk.Frame(self.root, bg="#f0f0f0")
         btn_frame.pack(pady=10)
 
         tk.Button(btn_frame, text="Set Budget", command=self.set_budget, bg="#FF9800", fg="white", width=15).pack(side="left", padx=5)
-        tk.Button(btn_frame, text="View Report", command=lambda: messagebox.showinfo("Report", "Report feature not implemented."), bg="#9C27B0", fg="white", width=15).pack(side="left", padx=5)
+        self.report_btn = tk.Button(btn_frame, text="View Report", command=self.open_report_menu, bg="#9C27B0", fg="white", width=15)
+        self.report_btn.pack(side="left", padx=5)
+
+        self.report_menu = tk.Menu(self.root, tearoff=0)
+        for label, report_name in REPORTS:
+            self.report_menu.add_command(label=label, command=lambda name=report_name: self.show_report(name))
+        self.report_menu.add_separator()
+        self.report_menu.add_command(label="📝 Export to Text", command=self.export_report)
+        self.import_btn = tk.Button(btn_frame, text="Import...", command=self.import_transactions, bg="#009688", fg="white", width=15)
+        self.import_btn.pack(side="left", padx=5)
         tk.Button(btn_frame, text="Refresh All", command=self.refresh_all, bg="#607D8B", fg="white", width=15).pack(side="left", padx=5)
+        tk.Button(btn_frame, text="Performance", command=self.show_performance, bg="#795548", fg="white", width=15).pack(side="left", padx=5)
 
     # ==================== Delegates to tabs ====================
+    # Refreshes are requests: the scheduler runs them on the next idle tick
     def refresh_transactions(self):
-        self.tabs['view'].refresh_transactions()
+        self.scheduler.mark_dirty('transactions')
 
     def refresh_budget_summary(self):
-        self.tabs['budget'].refresh_budget_summary()
+        self.scheduler.mark_dirty('budget')
 
     def refresh_categories(self):
-        self.tabs['add'].refresh_categories()
+        self.scheduler.mark_dirty('categories')
 
     # ==================== Category Management ====================
     def add_category(self):
@@ -62,15 +105,100 @@ class FinanceApp:
     def add_transaction(self):
         self.tabs['add'].add_transaction()
 
+    @profiled_action
+    def import_transactions(self):
+        """
+        Bulk-import a CSV/OFX statement on the executor, so the window keeps
+        responding, then refresh and alert once at the end.
+        """
+        path = filedialog.askopenfilename(
+            title="Import Transactions",
+            filetypes=[("Bank statements", "*.csv *.ofx *.qfx"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+
+        self.import_btn.config(state="disabled")
+        loading = tk.Toplevel(self.root)
+        loading.title("Import Transactions")
+        tk.Label(loading, text=f"⏳ Importing {path}…", font=("Helvetica", 11), padx=30, pady=20).pack()
+
+        def on_done(result):
+            loading.destroy()
+            self.import_btn.config(state="normal")
+            self.show_import_result(result)
+
+        def on_error(error):
+            loading.destroy()
+            self.import_btn.config(state="normal")
+            messagebox.showerror("Import Failed", f"Failed to import {path}: {error}")
+
+        self.executor.submit(import_file, path, on_done=on_done, on_error=on_error)
+
+    def show_import_result(self, result):
+        """Refresh, sync budget alerts and summarize a finished import (Tk thread)."""
+        self.refresh_all()
+        self.alerts.sync()
+
+        message = (f"✅ Imported {result['rows_imported']:,} of {result['rows_read']:,} rows "
+                   f"in {result['seconds']:.2f}s ({result['rows_per_sec']:,.0f} rows/sec).")
+        if result['rows_invalid']:
+            first_errors = "\n".join(f"Line {line}: {error}" for line, error in result['errors'][:10])
+            message += f"\n\nSkipped {result['rows_invalid']:,} invalid rows:\n{first_errors}"
+        messagebox.showinfo("Import Complete", message)
+
+    # ==================== Reports ====================
+    def open_report_menu(self):
+        x = self.report_btn.winfo_rootx()
+        y = self.report_btn.winfo_rooty() + self.report_btn.winfo_height()
+        self.report_menu.tk_popup(x, y)
+
+    @profiled_action
+    def show_report(self, report_name):
+        """Open a report window, importing the report module on first use."""
+        from core import report
+        getattr(report, report_name)(executor=self.executor)
+
+    @profiled_action
+    def export_report(self):
+        from core.report import export_report_to_text
+        export_report_to_text()
+
+    def show_performance(self):
+        PerformanceDialog(self)
+
     # ==================== Budget Management ====================
+    @profiled_action
     def set_budget(self):
         set_budget(self.root)
+        self.alerts.sync()
+
+    def on_budget_alert(self, alert):
+        """Alert engine subscriber; may run on any thread, so it only queues."""
+        self.pending_alerts.put(alert)
+
+    def poll_budget_alerts(self):
+        alerts = []
+        while True:
+            try:
+                alerts.append(self.pending_alerts.get_nowait())
+            except queue.Empty:
+                break
+        if alerts:
+            self.show_budget_alerts(alerts)
+        # Rescheduled after the popup closes, so popups never stack
+        self.root.after(ALERT_POLL_MS, self.poll_budget_alerts)
+
+    def show_budget_alerts(self, alerts):
+        """Show one consolidated popup for the alerts raised since the last one."""
+        title = "Budget Exceeded!" if any(alert['threshold'] >= 100 for alert in alerts) else "Budget Alert"
+        message = "Spending has reached a budget threshold in the following categories:\n\n"
+        messagebox.showwarning(title, message + "\n".join(format_alert(alert) for alert in alerts))
 
     def view_budgets(self):
         self.tabs['budget'].view_budgets()
 
     # ==================== Refresh Methods ====================
+    @profiled_action
     def refresh_all(self):
-        self.refresh_transactions()
-        self.refresh_categories()
-        self.refresh_budget_summary()
\ No newline at end of file
+        self.scheduler.mark_dirty()
\ No newline at end of file
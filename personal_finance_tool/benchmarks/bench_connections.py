@@ -0,0 +1,119 @@
+# benchmarks/bench_connections.py
+"""
+Per-operation latency of a fresh sqlite3.connect() per call (the old
+behaviour) versus the pooled, pre-configured connections in core.database.
+
+Run from the repository root:
+    python -m personal_finance_tool.benchmarks.bench_connections [--rows N] [--repeat N]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from ..core.database import ConnectionPool
+
+CATEGORIES = ['Rent', 'Groceries', 'Utilities', 'Entertainment', 'Transport', 'Dining',
+              'Shopping', 'Healthcare', 'Insurance', 'Salary', 'Other']
+MONTH = '2024-06'
+
+OPERATIONS = {
+    'get_category_budgets': (
+        "SELECT category, limit_amount FROM budgets ORDER BY category", ()),
+    'get_category_spending': (
+        "SELECT COALESCE(SUM(amount), 0) FROM transactions "
+        "WHERE type = 'expense' AND category = ? AND strftime('%Y-%m', date) = ?",
+        ('Groceries', MONTH)),
+    'get_transactions_for_month': (
+        "SELECT date, type, category, amount, description FROM transactions "
+        "WHERE strftime('%Y-%m', date) = ? ORDER BY date DESC, id DESC",
+        (MONTH,)),
+}
+INSERT_SQL = ("INSERT INTO transactions (date, type, category, amount, description) "
+              "VALUES ('2024-06-15', 'expense', 'Dining', 12.5, 'bench')")
+
+
+def build_database(path, rows):
+    """Create the schema and fill it with `rows` random transactions."""
+    rng = random.Random(42)
+    conn = sqlite3.connect(path)
+    conn.execute('''
+        CREATE TABLE transactions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date TEXT NOT NULL,
+            type TEXT NOT NULL,
+            category TEXT NOT NULL,
+            amount REAL NOT NULL,
+            description TEXT
+        )
+    ''')
+    conn.execute("CREATE TABLE budgets (category TEXT PRIMARY KEY, limit_amount REAL NOT NULL DEFAULT 0)")
+    conn.executemany("INSERT INTO budgets VALUES (?, ?)", [(c, 500.0) for c in CATEGORIES])
+    conn.executemany(
+        "INSERT INTO transactions (date, type, category, amount, description) VALUES (?, ?, ?, ?, ?)",
+        (
+            (f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+             'income' if rng.random() < 0.1 else 'expense',
+             rng.choice(CATEGORIES), round(rng.uniform(1, 300), 2), 'synthetic')
+            for _ in range(rows)
+        )
+    )
+    conn.commit()
+    conn.close()
+
+
+def time_per_call(func, repeat):
+    """Returns: mean microseconds per call."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=300)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        build_database(path, args.rows)
+        pool = ConnectionPool(path)
+
+        def per_call(sql, params, write=False):
+            def run():
+                conn = sqlite3.connect(path)
+                conn.execute(sql, params).fetchall()
+                if write:
+                    conn.commit()
+                conn.close()
+            return run
+
+        def pooled(sql, params, write=False):
+            def run():
+                if write:
+                    with pool.transaction() as conn:
+                        conn.execute(sql, params)
+                else:
+                    pool.acquire().execute(sql, params).fetchall()
+            return run
+
+        cases = [(name, sql, params, False) for name, (sql, params) in OPERATIONS.items()]
+        cases.append(('add_transaction', INSERT_SQL, (), True))
+
+        print(f"{args.rows} transactions, {args.repeat} calls per operation\n")
+        print(f"{'Operation':<28} {'connect/call (us)':>18} {'pooled (us)':>12} {'speedup':>8}")
+        print("-" * 70)
+        for name, sql, params, write in cases:
+            before = time_per_call(per_call(sql, params, write), args.repeat)
+            after = time_per_call(pooled(sql, params, write), args.repeat)
+            print(f"{name:<28} {before:>18.1f} {after:>12.1f} {before / after:>7.1f}x")
+
+        pool.close_all()
+
+
+if __name__ == "__main__":
+    main()
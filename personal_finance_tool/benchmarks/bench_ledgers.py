@@ -0,0 +1,106 @@
+# benchmarks/bench_ledgers.py
+"""
+Cross-ledger report scaling: one aggregate report (get_aggregate_report)
+over a portfolio of synthetic ledgers, run in this process and then in
+process pools of increasing size.
+
+The periods mix whole months, answered from the monthly_totals rollup,
+with rolling and custom ranges whose partial months are summed from the
+transactions table, so each ledger does real work. Worker start-up is
+timed separately: the pool is warmed before the measured runs, as it is
+in a long-running process serving many ledgers. Measured runs map
+uncached_period_totals over the ledgers, so the per-ledger totals behind
+the report are computed from an empty query cache in this process and in
+the workers alike.
+
+Run from the repository root:
+    python -m personal_finance_tool.benchmarks.bench_ledgers [--ledgers N]
+        [--rows N] [--workers 1,2,4] [--repeat N] [--data-dir DIR]
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+from ..core import database
+from ..core.ledgers import LedgerRegistry
+from ..core.periods import months_back, rolling, date_range, get_period_totals
+from .synthetic import build_ledger
+
+YEARS = 3
+
+
+def portfolio(data_dir, count, rows):
+    """Build the synthetic ledgers once and reuse them on later runs. Returns: {id: path}"""
+    ledgers = {}
+    for i in range(count):
+        path = os.path.join(data_dir, f"household_{i:03d}_{rows}_{datetime.now():%Y%m}.db")
+        if not os.path.exists(path):
+            print(f"building {path} ...", flush=True)
+            build_ledger(path, rows, years=YEARS, seed=i)
+            database.get_pool().close_all()
+        ledgers[f"household-{i:03d}"] = path
+    return ledgers
+
+
+def report_periods():
+    today = date.today()
+    return [*months_back(12), rolling(30), rolling(90),
+            date_range(today - timedelta(days=400), today - timedelta(days=200))]
+
+
+def uncached_period_totals(periods):
+    """get_period_totals() from an empty query cache, so every measured run does the work."""
+    database.get_pool().cache.invalidate()
+    return get_period_totals(periods)
+
+
+def time_report(registry, periods, repeat, parallel):
+    """Returns: median milliseconds per uncached cross-ledger report"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        registry.map_ledgers(uncached_period_totals, periods, parallel=parallel)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark reports across many ledgers.")
+    parser.add_argument('--ledgers', type=int, default=16)
+    parser.add_argument('--rows', type=int, default=200000, help="transactions per ledger")
+    parser.add_argument('--workers', default=','.join(str(n) for n in (1, 2, 4, 8)
+                                                      if n <= (os.cpu_count() or 1)) or '1')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'pft-bench'))
+    args = parser.parse_args()
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    ledgers = portfolio(args.data_dir, args.ledgers, args.rows)
+    periods = report_periods()
+    print(f"\n{args.ledgers} ledgers x {args.rows:,} rows, {len(periods)} periods, "
+          f"{os.cpu_count()} CPUs")
+
+    registry = LedgerRegistry(ledgers)
+    expected = registry.get_aggregate_report(periods, parallel=False)['combined']
+    in_process = time_report(registry, periods, args.repeat, parallel=False)
+    registry.close_all()
+    print(f"{'in process':<14} {in_process:10.1f} ms")
+
+    for workers in (int(n) for n in args.workers.split(',')):
+        registry = LedgerRegistry(ledgers, workers=workers)
+        start = time.perf_counter()
+        result = registry.get_aggregate_report(periods, parallel=True)
+        warmup_ms = (time.perf_counter() - start) * 1000
+        if result['combined'] != expected:
+            raise SystemExit(f"{workers} workers: combined report differs from the in-process one")
+        ms = time_report(registry, periods, args.repeat, parallel=True)
+        registry.close_all()
+        print(f"{workers:>2} workers     {ms:10.1f} ms  ({in_process / ms:4.2f}x, "
+              f"first call with start-up {warmup_ms:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+# benchmarks/bench_paths.py
+"""
+Latency of the database, budget and report paths the UI runs most, on
+synthetic ledgers of several sizes (see synthetic.py).
+
+Each path is timed cold (query cache cleared first) and warm (served from
+the cache where the path is cached). Results are written as JSON so runs
+can be compared between commits with --compare.
+
+check_budget_alerts and export_report_to_text end in a Tk dialog, so their
+tk-free parts are timed: get_budget_alert_messages, and formatting plus
+writing the report file. budget_alert_record is the per-insert cost of the
+incremental alert engine; cold, it includes the one seeding query.
+
+Run from the repository root:
+    python -m personal_finance_tool.benchmarks.bench_paths [--sizes 10k,1m,10m]
+        [--repeat N] [--data-dir DIR] [--output FILE] [--compare OLD.json]
+"""
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from ..core import database
+from ..core.alerts import BudgetAlertEngine
+from ..core.balance import get_transactions_page_with_balance
+from ..core.budget import get_budget_summary, get_budget_alert_messages
+from ..core.report_data import (
+    get_month_report,
+    get_monthly_summary_stats,
+    get_monthly_trend,
+    get_period_reports,
+    format_text_report
+)
+from ..core.periods import months_back
+from .synthetic import build_ledger
+
+SIZES = {'10k': 10000, '1m': 1000000, '10m': 10000000}
+YEARS = 5
+REGRESSION_RATIO = 1.25
+
+
+def bench_paths(report_path):
+    """Returns: dict of name -> zero-argument callable"""
+    month = datetime.now().strftime("%Y-%m")
+    today = datetime.now().strftime("%Y-%m-%d")
+    alerts = BudgetAlertEngine()
+
+    def export_report():
+        with open(report_path, 'w', encoding='utf-8') as f:
+            f.write(format_text_report(get_month_report()))
+
+    return {
+        'get_transactions_for_month': lambda: database.get_transactions_for_month(month),
+        'search_transactions': lambda: database.search_transactions('card', limit=200),
+        'transactions_page_with_balance': lambda: get_transactions_page_with_balance(month, limit=200),
+        'get_budget_summary': get_budget_summary,
+        'check_budget_alerts': get_budget_alert_messages,
+        'budget_alert_record': lambda: alerts.record(today, 'expense', 'Groceries', 0),
+        'get_monthly_summary_stats': get_monthly_summary_stats,
+        'export_report_to_text': export_report,
+        'monthly_trend': get_monthly_trend,
+        'period_reports_12_months': lambda: get_period_reports(months_back(12)),
+    }
+
+
+def time_ms(func, repeat, cold):
+    """Returns: dict with median and min milliseconds per call"""
+    samples = []
+    for _ in range(repeat):
+        if cold:
+            database.get_pool().cache.invalidate()
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {'median_ms': statistics.median(samples), 'min_ms': min(samples)}
+
+
+def ledger_path(data_dir, label, rows):
+    """Build the synthetic ledger for a size once and reuse it on later runs."""
+    path = os.path.join(data_dir, f"ledger_{label}_{datetime.now():%Y%m}.db")
+    if not os.path.exists(path):
+        print(f"building {rows:,} row ledger at {path} ...", flush=True)
+        start = time.perf_counter()
+        build_ledger(path + '.tmp', rows, years=YEARS)
+        database.get_pool().close_all()
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(path + '.tmp' + suffix):
+                os.replace(path + '.tmp' + suffix, path + suffix)
+        print(f"  built in {time.perf_counter() - start:.1f}s")
+    return path
+
+
+def git_commit():
+    """Returns: current commit hash, or None outside a git checkout"""
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(old, new):
+    """Print per-path changes against an earlier result file. Returns: regression count"""
+    regressions = 0
+    for size, paths in new['results'].items():
+        for name, modes in paths.items():
+            for mode, result in modes.items():
+                try:
+                    before = old['results'][size][name][mode]['median_ms']
+                except KeyError:
+                    continue
+                after = result['median_ms']
+                ratio = after / before if before else 1.0
+                flag = 'REGRESSION' if ratio > REGRESSION_RATIO else ''
+                regressions += bool(flag)
+                print(f"{size:>4} {name:<28} {mode:<5} {before:9.3f} -> {after:9.3f} ms "
+                      f"({ratio:5.2f}x) {flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark database, budget and report paths.")
+    parser.add_argument('--sizes', default='10k,1m,10m', help=f"comma-separated from {list(SIZES)}")
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'pft-bench'))
+    parser.add_argument('--output', default='bench_paths.json')
+    parser.add_argument('--compare', help="earlier result file to compare against")
+    args = parser.parse_args()
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    results = {}
+    for label in args.sizes.split(','):
+        path = ledger_path(args.data_dir, label, SIZES[label])
+        database.open_database(path)
+        database.init_db()
+
+        results[label] = {}
+        print(f"\n{label} rows ({args.repeat} calls each)")
+        print(f"{'Path':<28} {'cold ms':>10} {'warm ms':>10}")
+        print("-" * 50)
+        for name, func in bench_paths(os.path.join(args.data_dir, 'report.txt')).items():
+            func()  # page the data in
+            cold = time_ms(func, args.repeat, cold=True)
+            warm = time_ms(func, args.repeat, cold=False)
+            results[label][name] = {'cold': cold, 'warm': warm}
+            print(f"{name:<28} {cold['median_ms']:>10.3f} {warm['median_ms']:>10.3f}")
+        database.get_pool().close_all()
+
+    output = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+            'repeat': args.repeat,
+            'years': YEARS,
+        },
+        'results': results
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(output, f, indent=2)
+    print(f"\nresults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            regressions = compare(json.load(f), output)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
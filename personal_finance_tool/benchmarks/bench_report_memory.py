@@ -0,0 +1,142 @@
+# benchmarks/bench_report_memory.py
+"""
+Memory leak check for report charts: opens a report many times (1,000 by
+default) and checks that memory stops growing once the first few opens
+have warmed matplotlib's caches.
+
+Each open runs the report's chart loader from core.report, as the GUI
+does: query the data, then get the chart image from the chart cache.
+The cache is cleared before every open, so every open draws a new Figure;
+this is the path that leaked when figures were created through pyplot and
+never closed. With --cache the cache is kept, as in the GUI, so only the
+first open renders and the rest measure the cached PNG path. With
+--windows (needs a display) every open also shows the report window
+through core.report and closes it again, and the number of Tk images
+still alive is reported.
+
+Resident set size is read from /proc where available; live Python objects
+are counted either way. Exits non-zero when growth after warm-up exceeds
+--max-growth-mb.
+
+Run from the repository root:
+    python -m personal_finance_tool.benchmarks.bench_report_memory [--opens N]
+        [--report spending|income_vs_expense|trend] [--cache] [--windows]
+"""
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+
+from ..core import database, report
+from ..core.charts import get_chart_cache
+from .synthetic import build_ledger
+
+ROWS = 20000
+WARMUP_FRACTION = 0.1
+
+# report -> (chart loader, window function) in core.report
+REPORTS = {
+    'spending': (report.load_spending_chart, report.show_spending_pie_chart),
+    'income_vs_expense': (report.load_income_vs_expense_chart, report.show_income_vs_expense_chart),
+    'trend': (report.load_monthly_trend_chart, report.show_monthly_trend_chart),
+}
+
+
+def rss_mb():
+    """Returns: resident set size in MB, or None where /proc is unavailable"""
+    try:
+        with open('/proc/self/statm', encoding='ascii') as f:
+            pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+
+
+def sample():
+    gc.collect()
+    return {'rss_mb': rss_mb(), 'objects': len(gc.get_objects())}
+
+
+def open_report(name, use_cache, root=None):
+    """Open the report once, the way the GUI does."""
+    load, show = REPORTS[name]
+    if not use_cache:
+        get_chart_cache().clear()
+    if root is None:
+        load()
+        return
+
+    before = set(root.winfo_children())
+    show()
+    root.update()
+    for window in set(root.winfo_children()) - before:
+        window.destroy()
+    root.update()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check report charts for memory leaks.")
+    parser.add_argument('--opens', type=int, default=1000)
+    parser.add_argument('--report', choices=sorted(REPORTS), default='spending')
+    parser.add_argument('--cache', action='store_true',
+                        help="keep the chart cache, so only the first open renders a figure")
+    parser.add_argument('--windows', action='store_true', help="also show and close the report window")
+    parser.add_argument('--max-growth-mb', type=float, default=5.0)
+    args = parser.parse_args()
+
+    root = None
+    if args.windows:
+        import tkinter as tk
+        try:
+            root = tk.Tk()
+        except tk.TclError as e:
+            sys.exit(f"--windows needs a display: {e}")
+        root.withdraw()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        build_ledger(os.path.join(data_dir, 'ledger.db'), ROWS, years=1)
+
+        warmup = max(1, int(args.opens * WARMUP_FRACTION))
+        every = max(1, args.opens // 10)
+        start_time = time.perf_counter()
+        baseline = None
+        print(f"{'opens':>6} {'RSS MB':>9} {'objects':>9}")
+        for i in range(1, args.opens + 1):
+            open_report(args.report, args.cache, root)
+            if i == warmup:
+                baseline = sample()
+            if i % every == 0 or i == args.opens:
+                current = sample()
+                rss = f"{current['rss_mb']:9.1f}" if current['rss_mb'] is not None else f"{'n/a':>9}"
+                print(f"{i:>6} {rss} {current['objects']:>9,}")
+        elapsed = time.perf_counter() - start_time
+        final = sample()
+
+        if root is not None:
+            images = len(root.tk.call('image', 'names'))
+            print(f"Tk images alive after closing every window: {images}")
+            root.destroy()
+        database.get_pool().close_all()
+
+    stats = get_chart_cache().stats
+    print(f"\n{args.opens} opens in {elapsed:.1f}s ({elapsed * 1000 / args.opens:.2f} ms each); "
+          f"chart renders {stats['renders']}, cache hits {stats['hits']}")
+
+    if not args.cache and stats['renders'] < args.opens:
+        sys.exit(f"only {stats['renders']} of {args.opens} opens drew a figure")
+
+    growth = None
+    if final['rss_mb'] is not None and baseline['rss_mb'] is not None:
+        growth = final['rss_mb'] - baseline['rss_mb']
+        print(f"RSS growth after warm-up ({warmup} opens): {growth:+.1f} MB "
+              f"(limit {args.max_growth_mb} MB)")
+    print(f"object growth after warm-up: {final['objects'] - baseline['objects']:+,}")
+
+    if growth is not None and growth > args.max_growth_mb:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+# benchmarks/bench_startup.py
+"""
+Cold-start benchmark for the GUI, checked against startup_budget.json.
+
+Measures, in fresh interpreters:
+  - `python -X importtime` cost of importing app.py (and which modules it pulls in)
+  - time from process start to the first fully drawn FinanceApp window
+  - wall time of a headless CLI command (`python -m personal_finance_tool report`),
+    which must not import tkinter or matplotlib at all
+
+Exits non-zero when a budget is exceeded or a module that should load lazily
+(e.g. matplotlib) is imported at startup. The window measurement is skipped
+when no display is available.
+
+Run from the repository root:
+    python -m personal_finance_tool.benchmarks.bench_startup [--runs N]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_DIR = os.path.dirname(APP_DIR)
+CLI_ARGS = ['-m', 'personal_finance_tool', 'report']
+BUDGET_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'startup_budget.json')
+
+FIRST_WINDOW_SCRIPT = '''
+import tkinter as tk
+from core.database import init_db
+from app import FinanceApp
+init_db()
+root = tk.Tk()
+app = FinanceApp(root)
+root.update()
+print("WINDOW_READY", flush=True)
+app.executor.shutdown()
+root.destroy()
+'''
+
+
+def run_in_app_dir(args, workdir):
+    """Run python with the app directory importable, in a scratch working directory."""
+    env = dict(os.environ, PYTHONPATH=APP_DIR)
+    return subprocess.run([sys.executable, *args], cwd=workdir, env=env,
+                          capture_output=True, text=True)
+
+
+def measure_imports(workdir):
+    """
+    Returns: (cumulative ms to import app, {module: cumulative ms})
+    """
+    result = run_in_app_dir(['-X', 'importtime', '-c', 'import app'], workdir)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    modules = parse_importtime(result.stderr)
+    return modules.get('app', 0.0), modules
+
+
+def parse_importtime(stderr):
+    """
+    Returns: {module: cumulative ms} from `python -X importtime` output
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len('import time:'):].split('|'))
+        modules[name.strip()] = int(cumulative) / 1000
+    return modules
+
+
+def measure_cli(workdir):
+    """
+    Returns: (ms wall time of one CLI report, {module: cumulative ms} it imported)
+    """
+    env = dict(os.environ, PYTHONPATH=REPO_DIR)
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, *CLI_ARGS], cwd=workdir, env=env,
+                            capture_output=True, text=True)
+    elapsed = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip())
+
+    traced = subprocess.run([sys.executable, '-X', 'importtime', *CLI_ARGS], cwd=workdir, env=env,
+                            capture_output=True, text=True)
+    return elapsed, parse_importtime(traced.stderr)
+
+
+def measure_first_window(workdir):
+    """
+    Returns: ms from process spawn to the first drawn window, or None without a display
+    """
+    env = dict(os.environ, PYTHONPATH=APP_DIR)
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, '-c', FIRST_WINDOW_SCRIPT], cwd=workdir, env=env,
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    for line in proc.stdout:
+        if line.startswith('WINDOW_READY'):
+            elapsed = (time.perf_counter() - start) * 1000
+            proc.wait()
+            return elapsed
+    proc.wait()
+    if 'TclError' in proc.stderr.read():
+        return None
+    raise RuntimeError("GUI did not start; run main.py to see the error")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start benchmark for the GUI.")
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    with open(BUDGET_FILE, encoding='utf-8') as f:
+        budget = json.load(f)
+
+    failures = []
+    with tempfile.TemporaryDirectory() as workdir:
+        # Warm the OS file cache; keep it out of the timings
+        measure_imports(workdir)
+
+        import_times, modules = [], {}
+        for _ in range(args.runs):
+            total, modules = measure_imports(workdir)
+            import_times.append(total)
+        import_ms = statistics.median(import_times)
+
+        print(f"import app: {import_ms:.1f} ms median over {args.runs} runs "
+              f"(budget {budget['import_app_ms']} ms)")
+        print("slowest imports:")
+        for name, ms in sorted(modules.items(), key=lambda item: -item[1])[:8]:
+            print(f"  {ms:8.1f} ms  {name}")
+
+        if import_ms > budget['import_app_ms']:
+            failures.append(f"import app took {import_ms:.1f} ms")
+        for name in budget['forbidden_modules']:
+            if any(module == name or module.startswith(name + '.') for module in modules):
+                failures.append(f"{name} is imported at startup")
+
+        cli_times, cli_modules = [], {}
+        for _ in range(args.runs):
+            elapsed, cli_modules = measure_cli(workdir)
+            cli_times.append(elapsed)
+        cli_ms = statistics.median(cli_times)
+        print(f"cli report: {cli_ms:.1f} ms median (budget {budget['cli_ms']} ms)")
+        if cli_ms > budget['cli_ms']:
+            failures.append(f"cli report took {cli_ms:.1f} ms")
+        for name in budget['cli_forbidden_modules']:
+            if any(module == name or module.startswith(name + '.') for module in cli_modules):
+                failures.append(f"{name} is imported by the CLI")
+
+        window_times = [measure_first_window(workdir) for _ in range(args.runs)]
+        if None in window_times:
+            print("first window: skipped (no display)")
+        else:
+            window_ms = statistics.median(window_times)
+            print(f"first window: {window_ms:.1f} ms median (budget {budget['first_window_ms']} ms)")
+            if window_ms > budget['first_window_ms']:
+                failures.append(f"first window took {window_ms:.1f} ms")
+
+    for failure in failures:
+        print(f"❌ {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# benchmarks/check_query_plans.py
+"""
+Regression check: month-scoped queries and searches must be index
+searches, never full scans of the transactions table. (FTS5 MATCH lookups
+show up as SCAN ... VIRTUAL TABLE INDEX and are index reads.)
+
+Runs each query helper against a scratch database, captures the SQL it
+executes and inspects EXPLAIN QUERY PLAN. Exits non-zero on a full scan.
+The test suite runs the same check (tests/test_query_plans.py).
+
+Run from the repository root:
+    python -m personal_finance_tool.benchmarks.check_query_plans
+"""
+import os
+import sys
+import tempfile
+
+from ..core import balance, database, periods, report_data
+
+MONTH = '2024-06'
+
+
+def month_query_calls():
+    """Returns: list of (name, zero-argument callable) to trace."""
+    return [
+        ('get_transactions_for_month', lambda: database.get_transactions_for_month(MONTH)),
+        ('get_category_spending', lambda: database.get_category_spending('Groceries', MONTH)),
+        ('get_budget_snapshot', lambda: database.get_budget_snapshot(MONTH)),
+        ('get_month_report', lambda: report_data.get_month_report(MONTH)),
+        ('get_monthly_trend', report_data.get_monthly_trend),
+        ('search_transactions', lambda: database.search_transactions('gro', limit=10)),
+        ('get_period_totals', lambda: periods.get_period_totals(
+            [periods.date_range('2024-05-20', '2024-07-10'), periods.year(2024)])),
+        ('get_transactions_page_with_balance',
+         lambda: balance.get_transactions_page_with_balance(MONTH, limit=10)),
+    ]
+
+
+def full_scans(conn, sql):
+    """Returns: list of plan details that scan the transactions table."""
+    plan = conn.execute("EXPLAIN QUERY PLAN " + sql).fetchall()
+    return [detail for _, _, _, detail in plan
+            if detail.startswith('SCAN') and 'transactions' in detail
+            and 'VIRTUAL TABLE' not in detail]
+
+
+def check_plans(conn, calls):
+    """
+    Run each call with conn's statements traced and explain every query.
+    Returns: list of (name, sql, full scans) per SELECT statement executed
+    """
+    results = []
+    for name, call in calls:
+        statements = []
+        conn.set_trace_callback(statements.append)
+        try:
+            call()
+        finally:
+            conn.set_trace_callback(None)
+
+        for sql in statements:
+            if sql.lstrip().upper().startswith(('SELECT', 'WITH')):
+                results.append((name, sql, full_scans(conn, sql)))
+    return results
+
+
+def main():
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        pool = database.ConnectionPool(os.path.join(tmp, 'plans.db'))
+        with database.use_pool(pool):
+            database.init_db()
+            database.add_transaction(f'{MONTH}-15', 'expense', 'Groceries', 42.0, 'check')
+
+            for name, sql, scans in check_plans(pool.acquire(), month_query_calls()):
+                status = 'FAIL' if scans else 'ok'
+                print(f"[{status}] {name}: {' | '.join(scans) or 'index search'}")
+                failures += bool(scans)
+
+        pool.close_all()
+
+    if failures:
+        print(f"\n{failures} quer{'y' if failures == 1 else 'ies'} fall back to a full table scan")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# benchmarks/synthetic.py
+"""
+Deterministic synthetic ledgers for benchmarks.
+
+The same parameters always produce the same rows: transactions are spread
+evenly over `years` ending at `end_date` (default: today, so current-month
+queries have data), with categories, amounts and the income/expense mix
+drawn from a seeded random generator.
+
+Build a ledger file directly:
+    python -m personal_finance_tool.benchmarks.synthetic OUT.db --rows 1000000
+"""
+import math
+import random
+from datetime import date, timedelta
+from itertools import islice
+
+from ..core import database
+from ..core.database import DEFAULT_CATEGORIES
+
+INCOME_CATEGORIES = ('Salary',)
+DESCRIPTIONS = ('card payment', 'online order', 'direct debit', 'cash', 'transfer', '')
+CHUNK_SIZE = 50000
+
+
+def category_names(count):
+    """
+    Returns: list of `count` expense category names, the defaults first
+    """
+    names = [name for name in DEFAULT_CATEGORIES if name not in INCOME_CATEGORIES]
+    names += [f"Category {i}" for i in range(len(names) + 1, count + 1)]
+    return names[:count]
+
+
+def generate_transactions(rows=None, years=3, tx_per_day=10, categories=10,
+                          income_ratio=0.1, seed=42, end_date=None):
+    """
+    Lazily generate synthetic transactions in date order.
+
+    rows: total number of rows; defaults to years * 365 * tx_per_day
+    Yields: (date, type, category, amount_cents, description)
+    """
+    rng = random.Random(seed)
+    end_date = end_date or date.today()
+    days = years * 365
+    first = end_date - timedelta(days=days - 1)
+    rows = rows if rows is not None else days * tx_per_day
+    expense_categories = category_names(categories)
+
+    for i in range(rows):
+        day = first + timedelta(days=i * days // rows)
+        if rng.random() < income_ratio:
+            yield (day.isoformat(), 'income', rng.choice(INCOME_CATEGORIES),
+                   rng.randint(50000, 500000), 'payroll')
+        else:
+            # Log-uniform between $1 and $1,000: mostly small purchases
+            cents = int(100 * math.exp(rng.uniform(0, math.log(1000))))
+            yield (day.isoformat(), 'expense', rng.choice(expense_categories),
+                   cents, rng.choice(DESCRIPTIONS))
+
+
+def build_ledger(path, rows=None, budget_ratio=0.8, **params):
+    """
+    Create a ledger database at path filled with synthetic transactions.
+    Each category's budget is budget_ratio times its average monthly
+    spending, so a realistic share of categories end up over budget.
+    params are passed to generate_transactions().
+    Returns: number of rows written
+    """
+    database.open_database(path)
+    database.init_db()
+
+    written = 0
+    generated = generate_transactions(rows, **params)
+    with database.bulk_load() as conn:
+        while True:
+            chunk = list(islice(generated, CHUNK_SIZE))
+            if not chunk:
+                break
+            conn.executemany('''
+                INSERT INTO transactions (date, type, category, amount_cents, description)
+                VALUES (?, ?, ?, ?, ?)
+            ''', chunk)
+            written += len(chunk)
+
+        conn.execute('''
+            INSERT INTO budgets (category, limit_cents)
+            SELECT category, CAST(SUM(amount_cents) * ? / COUNT(DISTINCT month) AS INTEGER)
+            FROM transactions
+            WHERE type = 'expense'
+            GROUP BY category
+            ON CONFLICT (category) DO UPDATE SET limit_cents = excluded.limit_cents
+        ''', (budget_ratio,))
+    return written
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build a synthetic ledger database.")
+    parser.add_argument("path")
+    parser.add_argument("--rows", type=int)
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--tx-per-day", type=int, default=10)
+    parser.add_argument("--categories", type=int, default=10)
+    parser.add_argument("--income-ratio", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    count = build_ledger(args.path, args.rows, years=args.years, tx_per_day=args.tx_per_day,
+                         categories=args.categories, income_ratio=args.income_ratio, seed=args.seed)
+    print(f"Wrote {count} transactions to {args.path}")
@@ -0,0 +1,193 @@
+# cli.py
+"""
+Headless command-line interface for scripted jobs.
+
+    python -m personal_finance_tool [--db PATH] report [--period P ...] [--text]
+    python -m personal_finance_tool [--db PATH] import FILE [--format csv|ofx] [--category NAME]
+    python -m personal_finance_tool [--db PATH] export FILE [--format F] [--start D] [--end D]
+    python -m personal_finance_tool [--db PATH] budget-check [--period P] [--strict]
+        [--thresholds 50,80,100]
+    python -m personal_finance_tool --ledgers FILE aggregate [--period P ...]
+        [--ledger ID ...] [--workers N]
+
+--ledgers names a ledger registry file (see core/ledgers.py). With it,
+--ledger ID runs any command against that ledger instead of --db, and
+aggregate reports on several ledgers (default: all) and their combined
+totals, computed in parallel worker processes.
+
+--db PATH and --ledger ID must name an existing database; only the default
+finance.db is created on first use.
+
+A period P is a month (2024-06), quarter (2024-Q2), year (2024), date range
+(2024-01-15..2024-03-10) or the last N days (90d); the default is the current
+month. --month YYYY-MM is still accepted. Several --period options produce
+{"reports": [...]} from a single grouped query.
+
+Results are printed to stdout as a single JSON object. Errors are printed
+to stderr as {"error": "..."} with exit status 1. Nothing here imports
+tkinter or matplotlib, and each command imports only the core modules it
+uses, so the CLI starts fast enough to run across many ledgers from cron.
+"""
+import argparse
+import json
+import sys
+
+from .core.database import open_database, init_db, DB_PATH
+
+
+def cmd_report(args):
+    from .core.report_data import get_period_reports, format_text_report
+
+    periods = args.periods or [args.month]
+    reports = get_period_reports(periods)
+    if args.text:
+        sys.stdout.write("\n".join(format_text_report(report, period)
+                                   for report, period in zip(reports, periods)))
+        return None
+    return reports[0] if len(reports) == 1 else {'reports': reports}
+
+
+def cmd_import(args):
+    from .core.importer import import_file
+    from .core.alerts import get_alert_engine
+
+    # Seed the alert engine first so it reports the thresholds the import crosses
+    alerts = get_alert_engine()
+    alerts.sync()
+    result = import_file(args.path, file_format=args.format, default_category=args.category,
+                         bulk=args.bulk)
+    return dict(result, budget_alerts=alerts.sync())
+
+
+def cmd_export(args):
+    from .core.exporter import export_transactions
+
+    return dict(export_transactions(args.path, args.format, args.start, args.end),
+                path=args.path)
+
+
+def cmd_budget_check(args):
+    from .core.budget import get_budgeted_snapshot
+    from .core.periods import as_period
+
+    period = as_period(args.period or args.month)
+    snapshot = get_budgeted_snapshot(period)
+    alerts = []
+    for row in snapshot:
+        reached = [level for level in sorted(args.thresholds) if row['percentage'] >= level]
+        if reached:
+            alerts.append(dict(row, threshold=reached[-1]))
+    return {
+        'month': period.label,
+        'start': period.start,
+        'end': period.end,
+        'over_budget': [row for row in snapshot if row['spent'] > row['budget']],
+        'alerts': alerts,
+        'categories': snapshot
+    }
+
+
+def cmd_aggregate(args):
+    from .core.ledgers import LedgerRegistry
+
+    registry = LedgerRegistry.load(args.ledgers, workers=args.workers)
+    try:
+        ledger_ids = args.ledger_ids or ([args.ledger] if args.ledger else None)
+        return registry.get_aggregate_report(args.periods or [args.month], ledger_ids=ledger_ids)
+    finally:
+        registry.close_all()
+
+
+def thresholds(value):
+    """argparse type for a comma-separated list of percentages."""
+    try:
+        return tuple(float(part) for part in value.split(','))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected percentages like 50,80,100, got {value!r}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="personal_finance_tool",
+                                     description="Headless personal finance commands.")
+    parser.add_argument("--db", help=f"existing ledger database file (default {DB_PATH}, created if missing)")
+    parser.add_argument("--ledgers", metavar="FILE", help="ledger registry file (JSON)")
+    parser.add_argument("--ledger", metavar="ID", help="ledger from --ledgers to use instead of --db")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    report = commands.add_parser("report", help="income and expense summary for periods")
+    report_period = report.add_mutually_exclusive_group()
+    report_period.add_argument("--period", dest="periods", action="append",
+                               help="period spec; repeat for several (default: current month)")
+    report_period.add_argument("--month", help="YYYY-MM (same as --period YYYY-MM)")
+    report.add_argument("--text", action="store_true", help="plain-text report instead of JSON")
+    report.set_defaults(func=cmd_report)
+
+    import_cmd = commands.add_parser("import", help="import a CSV/OFX/QFX statement")
+    import_cmd.add_argument("path")
+    import_cmd.add_argument("--format", choices=["csv", "ofx"], help="default: from the extension")
+    import_cmd.add_argument("--category", default="Other", help="category for rows without one")
+    import_cmd.add_argument("--bulk", action=argparse.BooleanOptionalAction, default=None,
+                            help="force or skip bulk loading (default: by size)")
+    import_cmd.set_defaults(func=cmd_import)
+
+    export = commands.add_parser("export", help="stream transactions to a file")
+    export.add_argument("path")
+    export.add_argument("--format", choices=["csv", "jsonl", "columnar"],
+                        help="default: from the extension")
+    export.add_argument("--start", help="first date, YYYY-MM-DD")
+    export.add_argument("--end", help="last date, YYYY-MM-DD")
+    export.set_defaults(func=cmd_export)
+
+    budget = commands.add_parser("budget-check", help="categories over their budget for a period")
+    budget_period = budget.add_mutually_exclusive_group()
+    budget_period.add_argument("--period", help="period spec (default: current month)")
+    budget_period.add_argument("--month", help="YYYY-MM (same as --period YYYY-MM)")
+    budget.add_argument("--strict", action="store_true", help="exit with status 1 if any are over")
+    budget.add_argument("--thresholds", type=thresholds, default=(50, 80, 100),
+                        help="alert levels in percent of budget (default 50,80,100)")
+    budget.set_defaults(func=cmd_budget_check)
+
+    aggregate = commands.add_parser("aggregate", help="reports across the ledgers in --ledgers")
+    aggregate_period = aggregate.add_mutually_exclusive_group()
+    aggregate_period.add_argument("--period", dest="periods", action="append",
+                                  help="period spec; repeat for several (default: current month)")
+    aggregate_period.add_argument("--month", help="YYYY-MM (same as --period YYYY-MM)")
+    aggregate.add_argument("--ledger", dest="ledger_ids", metavar="ID", action="append",
+                           help="ledger to include; repeat for several (default: all)")
+    aggregate.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    aggregate.set_defaults(func=cmd_aggregate, needs_db=False)
+    return parser
+
+
+def main(argv=None):
+    """
+    Run one CLI command.
+    Returns: process exit status
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not args.ledgers and (args.ledger or args.command == "aggregate"):
+        parser.error("--ledger and aggregate need a registry file: --ledgers FILE")
+    try:
+        if getattr(args, 'needs_db', True):
+            db_path = args.db or DB_PATH
+            if args.ledger:
+                from .core.ledgers import LedgerRegistry
+                db_path = LedgerRegistry.load(args.ledgers).path(args.ledger)
+            if args.db or args.ledger:
+                # A named database must exist; a typo would otherwise create an empty one
+                from .core.ledgers import require_database
+                require_database(db_path)
+            open_database(db_path)
+            init_db()
+        result = args.func(args)
+    except Exception as e:
+        print(json.dumps({'error': str(e)}), file=sys.stderr)
+        return 1
+
+    if result is None:
+        return 0
+    print(json.dumps(result, ensure_ascii=False))
+    if getattr(args, 'strict', False) and result['over_budget']:
+        return 1
+    return 0
@@ -0,0 +1,208 @@
+# core/alerts.py
+"""
+Incremental budget alerts.
+
+BudgetAlertEngine keeps the current month's budget and spending for every
+budgeted category in memory. It is seeded with one query; after that each
+add_transaction() updates only its own category, so the cost of checking
+an insert does not grow with the number of categories or transactions.
+When a category's spending reaches one of the thresholds (by default 50,
+80 and 100 percent of its budget) every subscriber is called with an alert.
+
+Writes that add_transaction() does not report (budget changes, imports,
+bulk loads) bump the 'budgets' or 'transactions' cache tags. The engine
+notices on its next update or sync() and re-seeds, alerting for any
+thresholds crossed in the meantime.
+"""
+import threading
+from bisect import bisect_right
+from datetime import datetime
+
+from .database import get_pool, get_db_connection, add_transaction_listener, from_cents
+
+DEFAULT_THRESHOLDS = (50, 80, 100)
+
+
+def format_alert(alert):
+    """
+    One-line description of an alert.
+    Returns: str
+    """
+    amounts = f"Spent ${alert['spent']:.2f} / Budget ${alert['budget']:.2f}"
+    if alert['threshold'] >= 100:
+        return f"🚨 {alert['category']}: {amounts}"
+    return f"⚠️ {alert['category']}: reached {alert['threshold']:g}% of budget ({amounts})"
+
+
+class BudgetAlertEngine:
+    """Running per-category month totals that raise threshold alerts."""
+
+    def __init__(self, thresholds=DEFAULT_THRESHOLDS):
+        self.thresholds = tuple(sorted(thresholds))
+        self.month = None
+        self.limits = {}       # category -> budget in cents (budgeted categories only)
+        self.spent = {}        # category -> expenses this month in cents
+        self.levels = {}       # category -> number of thresholds reached
+        self.subscribers = []
+        self.stats = {'seeds': 0, 'updates': 0, 'alerts': 0}
+        self._token = None
+        self._seeded_commits = 0   # pool commits count when the last seed finished
+        self._lock = threading.Lock()
+
+    # ==================== Observers ====================
+
+    def subscribe(self, callback):
+        """
+        Call callback(alert) for every threshold a category reaches. alert
+        is a dict with category, month, threshold, budget, spent, percentage.
+        Callbacks run on the thread that made the change, which need not be
+        the UI thread: hand alerts over rather than touching widgets.
+        Returns: callback (for unsubscribe())
+        """
+        self.subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        if callback in self.subscribers:
+            self.subscribers.remove(callback)
+
+    def _notify(self, alerts):
+        self.stats['alerts'] += len(alerts)
+        for alert in alerts:
+            for callback in list(self.subscribers):
+                callback(alert)
+
+    # ==================== State ====================
+
+    def _data_token(self):
+        pool = get_pool()
+        return (pool, pool.cache.version('budgets', 'transactions'))
+
+    def _is_stale(self, month):
+        return month != self.month or self._token != self._data_token()
+
+    def _level(self, category):
+        limit = self.limits[category]
+        return bisect_right(self.thresholds, self.spent[category] * 100 / limit)
+
+    def _describe(self, category):
+        limit, spent, level = self.limits[category], self.spent[category], self.levels[category]
+        return {
+            'category': category,
+            'month': self.month,
+            'threshold': self.thresholds[level - 1] if level else None,
+            'budget': from_cents(limit),
+            'spent': from_cents(spent),
+            'percentage': spent * 100 / limit
+        }
+
+    def _seed(self, month, pending=None):
+        """
+        Reload budgets and spending for month in one query.
+        pending: (category, amount_cents) of a just-committed expense that
+                 the reload already includes but that should still alert
+        Returns: list of alerts for thresholds reached since the last seed
+        """
+        token = self._data_token()
+        rows = get_db_connection().execute('''
+            SELECT b.category, b.limit_cents, COALESCE(m.total_cents, 0)
+            FROM budgets b
+            LEFT JOIN monthly_totals m
+                ON m.type = 'expense'
+                AND m.month = ?
+                AND m.category = b.category
+            WHERE b.limit_cents > 0
+        ''', (month,)).fetchall()
+
+        previous = self.levels if month == self.month else None
+        self.month, self._token = month, token
+        self._seeded_commits = token[0].commits
+        self.limits = {category: limit for category, limit, _ in rows}
+        self.spent = {category: spent for category, _, spent in rows}
+        self.levels = {category: self._level(category) for category in self.limits}
+        self.stats['seeds'] += 1
+
+        if previous is None:
+            # First load of this month: only the pending expense can alert
+            previous = dict(self.levels)
+            if pending and pending[0] in self.limits:
+                category, cents = pending
+                self.spent[category] -= cents
+                previous[category] = self._level(category)
+                self.spent[category] += cents
+        return [self._describe(category) for category, level in self.levels.items()
+                if level > previous.get(category, 0)]
+
+    # ==================== Updates ====================
+
+    def record(self, date, trans_type, category, amount_cents, commits_before=None):
+        """
+        Apply one committed transaction; registered as an add_transaction
+        listener by get_alert_engine().
+        commits_before: see add_transaction_listener(); totals seeded after
+                        that commit may already include it, so they are
+                        re-seeded instead of adding the amount again
+        Returns: list of alerts raised
+        """
+        month = date[:7]
+        if trans_type != 'expense' or month != datetime.now().strftime("%Y-%m"):
+            return []
+        with self._lock:
+            if self._is_stale(month):
+                alerts = self._seed(month, pending=(category, amount_cents))
+            elif commits_before is not None and self._seeded_commits > commits_before:
+                alerts = self._seed(month)
+            elif category in self.limits:
+                self.spent[category] += amount_cents
+                level = self._level(category)
+                raised = level > self.levels[category]
+                self.levels[category] = level
+                alerts = [self._describe(category)] if raised else []
+            else:
+                alerts = []
+            self.stats['updates'] += 1
+        self._notify(alerts)
+        return alerts
+
+    def sync(self, month=None):
+        """
+        Catch up with writes made outside add_transaction(), such as an
+        import or a budget change. Defaults to the current month.
+        Returns: list of alerts raised
+        """
+        month = month or datetime.now().strftime("%Y-%m")
+        with self._lock:
+            alerts = self._seed(month) if self._is_stale(month) else []
+        self._notify(alerts)
+        return alerts
+
+    def set_thresholds(self, thresholds):
+        """Change the alert levels (percentages) without raising alerts."""
+        with self._lock:
+            self.thresholds = tuple(sorted(thresholds))
+            self.levels = {category: self._level(category) for category in self.limits}
+
+    def status(self, month=None):
+        """
+        Get every budgeted category with the highest threshold it has reached.
+        Returns: list of dicts with category, budget, spent, percentage,
+                 threshold (None if below the lowest)
+        """
+        self.sync(month)
+        with self._lock:
+            return [self._describe(category) for category in sorted(self.limits)]
+
+
+_engine = None
+
+
+def get_alert_engine():
+    """
+    Get the process-wide alert engine, listening to add_transaction().
+    Returns: BudgetAlertEngine
+    """
+    global _engine
+    if _engine is None:
+        _engine = BudgetAlertEngine()
+        add_transaction_listener(_engine.record)
+    return _engine
@@ -0,0 +1,234 @@
+# core/balance.py
+"""
+Account balance as of any date.
+
+The balance at the end of a day is the net (income minus expenses) of every
+transaction up to and including it. BalanceIndex holds the per-day net
+flows from daily_totals in a Fenwick (binary indexed) tree over day
+numbers: balance_at() and between() add up about a dozen nodes for a decade
+of history instead of summing every earlier transaction, and a new
+transaction updates as many nodes rather than a whole suffix of balances.
+
+The index is loaded once from daily_totals, kept current by an
+add_transaction() listener, and reloaded after writes it does not see
+(imports, bulk loads) bump the 'transactions' cache tag, the same way as
+the budget alert engine.
+"""
+import threading
+from datetime import date, timedelta
+
+from .database import (
+    get_pool,
+    get_db_connection,
+    get_daily_totals,
+    get_transactions_page,
+    add_transaction_listener,
+    from_cents
+)
+from .periods import as_period
+
+HEADROOM_DAYS = 366    # room past today for new transactions before a reload
+
+
+class FenwickTree:
+    """Prefix sums over positions 0..size-1 with O(log n) updates and queries."""
+
+    def __init__(self, values):
+        self.size = len(values)
+        self.tree = [0] + list(values)
+        # Build in O(n) by pushing each node into its parent
+        for i in range(1, self.size + 1):
+            parent = i + (i & -i)
+            if parent <= self.size:
+                self.tree[parent] += self.tree[i]
+
+    def add(self, index, delta):
+        i = index + 1
+        while i <= self.size:
+            self.tree[i] += delta
+            i += i & -i
+
+    def prefix_sum(self, index):
+        """Returns: sum of positions 0..index (0 before the start)"""
+        total = 0
+        i = min(index, self.size - 1) + 1
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+
+def _is_day(value):
+    try:
+        date.fromisoformat(value)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+class BalanceIndex:
+    """Balances by date over the current database, in integer cents."""
+
+    def __init__(self):
+        self.first_day = None      # ordinal of the day at position 0
+        self.tree = FenwickTree([])
+        self.stats = {'loads': 0, 'updates': 0, 'queries': 0}
+        self._token = None
+        self._loaded_commits = 0   # pool commits count when the last load finished
+        self._lock = threading.Lock()
+
+    def _data_token(self):
+        pool = get_pool()
+        return (pool, pool.cache.version('transactions'))
+
+    def _load(self):
+        """Rebuild the tree from daily_totals. Caller holds the lock."""
+        token = self._data_token()
+        days = []
+        for day, net in get_daily_totals():
+            try:
+                days.append((date.fromisoformat(day).toordinal(), net))
+            except ValueError:
+                continue  # not a calendar date, so it has no place on the timeline
+
+        if days:
+            self.first_day = days[0][0]
+            last = max(days[-1][0], date.today().toordinal()) + HEADROOM_DAYS
+            values = [0] * (last - self.first_day + 1)
+            for ordinal, net in days:
+                values[ordinal - self.first_day] += net
+            self.tree = FenwickTree(values)
+        else:
+            self.first_day, self.tree = None, FenwickTree([])
+        self._token = token
+        self._loaded_commits = token[0].commits
+        self.stats['loads'] += 1
+
+    def _position(self, day):
+        """Returns: tree position of day, or None if it is not a calendar date"""
+        try:
+            return date.fromisoformat(day).toordinal() - self.first_day
+        except (TypeError, ValueError):
+            return None
+
+    def _prefix(self, day):
+        if self._token != self._data_token():
+            self._load()
+        if self.first_day is None:
+            return 0 if _is_day(day) else None
+        position = self._position(day)
+        if position is None:
+            return None
+        return self.tree.prefix_sum(position) if position >= 0 else 0
+
+    def balance_at(self, day):
+        """
+        Balance at the end of day ('YYYY-MM-DD').
+        Returns: int cents, or None if day is not a calendar date
+        """
+        with self._lock:
+            self.stats['queries'] += 1
+            return self._prefix(day)
+
+    def between(self, start, end):
+        """
+        Net change from the start of start through the end of end (inclusive).
+        Returns: int cents, or None if either day is not a calendar date
+        """
+        if not _is_day(start):
+            return None
+        before = (date.fromisoformat(start) - timedelta(days=1)).isoformat()
+        with self._lock:
+            self.stats['queries'] += 1
+            after, until = self._prefix(end), self._prefix(before)
+        return None if after is None else after - until
+
+    def record(self, day, trans_type, category, amount_cents, commits_before=None):
+        """
+        add_transaction listener: apply one committed transaction.
+        commits_before: see add_transaction_listener(); a tree loaded after
+        that commit may already hold the row, so it is reloaded instead.
+        """
+        with self._lock:
+            if self.first_day is None or self._token != self._data_token():
+                return  # the next query reloads, and the reload includes it
+            if commits_before is not None and self._loaded_commits > commits_before:
+                self._token = None
+                return
+            position = self._position(day)
+            if position is None:
+                return  # not a calendar date: _load() leaves it out too
+            if not 0 <= position < self.tree.size:
+                self._token = None  # outside the loaded range: reload on next query
+                return
+            self.tree.add(position, amount_cents if trans_type == 'income' else -amount_cents)
+            self.stats['updates'] += 1
+
+
+_index = None
+
+
+def get_balance_index():
+    """
+    Get the process-wide balance index, listening to add_transaction().
+    Returns: BalanceIndex
+    """
+    global _index
+    if _index is None:
+        _index = BalanceIndex()
+        add_transaction_listener(_index.record)
+    return _index
+
+
+def with_running_balance(rows):
+    """
+    Add the balance after each transaction to rows from
+    get_transactions_page(): newest first and contiguous in (date, id)
+    order. Costs one balance lookup and one indexed query per page.
+    Rows whose date is not a calendar date are not part of the balance
+    (see BalanceIndex._load) and get None.
+    Returns: list of rows with the balance (dollars) appended
+    """
+    anchor = next((row for row in rows if _is_day(row[1])), None)
+    if anchor is None:
+        return [(*row, None) for row in rows]
+    first_id, first_day = anchor[0], anchor[1]
+    # Same-day transactions newer than the anchor row come after it in the balance
+    newer = get_db_connection().execute('''
+        SELECT COALESCE(SUM(CASE type WHEN 'income' THEN amount_cents ELSE -amount_cents END), 0)
+        FROM transactions
+        WHERE month = ? AND date = ? AND id > ?
+    ''', (first_day[:7], first_day, first_id)).fetchone()[0]
+
+    balance = get_balance_index().balance_at(first_day) - newer
+    result = []
+    for row in rows:
+        if not _is_day(row[1]):
+            result.append((*row, None))
+            continue
+        result.append((*row, from_cents(balance)))
+        cents = round(row[4] * 100)
+        balance -= cents if row[2] == 'income' else -cents
+    return result
+
+
+def get_transactions_page_with_balance(month, **kwargs):
+    """
+    get_transactions_page() with a running balance column.
+    Returns: list of (id, date, type, category, amount, description, balance)
+    """
+    return with_running_balance(get_transactions_page(month, **kwargs))
+
+
+def get_balance_series(periods):
+    """
+    Balance at the end of each period (e.g. months_back(12)).
+    Returns: list of (label, balance in dollars)
+    """
+    index = get_balance_index()
+    series = []
+    for period in periods:
+        period = as_period(period)
+        last_day = (period.end_date - timedelta(days=1)).isoformat()
+        series.append((period.label, from_cents(index.balance_at(last_day))))
+    return series
@@ -1,19 +1,23 @@
 # core/budget.py
-import tkinter as tk
-from tkinter import simpledialog, messagebox
-import sqlite3
-from datetime import datetime
+# tkinter is imported inside the dialog functions only, so the budget
+# queries can be used headless (see cli.py).
+# Functions reporting on spending take a period: None for the current
+# month, a spec such as '2024-06', '2024-Q2' or '90d', or a Period.
 from .database import (
-    get_category_budgets, 
-    get_category_spending, 
+    get_budget_snapshot,
     set_category_budget,
-    get_all_categories
+    get_all_categories,
+    get_pool,
+    transaction
 )
+from .periods import as_period, get_budget_snapshots
 
 def set_budget(parent):
     """
     Opens a dialog to set a monthly budget for a selected category.
     """
+    from tkinter import simpledialog, messagebox
+
     categories = get_all_categories()
     
     if not categories:
@@ -53,111 +57,110 @@ def set_budget(parent):
         messagebox.showerror("Invalid Input", "Please enter a valid positive number.")
 
 
+def get_period_snapshot(period=None):
+    """
+    Get every category's budget and spending for a period. Calendar months
+    use the cached per-month snapshot; other periods scale the monthly
+    limits by their length (see periods.get_budget_snapshots).
+    Returns: list of dicts (see get_budget_snapshot)
+    """
+    period = as_period(period)
+    if period.kind == 'month':
+        return get_budget_snapshot(period.label)
+    return get_budget_snapshots([period])[0]
+
+
+def get_budgeted_snapshot(period=None):
+    """
+    Get the budget snapshot for categories that have a limit set.
+    Defaults to the current month.
+    Returns: list of dicts (see get_budget_snapshot)
+    """
+    return [row for row in get_period_snapshot(period) if row['budget'] > 0]
+
+
+def get_budgeted_snapshots(periods):
+    """
+    Budgeted snapshots for many periods (e.g. every month of a year) from
+    one grouped query.
+    Returns: list of snapshots, one per period
+    """
+    return [[row for row in snapshot if row['budget'] > 0]
+            for snapshot in get_budget_snapshots(periods)]
+
+
+def get_budget_alert_messages(period=None):
+    """
+    Get one line per category whose spending exceeds its budget.
+    Defaults to the current month.
+    Returns: list of str
+    """
+    return [
+        f"🚨 {row['category']}: Spent ${row['spent']:.2f} / Budget ${row['budget']:.2f}"
+        for row in get_budgeted_snapshot(period)
+        if row['spent'] > row['budget']
+    ]
+
+
 def check_budget_alerts():
     """
     Checks all categories with budgets.
     If current month's spending > budget, shows a warning popup.
     """
-    budgets = get_category_budgets()
-    budgets_with_limits = [(cat, limit) for cat, limit in budgets if limit > 0]
-
-    alert_messages = []
-    current_month = datetime.now().strftime("%Y-%m")
-
-    for category, limit in budgets_with_limits:
-        spent = get_category_spending(category, current_month)
-        
-        if spent > limit:
-            alert_messages.append(f"🚨 {category}: Spent ${spent:.2f} / Budget ${limit:.2f}")
+    alert_messages = get_budget_alert_messages()
 
     # Show one consolidated alert if needed
     if alert_messages:
+        from tkinter import messagebox
+
         message = "You have exceeded your budget in the following categories:\n\n" + "\n".join(alert_messages)
         messagebox.showwarning("Budget Exceeded!", message)
 
 
-def get_budget_summary():
+def get_budget_summary(period=None):
     """
-    Get budget summary for current month.
+    Get budget summary for a period (default current month).
     Returns: list of dicts with category, budget, spent, remaining info
     """
-    budgets = get_category_budgets()
-    budgets_with_limits = [(cat, limit) for cat, limit in budgets if limit > 0]
-    
-    summary = []
-    current_month = datetime.now().strftime("%Y-%m")
-    
-    for category, limit in budgets_with_limits:
-        spent = get_category_spending(category, current_month)
-        remaining = limit - spent
-        
-        summary.append({
-            'category': category,
-            'budget': limit,
-            'spent': spent,
-            'remaining': remaining,
-            'percentage': (spent / limit * 100) if limit > 0 else 0
-        })
-    
-    return summary
+    return get_budgeted_snapshot(period)
 
 
-def is_over_budget(category):
+def is_over_budget(category, period=None):
     """
-    Check if a specific category is over budget for current month.
+    Check if a specific category is over budget for a period (default current month).
     Returns: bool
     """
-    budgets = get_category_budgets()
-    budget_dict = dict(budgets)
-    
-    if category not in budget_dict:
-        return False
-    
-    limit = budget_dict[category]
-    if limit <= 0:
+    status = get_category_budget_status(category, period)
+    if status is None or status['budget'] <= 0:
         return False
-    
-    current_month = datetime.now().strftime("%Y-%m")
-    spent = get_category_spending(category, current_month)
-    
-    return spent > limit
+    return status['over_budget']
 
 
-def get_total_budget_vs_spending():
+def get_total_budget_vs_spending(period=None):
     """
-    Get total budget vs total spending for current month.
+    Get total budget vs total spending for a period (default current month).
     Returns: (total_budget, total_spent, remaining)
     """
-    budgets = get_category_budgets()
-    budgets_with_limits = [(cat, limit) for cat, limit in budgets if limit > 0]
-    
-    total_budget = sum(limit for _, limit in budgets_with_limits)
-    
-    current_month = datetime.now().strftime("%Y-%m")
-    total_spent = sum(get_category_spending(cat, current_month) for cat, _ in budgets_with_limits)
-    
+    snapshot = get_budgeted_snapshot(period)
+
+    total_budget = sum(row['budget'] for row in snapshot)
+    total_spent = sum(row['spent'] for row in snapshot)
+
     remaining = total_budget - total_spent
-    
+
     return total_budget, total_spent, remaining
 
 
-def get_overspent_categories():
+def get_overspent_categories(period=None):
     """
-    Get list of categories that are over budget for current month.
+    Get list of categories that are over budget for a period (default current month).
     Returns: list of (category, budget, spent, overspent_amount)
     """
-    budgets = get_category_budgets()
-    budgets_with_limits = [(cat, limit) for cat, limit in budgets if limit > 0]
-    
-    overspent = []
-    current_month = datetime.now().strftime("%Y-%m")
-    
-    for category, limit in budgets_with_limits:
-        spent = get_category_spending(category, current_month)
-        if spent > limit:
-            overspent.append((category, limit, spent, spent - limit))
-    
-    return overspent
+    return [
+        (row['category'], row['budget'], row['spent'], row['spent'] - row['budget'])
+        for row in get_budgeted_snapshot(period)
+        if row['spent'] > row['budget']
+    ]
 
 
 def reset_all_budgets():
@@ -165,21 +168,18 @@ def reset_all_budgets():
     Reset all budget limits to 0.
     Returns: number of budgets reset
     """
-    conn = sqlite3.connect('finance.db')
-    c = conn.cursor()
-    c.execute("UPDATE budgets SET limit_amount = 0")
-    rows_affected = c.rowcount
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        get_pool().touch('budgets')
+        rows_affected = conn.execute("UPDATE budgets SET limit_cents = 0").rowcount
     return rows_affected
 
 
-def get_budget_utilization_rate():
+def get_budget_utilization_rate(period=None):
     """
-    Calculate overall budget utilization rate.
+    Calculate overall budget utilization rate for a period (default current month).
     Returns: float (percentage) or 0 if no budgets set
     """
-    total_budget, total_spent, _ = get_total_budget_vs_spending()
+    total_budget, total_spent, _ = get_total_budget_vs_spending(period)
     
     if total_budget <= 0:
         return 0
@@ -187,28 +187,12 @@ def get_budget_utilization_rate():
     return (total_spent / total_budget) * 100
 
 
-def get_category_budget_status(category):
+def get_category_budget_status(category, period=None):
     """
-    Get detailed budget status for a specific category.
+    Get detailed budget status for a specific category (default current month).
     Returns: dict with budget info or None if category not found
     """
-    budgets = get_category_budgets()
-    budget_dict = dict(budgets)
-    
-    if category not in budget_dict:
-        return None
-    
-    limit = budget_dict[category]
-    current_month = datetime.now().strftime("%Y-%m")
-    spent = get_category_spending(category, current_month)
-    remaining = limit - spent
-    percentage = (spent / limit * 100) if limit > 0 else 0
-    
-    return {
-        'category': category,
-        'budget': limit,
-        'spent': spent,
-        'remaining': remaining,
-        'percentage': percentage,
-        'over_budget': spent > limit
-    }
\ No newline at end of file
+    for row in get_period_snapshot(period):
+        if row['category'] == category:
+            return dict(row, over_budget=row['spent'] > row['budget'])
+    return None
@@ -0,0 +1,177 @@
+# core/charts.py
+"""
+Chart images for the report windows.
+
+Charts are drawn on matplotlib Figure objects created directly, never
+through pyplot, so no global figure manager keeps them alive: each figure
+is rendered to PNG with the Agg canvas and then dropped. The PNG bytes are
+cached under a hash of the chart kind and the data it plots, so reopening
+a report whose data has not changed skips matplotlib altogether.
+
+Nothing here touches Tk, so charts can be rendered on QueryExecutor
+worker threads and in the memory benchmark.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+CACHE_SIZE = 32        # rendered images kept (a few hundred KB each)
+DPI = 100
+
+
+def _rotate_labels(ax):
+    from matplotlib.artist import setp
+    setp(ax.get_xticklabels(), rotation=45, ha="right")
+
+
+# ==================== Chart Drawing ====================
+
+def _draw_spending(fig, data):
+    """data: (month label, list of (category, amount))"""
+    month, expenses = data
+    categories, amounts = zip(*expenses)
+    ax = fig.add_subplot()
+    ax.pie(amounts, labels=categories, autopct='%1.1f%%', startangle=90)
+    ax.axis('equal')
+    ax.set_title(f"Monthly Spending by Category ({month})", fontsize=14, pad=20)
+
+
+def _draw_income_vs_expense(fig, data):
+    """data: (month label, total income, total expenses)"""
+    month, income, expenses = data
+    categories = ['Income', 'Expenses']
+    amounts = [income, expenses]
+    colors = ['#4CAF50', '#f44336']
+
+    ax = fig.add_subplot()
+    bars = ax.bar(categories, amounts, color=colors)
+    ax.set_ylabel('Amount ($)')
+    ax.set_title(f"Income vs Expenses ({month})", fontsize=14, pad=20)
+
+    # Add value labels on bars
+    for bar, amount in zip(bars, amounts):
+        ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 5,
+                f'${amount:.2f}', ha='center', va='bottom')
+
+
+def _draw_trend(fig, data):
+    """data: (list of (month, expenses), list of (month, balance))"""
+    trend, balances = data
+    ax, balance_ax = fig.subplots(1, 2)
+
+    months, amounts = zip(*trend)
+    ax.plot(months, amounts, marker='o', linewidth=2, markersize=8, color='#2196F3')
+    ax.set_ylabel('Total Expenses ($)')
+    ax.set_xlabel('Month')
+    ax.set_title("Monthly Spending Trend (Last 6 Months)", fontsize=14, pad=20)
+    ax.grid(True, alpha=0.3)
+    _rotate_labels(ax)
+
+    # Add value labels on points
+    for month, amount in zip(months, amounts):
+        ax.annotate(f'${amount:.0f}', (month, amount),
+                    textcoords="offset points", xytext=(0,10), ha='center')
+
+    balance_months, balance_values = zip(*balances)
+    balance_ax.plot(balance_months, balance_values, marker='o', linewidth=2, markersize=8, color='#4CAF50')
+    balance_ax.set_ylabel('Balance at Month End ($)')
+    balance_ax.set_xlabel('Month')
+    balance_ax.set_title("Balance Trend", fontsize=14, pad=20)
+    balance_ax.grid(True, alpha=0.3)
+    _rotate_labels(balance_ax)
+    fig.tight_layout()
+
+
+# kind -> (draw function, figure size in inches)
+CHARTS = {
+    'spending': (_draw_spending, (7.8, 5.0)),
+    'income_vs_expense': (_draw_income_vs_expense, (7.8, 5.0)),
+    'trend': (_draw_trend, (11.8, 5.0)),
+}
+
+
+def render_png(kind, data):
+    """
+    Draw a chart on a fresh Figure and render it with the Agg canvas.
+    The figure is not registered anywhere and is freed on return.
+    Returns: PNG bytes
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    draw, size = CHARTS[kind]
+    fig = Figure(figsize=size, dpi=DPI)
+    FigureCanvasAgg(fig)
+    draw(fig, data)
+    buffer = BytesIO()
+    fig.savefig(buffer, format='png')
+    fig.clear()
+    return buffer.getvalue()
+
+
+# ==================== Image Cache ====================
+
+class ChartCache:
+    """LRU of rendered chart PNGs keyed by a hash of (kind, data)."""
+
+    def __init__(self, size=CACHE_SIZE):
+        self.size = size
+        self.images = OrderedDict()    # key -> PNG bytes, least recently used first
+        self.stats = {'hits': 0, 'renders': 0, 'evictions': 0}
+        self._lock = threading.Lock()
+        self._render_lock = threading.Lock()
+
+    @staticmethod
+    def key(kind, data):
+        """Returns: hex digest of the chart kind and its data"""
+        return hashlib.sha1(repr((kind, data)).encode('utf-8')).hexdigest()
+
+    def get(self, kind, data):
+        """
+        Get a chart image, rendering it only if this data has not been
+        drawn recently.
+        Returns: PNG bytes
+        """
+        key = self.key(kind, data)
+        with self._lock:
+            if key in self.images:
+                self.images.move_to_end(key)
+                self.stats['hits'] += 1
+                return self.images[key]
+
+        # One render at a time: matplotlib's font and text caches are shared
+        with self._render_lock:
+            png = render_png(kind, data)
+
+        with self._lock:
+            self.stats['renders'] += 1
+            self.images[key] = png
+            self.images.move_to_end(key)
+            while len(self.images) > self.size:
+                self.images.popitem(last=False)
+                self.stats['evictions'] += 1
+        return png
+
+    def clear(self):
+        with self._lock:
+            self.images.clear()
+
+    def memory_bytes(self):
+        """Returns: total size of the cached images"""
+        with self._lock:
+            return sum(len(png) for png in self.images.values())
+
+
+_cache = None
+
+
+def get_chart_cache():
+    """
+    Get the process-wide chart image cache.
+    Returns: ChartCache
+    """
+    global _cache
+    if _cache is None:
+        _cache = ChartCache()
+    return _cache
@@ -1,15 +1,551 @@
 # core/database.py
+import contextvars
+import datetime
 import sqlite3
+import threading
+from contextlib import contextmanager
+from decimal import Decimal, ROUND_HALF_UP
+from .profiler import profiler, ProfiledCursor
 
-def init_db():
+DB_PATH = 'finance.db'
+
+# Pragmas applied once to every pooled connection.
+# WAL lets the UI keep reading while a write is in flight, and with WAL
+# synchronous=NORMAL only syncs at checkpoints instead of on every commit.
+CONNECTION_PRAGMAS = (
+    ('journal_mode', 'WAL'),
+    ('synchronous', 'NORMAL'),
+    ('cache_size', -16000),      # negative = KiB, so ~16 MB of page cache
+    ('mmap_size', 268435456),    # map up to 256 MB of the file
+    ('temp_store', 'MEMORY'),
+)
+
+
+class PooledConnection(sqlite3.Connection):
+    """
+    sqlite3 connection owned by a ConnectionPool.
+    close() only discards uncommitted work so legacy callers cannot
+    tear down a connection that other code on the same thread is reusing.
+    While the profiler is enabled, statements go through ProfiledCursor.
+    """
+
+    def cursor(self, factory=None):
+        if factory is None:
+            factory = ProfiledCursor if profiler.enabled else sqlite3.Cursor
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        if profiler.enabled:
+            return self.cursor(ProfiledCursor).execute(sql, parameters)
+        return super().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        if profiler.enabled:
+            return self.cursor(ProfiledCursor).executemany(sql, seq_of_parameters)
+        return super().executemany(sql, seq_of_parameters)
+
+    def close(self):
+        if self.in_transaction:
+            self.rollback()
+
+    def _close(self):
+        sqlite3.Connection.close(self)
+
+
+class QueryCache:
+    """
+    In-process cache of query results for one database.
+
+    Entries are keyed by (query name, arguments) and depend on data tags
+    such as 'budgets', 'transactions' or 'transactions:2024-06'. Each tag
+    has a version counter; writes bump the tags they touch, and an entry is
+    served only while every tag it depends on still has the version it was
+    read at. A transaction tag covers every month; a month tag only that month.
+
+    check: optional callable run before every lookup; ConnectionPool uses
+    it to clear the cache after commits from outside the pool.
     """
-    Initialize the database and create tables if they don't exist.
-    Also populate default categories if none exist.
+
+    def __init__(self, max_entries=256, check=None):
+        self.max_entries = max_entries
+        self.check = check
+        self._entries = {}
+        self._versions = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+    def _snapshot(self, tags):
+        return (self._generation, *(self._versions.get(tag, 0) for tag in tags))
+
+    def get(self, key, tags, compute):
+        """
+        Return the cached result for key, or compute and store it.
+        Results are shared between callers and must not be modified.
+        """
+        if self.check:
+            self.check()
+        with self._lock:
+            entry = self._entries.get(key)
+            versions = self._snapshot(tags)
+            if entry is not None and entry[0] == versions:
+                self.stats['hits'] += 1
+                return entry[1]
+            self.stats['misses'] += 1
+
+        # Versions are taken before the query runs, so a write that commits
+        # while it is running leaves this entry already stale.
+        result = compute()
+        with self._lock:
+            self._entries.pop(key, None)
+            if len(self._entries) >= self.max_entries:
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (versions, result)
+        return result
+
+    def version(self, *tags):
+        """
+        Returns: hashable token that changes whenever any of tags is
+                 invalidated or the whole cache is cleared
+        """
+        if self.check:
+            self.check()
+        with self._lock:
+            return self._snapshot(tags)
+
+    def invalidate(self, *tags):
+        """Bump the given tags; with no tags, drop every entry."""
+        with self._lock:
+            self.stats['invalidations'] += 1
+            if not tags:
+                self._generation += 1
+                self._entries.clear()
+                return
+            for tag in tags:
+                self._versions[tag] = self._versions.get(tag, 0) + 1
+
+    def get_stats(self):
+        """
+        Returns: dict with hits, misses, invalidations, entries and hit_rate
+        """
+        with self._lock:
+            stats = dict(self.stats, entries=len(self._entries))
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+
+class ConnectionPool:
+    """
+    Small pool of configured, long-lived connections to one database file.
+    Each thread reuses a single connection; connections released by
+    finished threads are kept idle (up to max_idle) for the next thread.
+
+    Writes made through the pool invalidate the cache tags they touch.
+    Commits from outside the pool (another process such as a CLI import,
+    or a plain sqlite3 connection) are caught by PRAGMA data_version on a
+    connection the pool keeps for that alone: it changes on every commit
+    by any other connection, so after each of its own commits the pool
+    records the new value, and the next cache lookup that finds a value
+    it did not record clears the whole cache.
     """
-    conn = sqlite3.connect('finance.db')
-    c = conn.cursor()
-    
-    # Create transactions table
+
+    def __init__(self, path, max_idle=4):
+        self.path = path
+        self.max_idle = max_idle
+        self.cache = QueryCache(check=self.check_external_writes)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._idle = []
+        self._open = []
+        self._observer = None          # connection that only reads data_version
+        self._data_version = None      # its value after the pool's last commit
+        self.commits = 0               # commits started through the pool
+        self._version_lock = threading.Lock()
+
+    def _connect(self):
+        # check_same_thread is off because idle connections move between
+        # threads; the pool guarantees only one thread holds each at a time.
+        conn = sqlite3.connect(self.path, factory=PooledConnection, check_same_thread=False)
+        for name, value in CONNECTION_PRAGMAS:
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def _read_data_version(self):
+        """Caller holds _version_lock. Returns: the observer's PRAGMA data_version"""
+        if self._observer is None:
+            self._observer = self._connect()
+        return sqlite3.Connection.execute(self._observer, "PRAGMA data_version").fetchone()[0]
+
+    def _check_external_writes(self):
+        """Caller holds _version_lock. Returns: True if the cache was cleared"""
+        version = self._read_data_version()
+        if version == self._data_version:
+            return False
+        self._data_version = version
+        self.cache.invalidate()
+        return True
+
+    def check_external_writes(self):
+        """
+        Clear the cache if a connection outside the pool has committed since
+        the last check. The first check has no baseline and clears too.
+        """
+        with self._version_lock:
+            self._check_external_writes()
+
+    def acquire(self):
+        """
+        Get the calling thread's connection, creating it on first use.
+        Returns: PooledConnection
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            with self._lock:
+                conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                conn = self._connect()
+                with self._lock:
+                    self._open.append(conn)
+            self._local.conn = conn
+            self._local.depth = 0
+            self._local.touched = None
+        return conn
+
+    def release(self):
+        """
+        Hand the calling thread's connection back to the pool.
+        Worker threads should call this before they exit.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            return
+        self._local.conn = None
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+            self._open.remove(conn)
+        conn._close()
+
+    @contextmanager
+    def connection(self):
+        """Context manager yielding the calling thread's connection."""
+        yield self.acquire()
+
+    def touch(self, *tags):
+        """
+        Record that the current transaction writes data under the given
+        cache tags (see QueryCache). They are invalidated when it commits.
+        """
+        touched = getattr(self._local, 'touched', None)
+        if touched is None:
+            self.cache.invalidate(*tags)
+        else:
+            touched.update(tags)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Context manager for a write transaction.
+        Commits on success, rolls back on error. Nested blocks join the
+        outermost transaction, which owns the commit. On commit the cache
+        tags recorded with touch() are invalidated; a transaction that
+        touched nothing clears the whole cache.
+        """
+        conn = self.acquire()
+        if self._local.depth:
+            self._local.depth += 1
+            try:
+                yield conn
+            finally:
+                self._local.depth -= 1
+            return
+
+        self._local.depth = 1
+        self._local.touched = touched = set()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        else:
+            # The write lock taken by BEGIN IMMEDIATE keeps other connections
+            # from committing before ours; one landing in the instant between
+            # our commit and the read below is taken for ours.
+            with self._version_lock:
+                self._check_external_writes()
+                self.commits += 1
+                conn.commit()
+                self._data_version = self._read_data_version()
+            self.cache.invalidate(*touched)
+        finally:
+            self._local.depth = 0
+            self._local.touched = None
+
+    def close_all(self):
+        """Close every connection opened by this pool."""
+        with self._lock:
+            conns, self._open, self._idle = self._open, [], []
+        with self._version_lock:
+            if self._observer is not None:
+                conns.append(self._observer)
+            self._observer, self._data_version = None, None
+        for conn in conns:
+            conn._close()
+        self._local = threading.local()
+
+
+_pool = ConnectionPool(DB_PATH)
+
+# Pool selected with use_pool() for the current thread or task (see ledgers.py)
+_active_pool = contextvars.ContextVar('active_pool', default=None)
+
+# Month filters are equality lookups on the indexed month key, so they
+# never have to evaluate a function over every row.
+# (type, month, category, amount_cents) covers all per-month aggregates;
+# (month, date) serves the month listing already in date order.
+TRANSACTION_INDEXES = {
+    'idx_transactions_type_month': '''
+        CREATE INDEX IF NOT EXISTS idx_transactions_type_month
+        ON transactions (type, month, category, amount_cents)
+    ''',
+    'idx_transactions_month_date': '''
+        CREATE INDEX IF NOT EXISTS idx_transactions_month_date
+        ON transactions (month, date)
+    ''',
+}
+
+_ROLLUP_ADD = '''
+    INSERT INTO monthly_totals (month, type, category, total_cents, count)
+    VALUES (NEW.month, NEW.type, NEW.category, NEW.amount_cents, 1)
+    ON CONFLICT (type, month, category)
+    DO UPDATE SET total_cents = total_cents + excluded.total_cents, count = count + 1;
+'''
+_ROLLUP_REMOVE = '''
+    UPDATE monthly_totals SET total_cents = total_cents - OLD.amount_cents, count = count - 1
+    WHERE type = OLD.type AND month = OLD.month AND category = OLD.category;
+    DELETE FROM monthly_totals
+    WHERE type = OLD.type AND month = OLD.month AND category = OLD.category AND count <= 0;
+'''
+
+MONTHLY_TOTALS_TRIGGERS = {
+    'trg_transactions_rollup_insert': f'''
+        CREATE TRIGGER IF NOT EXISTS trg_transactions_rollup_insert
+        AFTER INSERT ON transactions
+        BEGIN {_ROLLUP_ADD} END
+    ''',
+    'trg_transactions_rollup_delete': f'''
+        CREATE TRIGGER IF NOT EXISTS trg_transactions_rollup_delete
+        AFTER DELETE ON transactions
+        BEGIN {_ROLLUP_REMOVE} END
+    ''',
+    'trg_transactions_rollup_update': f'''
+        CREATE TRIGGER IF NOT EXISTS trg_transactions_rollup_update
+        AFTER UPDATE OF date, type, category, amount_cents ON transactions
+        BEGIN {_ROLLUP_REMOVE} {_ROLLUP_ADD} END
+    ''',
+}
+
+
+# Net cash flow per day (income minus expenses), kept current by triggers
+# like the monthly rollup. The balance index (see balance.py) builds its
+# prefix sums from these few thousand rows instead of every transaction.
+_DAILY_NET = "CASE {row}.type WHEN 'income' THEN {row}.amount_cents ELSE -{row}.amount_cents END"
+_DAILY_ADD = f'''
+    INSERT INTO daily_totals (day, net_cents, count)
+    VALUES (NEW.date, {_DAILY_NET.format(row='NEW')}, 1)
+    ON CONFLICT (day)
+    DO UPDATE SET net_cents = net_cents + excluded.net_cents, count = count + 1;
+'''
+_DAILY_REMOVE = f'''
+    UPDATE daily_totals SET net_cents = net_cents - {_DAILY_NET.format(row='OLD')}, count = count - 1
+    WHERE day = OLD.date;
+    DELETE FROM daily_totals WHERE day = OLD.date AND count <= 0;
+'''
+
+DAILY_TOTALS_TRIGGERS = {
+    'trg_transactions_daily_insert': f'''
+        CREATE TRIGGER IF NOT EXISTS trg_transactions_daily_insert
+        AFTER INSERT ON transactions
+        BEGIN {_DAILY_ADD} END
+    ''',
+    'trg_transactions_daily_delete': f'''
+        CREATE TRIGGER IF NOT EXISTS trg_transactions_daily_delete
+        AFTER DELETE ON transactions
+        BEGIN {_DAILY_REMOVE} END
+    ''',
+    'trg_transactions_daily_update': f'''
+        CREATE TRIGGER IF NOT EXISTS trg_transactions_daily_update
+        AFTER UPDATE OF date, type, amount_cents ON transactions
+        BEGIN {_DAILY_REMOVE} {_DAILY_ADD} END
+    ''',
+}
+
+
+# Full-text index over description and category. It is an external-content
+# FTS5 table: it stores only the index, reading text from transactions by
+# rowid, and these triggers keep it in step. prefix='2 3' adds prefix
+# indexes so search-as-you-type queries like "gro*" stay index lookups.
+SEARCH_TRIGGERS = {
+    'trg_transactions_fts_insert': '''
+        CREATE TRIGGER IF NOT EXISTS trg_transactions_fts_insert
+        AFTER INSERT ON transactions
+        BEGIN
+            INSERT INTO transactions_fts (rowid, description, category)
+            VALUES (NEW.id, NEW.description, NEW.category);
+        END
+    ''',
+    'trg_transactions_fts_delete': '''
+        CREATE TRIGGER IF NOT EXISTS trg_transactions_fts_delete
+        AFTER DELETE ON transactions
+        BEGIN
+            INSERT INTO transactions_fts (transactions_fts, rowid, description, category)
+            VALUES ('delete', OLD.id, OLD.description, OLD.category);
+        END
+    ''',
+    'trg_transactions_fts_update': '''
+        CREATE TRIGGER IF NOT EXISTS trg_transactions_fts_update
+        AFTER UPDATE OF description, category ON transactions
+        BEGIN
+            INSERT INTO transactions_fts (transactions_fts, rowid, description, category)
+            VALUES ('delete', OLD.id, OLD.description, OLD.category);
+            INSERT INTO transactions_fts (rowid, description, category)
+            VALUES (NEW.id, NEW.description, NEW.category);
+        END
+    ''',
+}
+
+
+def to_cents(amount):
+    """
+    Convert a dollar amount (float, int, str or Decimal) to integer cents,
+    rounding half up. Going through str() keeps float inputs such as 0.285
+    at the value the user typed rather than its binary approximation.
+    Returns: int
+    """
+    return int((Decimal(str(amount)) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def from_cents(cents):
+    """
+    Convert integer cents back to dollars for display.
+    Returns: float
+    """
+    return cents / 100
+
+
+def get_pool():
+    """
+    Get the connection pool for the calling context: the one selected with
+    use_pool(), otherwise the shared pool.
+    Returns: ConnectionPool
+    """
+    return _active_pool.get() or _pool
+
+
+@contextmanager
+def use_pool(pool):
+    """
+    Context manager directing every database function in the current
+    context (thread, or QueryExecutor task submitted from it) to pool.
+    Blocks nest, and other threads keep their own selection.
+    """
+    token = _active_pool.set(pool)
+    try:
+        yield pool
+    finally:
+        _active_pool.reset(token)
+
+
+def open_database(path):
+    """
+    Point the shared pool at another database file, closing the old
+    pool's connections. Call before any other database function.
+    To serve several databases at once, use a LedgerRegistry instead.
+    Returns: ConnectionPool
+    """
+    global _pool
+    if path != _pool.path:
+        _pool.close_all()
+        _pool = ConnectionPool(path)
+    return _pool
+
+
+def transaction():
+    """Shortcut for get_pool().transaction()."""
+    return get_pool().transaction()
+
+
+def cached(name, args, tags, compute):
+    """
+    Serve a read through the pool's query cache.
+    name/args identify the query; tags are the data it depends on.
+    """
+    return get_pool().cache.get((name, args), tags, compute)
+
+
+def get_cache_stats():
+    """
+    Get query cache hit/miss statistics.
+    Returns: dict (see QueryCache.get_stats)
+    """
+    return get_pool().cache.get_stats()
+
+
+@contextmanager
+def bulk_load():
+    """
+    Transaction for loading many rows at once.
+    Secondary indexes, rollup, daily total and search triggers are dropped
+    for the duration and rebuilt in one pass at the end, which is far cheaper than maintaining
+    them row by row. Everything happens in one transaction, so a failed
+    load leaves the schema untouched.
+    """
+    with transaction() as conn:
+        get_pool().touch('transactions')
+        for name in TRANSACTION_INDEXES:
+            conn.execute(f"DROP INDEX IF EXISTS {name}")
+        triggers = {**MONTHLY_TOTALS_TRIGGERS, **DAILY_TOTALS_TRIGGERS, **SEARCH_TRIGGERS}
+        for name in triggers:
+            conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+        yield conn
+
+        for index_sql in TRANSACTION_INDEXES.values():
+            conn.execute(index_sql)
+        for trigger_sql in triggers.values():
+            conn.execute(trigger_sql)
+        rebuild_monthly_totals()
+        rebuild_daily_totals()
+        rebuild_search_index()
+
+
+DEFAULT_CATEGORIES = [
+    'Rent',
+    'Groceries',
+    'Utilities',
+    'Entertainment',
+    'Transport',
+    'Dining',
+    'Shopping',
+    'Healthcare',
+    'Insurance',
+    'Salary',
+    'Other'
+]
+
+
+# ==================== Schema Migrations ====================
+# Each migration upgrades the schema by one version; PRAGMA user_version
+# records the last one applied. Migrations must tolerate databases created
+# before versioning existed (user_version 0 with some tables present).
+
+def _migrate_base_tables(c):
+    """v1: transactions and budgets tables, plus the default categories."""
     c.execute('''
         CREATE TABLE IF NOT EXISTS transactions (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -20,8 +556,6 @@ def init_db():
             description TEXT
         )
     ''')
-
-    # Create budgets table
     c.execute('''
         CREATE TABLE IF NOT EXISTS budgets (
             category TEXT PRIMARY KEY,
@@ -32,38 +566,603 @@ def init_db():
     # Insert default categories if table is empty
     c.execute("SELECT COUNT(*) FROM budgets")
     if c.fetchone()[0] == 0:
-        default_categories = [
-            'Rent',
-            'Groceries', 
-            'Utilities',
-            'Entertainment',
-            'Transport',
-            'Dining',
-            'Shopping',
-            'Healthcare',
-            'Insurance',
-            'Salary',
-            'Other'
-        ]
-        
-        for category in default_categories:
-            c.execute(
-                "INSERT INTO budgets (category, limit_amount) VALUES (?, ?)",
-                (category, 0.0)
+        c.executemany(
+            "INSERT INTO budgets (category, limit_amount) VALUES (?, ?)",
+            [(category, 0.0) for category in DEFAULT_CATEGORIES]
+        )
+
+
+def _migrate_month_column(c):
+    """v2: generated month column on transactions (indexes: see v4)."""
+    # Generated columns only show up in table_xinfo, not table_info.
+    columns = [row[1] for row in c.execute("PRAGMA table_xinfo(transactions)")]
+    if 'month' not in columns:
+        c.execute('''
+            ALTER TABLE transactions
+            ADD COLUMN month TEXT GENERATED ALWAYS AS (substr(date, 1, 7)) VIRTUAL
+        ''')
+
+
+def _migrate_monthly_totals(c):
+    """v3: monthly_totals rollup table (triggers and initial build: see v4)."""
+    # Per-month rollup of transactions, kept current by triggers so
+    # reports read O(categories) rows instead of O(transactions).
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS monthly_totals (
+            month TEXT NOT NULL,
+            type TEXT NOT NULL,
+            category TEXT NOT NULL,
+            total REAL NOT NULL DEFAULT 0,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (type, month, category)
+        ) WITHOUT ROWID
+    ''')
+
+
+def _migrate_integer_cents(c):
+    """
+    v4: store money as integer cents instead of REAL dollars.
+    SQLite cannot change a column's type in place, so transactions, budgets
+    and monthly_totals are rebuilt. Dropping the old transactions table also
+    drops its indexes and rollup triggers, which are recreated here for the
+    new columns; that is why v2 and v3 no longer create them.
+    SQLite integers are 64-bit, so sums over cents are exact in SQL and the
+    database layer needs no NumPy int64 arrays (only the optional columnar
+    engine in ledger.py uses NumPy).
+    Amounts are converted with to_cents(), registered as an SQL function,
+    so a stored 0.285 becomes 29 cents as it would if entered today;
+    ROUND(amount * 100) would round the binary float down to 28.
+    """
+    c.connection.create_function('to_cents', 1, to_cents, deterministic=True)
+    c.execute('''
+        CREATE TABLE transactions_v4 (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date TEXT NOT NULL,
+            type TEXT NOT NULL,          -- 'income' or 'expense'
+            category TEXT NOT NULL,
+            amount_cents INTEGER NOT NULL,
+            description TEXT,
+            month TEXT GENERATED ALWAYS AS (substr(date, 1, 7)) VIRTUAL
+        )
+    ''')
+    c.execute('''
+        INSERT INTO transactions_v4 (id, date, type, category, amount_cents, description)
+        SELECT id, date, type, category, to_cents(amount), description
+        FROM transactions
+    ''')
+    c.execute("DROP TABLE transactions")
+    c.execute("ALTER TABLE transactions_v4 RENAME TO transactions")
+
+    c.execute('''
+        CREATE TABLE budgets_v4 (
+            category TEXT PRIMARY KEY,
+            limit_cents INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    c.execute('''
+        INSERT INTO budgets_v4 (category, limit_cents)
+        SELECT category, to_cents(limit_amount) FROM budgets
+    ''')
+    c.execute("DROP TABLE budgets")
+    c.execute("ALTER TABLE budgets_v4 RENAME TO budgets")
+
+    c.execute("DROP TABLE IF EXISTS monthly_totals")
+    c.execute('''
+        CREATE TABLE monthly_totals (
+            month TEXT NOT NULL,
+            type TEXT NOT NULL,
+            category TEXT NOT NULL,
+            total_cents INTEGER NOT NULL DEFAULT 0,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (type, month, category)
+        ) WITHOUT ROWID
+    ''')
+    for index_sql in TRANSACTION_INDEXES.values():
+        c.execute(index_sql)
+    for trigger_sql in MONTHLY_TOTALS_TRIGGERS.values():
+        c.execute(trigger_sql)
+    rebuild_monthly_totals()
+
+
+def _migrate_search_index(c):
+    """v5: full-text search index over description and category."""
+    c.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts USING fts5(
+            description,
+            category,
+            content='transactions',
+            content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2',
+            prefix='2 3'
+        )
+    ''')
+    for trigger_sql in SEARCH_TRIGGERS.values():
+        c.execute(trigger_sql)
+    rebuild_search_index()
+
+
+def _migrate_daily_totals(c):
+    """v6: daily_totals net cash flow per day, for balance queries."""
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS daily_totals (
+            day TEXT PRIMARY KEY,
+            net_cents INTEGER NOT NULL DEFAULT 0,
+            count INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+    ''')
+    for trigger_sql in DAILY_TOTALS_TRIGGERS.values():
+        c.execute(trigger_sql)
+    rebuild_daily_totals()
+
+
+MIGRATIONS = [
+    _migrate_base_tables,
+    _migrate_month_column,
+    _migrate_monthly_totals,
+    _migrate_integer_cents,
+    _migrate_search_index,
+    _migrate_daily_totals,
+]
+SCHEMA_VERSION = len(MIGRATIONS)
+
+_init_lock = threading.Lock()
+_initialized_paths = set()
+
+
+def init_db():
+    """
+    Bring the database schema up to SCHEMA_VERSION.
+    Idempotent and cheap: the work is done once per database per process,
+    and on an up-to-date database it costs a single PRAGMA read.
+    Returns: schema version found before migrating
+    """
+    pool = get_pool()
+    with _init_lock:
+        if pool.path in _initialized_paths:
+            return SCHEMA_VERSION
+
+        version = pool.acquire().execute("PRAGMA user_version").fetchone()[0]
+        if version > SCHEMA_VERSION:
+            raise RuntimeError(
+                f"Database schema version {version} is newer than this app supports ({SCHEMA_VERSION})."
             )
+        if version < SCHEMA_VERSION:
+            with transaction() as conn:
+                # Re-read under the write lock in case another process migrated first
+                version = conn.execute("PRAGMA user_version").fetchone()[0]
+                c = conn.cursor()
+                for target in range(version + 1, SCHEMA_VERSION + 1):
+                    MIGRATIONS[target - 1](c)
+                    c.execute(f"PRAGMA user_version = {target}")
+
+        _initialized_paths.add(pool.path)
+    return version
+
+
+def month_tags(month):
+    """
+    Cache tags for data derived from one month's transactions.
+    Returns: tuple of str
+    """
+    return ('transactions', f'transactions:{month}')
 
-    conn.commit()
-    conn.close()
-    
-    print("✅ Database initialized successfully")
 
 def get_db_connection():
     """
-    Get a database connection.
+    Get the calling thread's pooled database connection.
+    The connection is shared; calling close() on it is harmless.
     Returns: sqlite3.Connection object
     """
-    return sqlite3.connect('finance.db')
+    return get_pool().acquire()
+
+
+# ==================== Transactions ====================
+
+_transaction_listeners = []
+
+
+def add_transaction_listener(listener):
+    """
+    Call listener(date, type, category, amount_cents, commits_before)
+    after every add_transaction(). commits_before is the pool's commits
+    count just before the insert committed: state read while the count was
+    still commits_before cannot include the row, state read later may.
+    Bulk writes (imports, bulk_load) do not notify listeners; they touch
+    the 'transactions' cache tag instead.
+    """
+    _transaction_listeners.append(listener)
+
+
+def remove_transaction_listener(listener):
+    if listener in _transaction_listeners:
+        _transaction_listeners.remove(listener)
+
+
+def validate_date(value):
+    """
+    Check that value is a calendar date written as 'YYYY-MM-DD', the only
+    form the month column, the rollups and the balance index understand.
+    Returns: value
+    Raises: ValueError
+    """
+    try:
+        if datetime.date.fromisoformat(value).isoformat() != value:
+            raise ValueError
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid date '{value}'. Use YYYY-MM-DD.") from None
+    return value
+
+
+def add_transaction(date, trans_type, category, amount, description=""):
+    """
+    Insert a single transaction. amount is in dollars.
+    Returns: id of the new row
+    Raises: ValueError for a date that is not 'YYYY-MM-DD'
+    """
+    validate_date(date)
+    amount_cents = to_cents(amount)
+    pool = get_pool()
+    with pool.transaction() as conn:
+        cur = conn.execute('''
+            INSERT INTO transactions (date, type, category, amount_cents, description)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (date, trans_type, category, amount_cents, description))
+        pool.touch(f'transactions:{date[:7]}')
+        # Holding the write lock, so no other commit can start before ours
+        commits_before = pool.commits
+    for listener in list(_transaction_listeners):
+        listener(date, trans_type, category, amount_cents, commits_before)
+    return cur.lastrowid
+
+
+def get_transactions_for_month(month):
+    """
+    Get all transactions for a month ('YYYY-MM'), newest first.
+    Returns: list of (date, type, category, amount, description)
+    """
+    def query():
+        conn = get_db_connection()
+        return conn.execute('''
+            SELECT date, type, category, amount_cents / 100.0, description
+            FROM transactions
+            WHERE month = ?
+            ORDER BY date DESC, id DESC
+        ''', (month,)).fetchall()
+
+    return cached('transactions_for_month', (month,), month_tags(month), query)
+
+
+def get_transactions_page(month, after=None, through=None, limit=None):
+    """
+    Keyset-paginated transactions for a month, newest first.
+    Pages are addressed by (date, id) keys rather than OFFSET, so each page
+    is an index range read no matter how deep into the month it is.
+
+    after: (date, id) key; only rows strictly older than it are returned
+    through: (date, id) key; only rows at least as new as it are returned
+    limit: maximum number of rows (None for no limit)
+    Returns: list of (id, date, type, category, amount, description)
+    """
+    sql = '''
+        SELECT id, date, type, category, amount_cents / 100.0, description
+        FROM transactions
+        WHERE month = ?
+    '''
+    params = [month]
+    if after is not None:
+        sql += " AND (date, id) < (?, ?)"
+        params.extend(after)
+    if through is not None:
+        sql += " AND (date, id) >= (?, ?)"
+        params.extend(through)
+    sql += " ORDER BY date DESC, id DESC"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
+
+    conn = get_db_connection()
+    return conn.execute(sql, params).fetchall()
+
+
+def get_all_transactions():
+    """
+    Get every transaction, newest first.
+    Returns: list of (date, type, category, amount, description)
+    """
+    conn = get_db_connection()
+    return conn.execute('''
+        SELECT date, type, category, amount_cents / 100.0, description
+        FROM transactions
+        ORDER BY date DESC, id DESC
+    ''').fetchall()
+
+
+# ==================== Categories & Budgets ====================
+
+def get_all_categories():
+    """
+    Get all category names, sorted.
+    Returns: list of str
+    """
+    def query():
+        conn = get_db_connection()
+        return [row[0] for row in conn.execute("SELECT category FROM budgets ORDER BY category")]
+
+    return cached('all_categories', (), ('budgets',), query)
+
+
+def add_category(category):
+    """
+    Add a new category with no budget.
+    Returns: bool (False if it already exists)
+    """
+    with transaction() as conn:
+        get_pool().touch('budgets')
+        cur = conn.execute(
+            "INSERT OR IGNORE INTO budgets (category, limit_cents) VALUES (?, 0)",
+            (category,)
+        )
+    return cur.rowcount == 1
+
+
+def delete_category(category):
+    """
+    Delete a category that has no transactions.
+    Returns: (success, message)
+    """
+    with transaction() as conn:
+        get_pool().touch('budgets')
+        in_use = conn.execute(
+            "SELECT COUNT(*) FROM transactions WHERE category = ?", (category,)
+        ).fetchone()[0]
+        if in_use:
+            return False, f"Category '{category}' is used by {in_use} transaction(s)."
+        conn.execute("DELETE FROM budgets WHERE category = ?", (category,))
+    return True, f"✅ Category '{category}' deleted."
+
+
+def get_category_budgets():
+    """
+    Get the monthly budget limit of every category, in dollars.
+    Returns: list of (category, limit_amount)
+    """
+    def query():
+        conn = get_db_connection()
+        return conn.execute(
+            "SELECT category, limit_cents / 100.0 FROM budgets ORDER BY category"
+        ).fetchall()
+
+    return cached('category_budgets', (), ('budgets',), query)
+
+
+def set_category_budget(category, amount):
+    """Set the monthly budget limit (in dollars) for a category."""
+    with transaction() as conn:
+        get_pool().touch('budgets')
+        conn.execute('''
+            INSERT INTO budgets (category, limit_cents) VALUES (?, ?)
+            ON CONFLICT(category) DO UPDATE SET limit_cents = excluded.limit_cents
+        ''', (category, to_cents(amount)))
+
+
+def get_category_spending(category, month):
+    """
+    Get total expenses for a category in a month ('YYYY-MM').
+    Returns: float
+    """
+    def query():
+        conn = get_db_connection()
+        return conn.execute('''
+            SELECT COALESCE(SUM(total_cents), 0) / 100.0
+            FROM monthly_totals
+            WHERE type = 'expense'
+            AND month = ?
+            AND category = ?
+        ''', (month, category)).fetchone()[0]
+
+    return cached('category_spending', (category, month), month_tags(month), query)
+
+
+def get_budget_snapshot(month):
+    """
+    Get every category's budget and spending for a month ('YYYY-MM')
+    in a single query against the monthly rollup.
+    Returns: list of dicts with category, budget, spent, remaining, percentage
+    """
+    def query():
+        conn = get_db_connection()
+        return conn.execute('''
+            SELECT b.category, b.limit_cents, COALESCE(m.total_cents, 0)
+            FROM budgets b
+            LEFT JOIN monthly_totals m
+                ON m.type = 'expense'
+                AND m.month = ?
+                AND m.category = b.category
+            ORDER BY b.category
+        ''', (month,)).fetchall()
+
+    rows = cached('budget_snapshot', (month,), ('budgets', *month_tags(month)), query)
+    # Exact integer arithmetic in cents; dollars only for the result
+    return [
+        {
+            'category': category,
+            'budget': from_cents(limit),
+            'spent': from_cents(spent),
+            'remaining': from_cents(limit - spent),
+            'percentage': (spent * 100 / limit) if limit > 0 else 0
+        }
+        for category, limit, spent in rows
+    ]
+
+
+# ==================== Search ====================
+
+def build_search_query(text, prefix=True):
+    """
+    Turn what the user typed into an FTS5 query: every word must match,
+    and with prefix the last word may be incomplete ("gro" finds
+    "groceries"). Words are quoted, so FTS5 operators and punctuation in
+    the input are taken literally.
+    Returns: str, or None if text has no words
+    """
+    words = ['"' + word.replace('"', '""') + '"' for word in text.split()]
+    if not words:
+        return None
+    if prefix:
+        words[-1] += '*'
+    return ' '.join(words)
+
+
+SEARCH_RANK_WINDOW = 1000
+
+
+def search_transactions(text, limit=50, offset=0, prefix=True):
+    """
+    Full-text search over transaction descriptions and categories.
+    bm25 has to score every match before it can return the best, which
+    for a common word is hundreds of milliseconds on millions of rows. So
+    only the newest SEARCH_RANK_WINDOW matches are ranked, best first;
+    older matches follow, newest first. Ranked results have no stable key
+    to page from, so pages are addressed by offset.
+    Returns: list of (id, date, type, category, amount, description)
+    """
+    query = build_search_query(text, prefix)
+    if query is None:
+        return []
+
+    conn = get_db_connection()
+    rows = []
+    if offset < SEARCH_RANK_WINDOW:
+        rows = conn.execute('''
+            WITH recent AS (
+                SELECT rowid, rank
+                FROM transactions_fts
+                WHERE transactions_fts MATCH ?
+                ORDER BY rowid DESC
+                LIMIT ?
+            )
+            SELECT t.id, t.date, t.type, t.category, t.amount_cents / 100.0, t.description
+            FROM recent
+            JOIN transactions t ON t.id = recent.rowid
+            ORDER BY recent.rank, recent.rowid DESC
+            LIMIT ? OFFSET ?
+        ''', (query, SEARCH_RANK_WINDOW, limit, offset)).fetchall()
+        if offset + len(rows) < SEARCH_RANK_WINDOW:
+            return rows  # fewer matches than the window holds
+
+    if len(rows) < limit:
+        start = max(offset, SEARCH_RANK_WINDOW)
+        rows += conn.execute('''
+            SELECT t.id, t.date, t.type, t.category, t.amount_cents / 100.0, t.description
+            FROM transactions_fts f
+            JOIN transactions t ON t.id = f.rowid
+            WHERE transactions_fts MATCH ?
+            ORDER BY f.rowid DESC
+            LIMIT ? OFFSET ?
+        ''', (query, offset + limit - start, start)).fetchall()
+    return rows
+
+
+def rebuild_search_index():
+    """Rebuild the full-text index from the transactions table."""
+    with transaction() as conn:
+        get_pool().touch('search')  # nothing caches search results
+        conn.execute("INSERT INTO transactions_fts (transactions_fts) VALUES ('rebuild')")
+
+
+# ==================== Monthly Rollup ====================
+
+def rebuild_monthly_totals():
+    """
+    Recompute the monthly_totals rollup from the transactions table.
+    Returns: number of rollup rows written
+    """
+    with transaction() as conn:
+        get_pool().touch('transactions')
+        conn.execute("DELETE FROM monthly_totals")
+        cur = conn.execute('''
+            INSERT INTO monthly_totals (month, type, category, total_cents, count)
+            SELECT month, type, category, SUM(amount_cents), COUNT(*)
+            FROM transactions
+            GROUP BY type, month, category
+        ''')
+    return cur.rowcount
+
+
+def rebuild_daily_totals():
+    """
+    Recompute the daily_totals table from the transactions table.
+    Returns: number of days written
+    """
+    with transaction() as conn:
+        get_pool().touch('transactions')
+        conn.execute("DELETE FROM daily_totals")
+        cur = conn.execute(f'''
+            INSERT INTO daily_totals (day, net_cents, count)
+            SELECT date, SUM({_DAILY_NET.format(row='transactions')}), COUNT(*)
+            FROM transactions
+            GROUP BY date
+        ''')
+    return cur.rowcount
+
+
+def get_daily_totals():
+    """
+    Get the net cash flow of every day with transactions, oldest first.
+    Returns: list of (day, net_cents)
+    """
+    conn = get_db_connection()
+    return conn.execute("SELECT day, net_cents FROM daily_totals ORDER BY day").fetchall()
+
+
+def verify_monthly_totals():
+    """
+    Compare the monthly_totals rollup against a full re-aggregation.
+    Amounts are integer cents, so the comparison is exact.
+    Returns: list of (month, type, category, expected, actual) mismatches,
+             where expected/actual are (total_cents, count) or None if missing
+    """
+    conn = get_db_connection()
+    expected = {
+        (month, trans_type, category): (total, count)
+        for month, trans_type, category, total, count in conn.execute('''
+            SELECT month, type, category, SUM(amount_cents), COUNT(*)
+            FROM transactions
+            GROUP BY type, month, category
+        ''')
+    }
+    actual = {
+        (month, trans_type, category): (total, count)
+        for month, trans_type, category, total, count in conn.execute(
+            "SELECT month, type, category, total_cents, count FROM monthly_totals"
+        )
+    }
+
+    return [
+        (*key, expected.get(key), actual.get(key))
+        for key in sorted(expected.keys() | actual.keys())
+        if expected.get(key) != actual.get(key)
+    ]
+
+
+if __name__ == "__main__":
+    # python -m personal_finance_tool.core.database verify|rebuild|reindex
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Maintain the monthly_totals rollup and search index.")
+    parser.add_argument("command", choices=["verify", "rebuild", "reindex"])
+    args = parser.parse_args()
 
-# Initialize database when module is imported
-if __name__ != "__main__":
-    init_db()
\ No newline at end of file
+    init_db()
+    if args.command == "rebuild":
+        print(f"Rebuilt monthly_totals: {rebuild_monthly_totals()} rows")
+    elif args.command == "reindex":
+        rebuild_search_index()
+        print("Rebuilt the transaction search index")
+    else:
+        mismatches = verify_monthly_totals()
+        for month, trans_type, category, want, got in mismatches:
+            print(f"❌ {month} {trans_type:<8} {category:<20} expected {want}, found {got}")
+        print("✅ monthly_totals matches transactions" if not mismatches
+              else f"{len(mismatches)} mismatched rollup rows")
+        raise SystemExit(1 if mismatches else 0)
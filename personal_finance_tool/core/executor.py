@@ -0,0 +1,116 @@
+# core/executor.py
+"""
+Background execution of database work for the Tk UI.
+
+Queries run on a small thread pool; each worker thread gets its own
+pooled connection (see ConnectionPool) to the database selected where
+the query was submitted (see database.use_pool). Finished results are
+queued and handed back to the Tk thread by a root.after() poller, which
+stops delivering callbacks for the current frame once its time budget
+is used.
+"""
+import contextvars
+import queue
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from .database import get_pool
+from .profiler import profiler
+
+FRAME_BUDGET_MS = 8    # max main-thread time spent on callbacks per poll
+POLL_INTERVAL_MS = 15
+
+
+class QueryExecutor:
+    """
+    Thread pool for database queries whose results come back to Tk.
+
+    root: any Tk widget; only its after() method is used
+    """
+
+    def __init__(self, root, workers=2, frame_budget_ms=FRAME_BUDGET_MS, poll_interval_ms=POLL_INTERVAL_MS):
+        self.root = root
+        self.frame_budget = frame_budget_ms / 1000
+        self.poll_interval_ms = poll_interval_ms
+        self._threads = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="db-worker")
+        self._done = queue.SimpleQueue()
+        self._pending = 0
+        self._polling = False
+        self.stats = {
+            'submitted': 0,
+            'delivered': 0,
+            'frames': 0,
+            'max_frame_ms': 0.0,
+            'frames_over_budget': 0,
+            'callback_errors': 0,
+        }
+
+    def submit(self, func, *args, on_done=None, on_error=None, **kwargs):
+        """
+        Run func(*args, **kwargs) on a worker thread.
+        on_done(result) / on_error(exception) are called on the Tk thread.
+        The submitting thread's profiler actions and selected ledger carry
+        over to the worker.
+        Returns: concurrent.futures.Future
+        """
+        actions = profiler.current_actions()
+        if actions:
+            def run(*args, **kwargs):
+                with profiler.resume(actions):
+                    return func(*args, **kwargs)
+        else:
+            run = func
+        future = self._threads.submit(contextvars.copy_context().run, run, *args, **kwargs)
+        self._pending += 1
+        self.stats['submitted'] += 1
+        future.add_done_callback(lambda f: self._done.put((f, on_done, on_error)))
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_interval_ms, self._poll)
+        return future
+
+    def _poll(self):
+        """Deliver finished results to their callbacks within the frame budget."""
+        start = time.perf_counter()
+        try:
+            while time.perf_counter() - start < self.frame_budget:
+                try:
+                    future, on_done, on_error = self._done.get_nowait()
+                except queue.Empty:
+                    break
+                self._pending -= 1
+                self.stats['delivered'] += 1
+                self._deliver(future, on_done, on_error)
+        finally:
+            # Always reschedule, or results still in flight would never arrive
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.stats['frames'] += 1
+            self.stats['max_frame_ms'] = max(self.stats['max_frame_ms'], elapsed_ms)
+            if elapsed_ms > self.frame_budget * 1000:
+                self.stats['frames_over_budget'] += 1
+
+            if self._pending:
+                self.root.after(self.poll_interval_ms, self._poll)
+            else:
+                self._polling = False
+
+    def _deliver(self, future, on_done, on_error):
+        """Call one result's callback; a callback that raises is reported, not propagated."""
+        error = future.exception()
+        try:
+            if error is None:
+                if on_done:
+                    on_done(future.result())
+            elif on_error:
+                on_error(error)
+            else:
+                print(f"❌ Background query failed: {error}")
+        except Exception:
+            self.stats['callback_errors'] += 1
+            print("❌ Background query callback failed:")
+            traceback.print_exc()
+
+    def shutdown(self):
+        """Stop the worker threads and close every pooled connection."""
+        self._threads.shutdown(wait=True, cancel_futures=True)
+        get_pool().close_all()
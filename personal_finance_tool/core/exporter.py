@@ -0,0 +1,312 @@
+# core/exporter.py
+"""
+Streaming transaction export to CSV, JSON Lines or a compact binary
+columnar format.
+
+Rows are read from a cursor in fetchmany() chunks and written through a
+large buffered file, so memory use stays flat however big the ledger is.
+The CSV output uses the importer's column names and can be re-imported.
+Each export is written to a temporary file next to the target and renamed
+into place only when it is complete, so a failed export never leaves a
+truncated file behind.
+
+Columnar format (little-endian), all integers unsigned unless noted:
+    magic            b'PFCOL1\\n'
+    repeated blocks  u32 row count (0 ends the file), u32 new category count,
+                     new categories as (u16 length, utf-8 bytes),
+                     id i64[n], day i32[n] (days since 1970-01-01),
+                     type u8[n] (1 income, 2 expense), category u32[n]
+                     (index into the categories seen so far),
+                     amount_cents i64[n], description lengths u32[n],
+                     u32 blob length, utf-8 description blob
+"""
+import csv
+import json
+import os
+import struct
+import sys
+import time
+from array import array
+from datetime import date
+from .database import get_db_connection
+
+CHUNK_SIZE = 10000
+WRITE_BUFFER = 1 << 20
+
+COLUMNAR_MAGIC = b'PFCOL1\n'
+COLUMNAR_TYPES = {'income': 1, 'expense': 2}
+_EPOCH = date(1970, 1, 1).toordinal()
+
+FORMAT_EXTENSIONS = {'.csv': 'csv', '.jsonl': 'jsonl', '.pfcol': 'columnar'}
+
+
+def format_cents(cents):
+    """
+    Format integer cents as an exact decimal dollar string.
+    Returns: str (e.g. '12.05')
+    """
+    sign = '-' if cents < 0 else ''
+    dollars, cents = divmod(abs(cents), 100)
+    return f"{sign}{dollars}.{cents:02d}"
+
+
+def _parse_bound(value, name):
+    try:
+        if len(value) != 10:
+            raise ValueError
+        return date.fromisoformat(value).isoformat()
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid {name} date '{value}'. Use YYYY-MM-DD.") from None
+
+
+def date_bounds(start=None, end=None):
+    """
+    Validate an optional inclusive 'YYYY-MM-DD' export range.
+    Returns: (start, end), open ends filled in
+    Raises: ValueError for malformed dates or start after end
+    """
+    start = _parse_bound(start, 'start') if start else '0000-01-01'
+    end = _parse_bound(end, 'end') if end else '9999-12-31'
+    if start > end:
+        raise ValueError(f"Start date {start} is after end date {end}.")
+    return start, end
+
+
+def iter_transaction_chunks(start=None, end=None, chunk_size=CHUNK_SIZE):
+    """
+    Stream transactions in date order, optionally limited to an inclusive
+    'YYYY-MM-DD' date range. day_number is None for rows whose stored date
+    SQLite cannot parse.
+    Yields: lists of (id, date, day_number, type, category, amount_cents, description)
+    Raises: ValueError for an invalid range
+    """
+    # The month bounds let the (month, date) index drive both the range and
+    # the ordering, so there is no sort step holding the result in memory.
+    start, end = date_bounds(start, end)
+    conn = get_db_connection()
+    cur = conn.execute('''
+        SELECT id, date, CAST(julianday(date) - 2440587.5 AS INTEGER),
+               type, category, amount_cents, description
+        FROM transactions
+        WHERE month BETWEEN ? AND ?
+        AND date BETWEEN ? AND ?
+        ORDER BY month, date, id
+    ''', (start[:7], end[:7], start, end))
+    while True:
+        rows = cur.fetchmany(chunk_size)
+        if not rows:
+            return
+        yield rows
+
+
+# ==================== Writers ====================
+
+def _write_csv(path, chunks, progress):
+    with open(path, 'w', newline='', encoding='utf-8', buffering=WRITE_BUFFER) as f:
+        writer = csv.writer(f)
+        writer.writerow(['date', 'type', 'category', 'amount', 'description'])
+        written = 0
+        for rows in chunks:
+            writer.writerows(
+                (row[1], row[3], row[4], format_cents(row[5]), row[6] or '') for row in rows
+            )
+            written += len(rows)
+            if progress:
+                progress(written)
+    return written, 0
+
+
+def _write_jsonl(path, chunks, progress):
+    encode = json.JSONEncoder(ensure_ascii=False).encode
+    with open(path, 'w', encoding='utf-8', buffering=WRITE_BUFFER) as f:
+        written = 0
+        for rows in chunks:
+            f.writelines(
+                encode({
+                    'id': row[0],
+                    'date': row[1],
+                    'type': row[3],
+                    'category': row[4],
+                    'amount': format_cents(row[5]),
+                    'amount_cents': row[5],
+                    'description': row[6] or ''
+                }) + '\n'
+                for row in rows
+            )
+            written += len(rows)
+            if progress:
+                progress(written)
+    return written, 0
+
+
+def _column_bytes(typecode, values):
+    column = array(typecode, values)
+    if sys.byteorder != 'little':
+        column.byteswap()
+    return column.tobytes()
+
+
+def _write_columnar(path, chunks, progress):
+    # Rows without a day number (malformed stored dates) cannot be encoded
+    categories = {}
+    with open(path, 'wb', buffering=WRITE_BUFFER) as f:
+        f.write(COLUMNAR_MAGIC)
+        written = skipped = 0
+        for rows in chunks:
+            if any(row[2] is None for row in rows):
+                valid = [row for row in rows if row[2] is not None]
+                skipped += len(rows) - len(valid)
+                rows = valid
+                if not rows:
+                    continue
+            ids, _, days, types, names, cents, descriptions = zip(*rows)
+
+            new_categories = []
+            for name in names:
+                if name not in categories:
+                    categories[name] = len(categories)
+                    new_categories.append(name)
+
+            encoded = [(text or '').encode('utf-8') for text in descriptions]
+            f.write(struct.pack('<II', len(rows), len(new_categories)))
+            for name in new_categories:
+                name_bytes = name.encode('utf-8')
+                f.write(struct.pack('<H', len(name_bytes)) + name_bytes)
+            f.write(_column_bytes('q', ids))
+            f.write(_column_bytes('i', days))
+            f.write(_column_bytes('B', [COLUMNAR_TYPES[t] for t in types]))
+            f.write(_column_bytes('I', [categories[name] for name in names]))
+            f.write(_column_bytes('q', cents))
+            f.write(_column_bytes('I', [len(b) for b in encoded]))
+            blob = b''.join(encoded)
+            f.write(struct.pack('<I', len(blob)) + blob)
+
+            written += len(rows)
+            if progress:
+                progress(written)
+        f.write(struct.pack('<II', 0, 0))
+    return written, skipped
+
+
+WRITERS = {
+    'csv': _write_csv,
+    'jsonl': _write_jsonl,
+    'columnar': _write_columnar,
+}
+
+
+def _read_column(f, typecode, count):
+    column = array(typecode)
+    column.frombytes(f.read(column.itemsize * count))
+    if sys.byteorder != 'little':
+        column.byteswap()
+    return column
+
+
+def iter_columnar(path):
+    """
+    Read back a columnar export one block at a time.
+    Yields: lists of (id, date, type, category, amount_cents, description)
+    """
+    type_names = {code: name for name, code in COLUMNAR_TYPES.items()}
+    categories = []
+    with open(path, 'rb') as f:
+        if f.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+            raise ValueError(f"{path} is not a columnar export")
+        while True:
+            count, new_categories = struct.unpack('<II', f.read(8))
+            if count == 0:
+                return
+            for _ in range(new_categories):
+                (length,) = struct.unpack('<H', f.read(2))
+                categories.append(f.read(length).decode('utf-8'))
+            ids = _read_column(f, 'q', count)
+            days = _read_column(f, 'i', count)
+            types = _read_column(f, 'B', count)
+            codes = _read_column(f, 'I', count)
+            cents = _read_column(f, 'q', count)
+            lengths = _read_column(f, 'I', count)
+            (blob_length,) = struct.unpack('<I', f.read(4))
+            blob = f.read(blob_length)
+
+            rows, offset = [], 0
+            for i in range(count):
+                description = blob[offset:offset + lengths[i]].decode('utf-8')
+                offset += lengths[i]
+                rows.append((ids[i], date.fromordinal(days[i] + _EPOCH).isoformat(),
+                             type_names[types[i]], categories[codes[i]], cents[i], description))
+            yield rows
+
+
+# ==================== Export ====================
+
+def detect_export_format(path):
+    """
+    Guess the export format from the file extension.
+    Returns: 'csv', 'jsonl' or 'columnar'
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in FORMAT_EXTENSIONS:
+        raise ValueError(f"Unsupported export file type '{ext}'. Use .csv, .jsonl or .pfcol.")
+    return FORMAT_EXTENSIONS[ext]
+
+
+def export_transactions(path, file_format=None, start=None, end=None,
+                        chunk_size=CHUNK_SIZE, progress=None):
+    """
+    Stream transactions, optionally within an inclusive date range, to a file.
+    The file is replaced only if the whole export succeeds.
+
+    progress: optional callable(rows_written) invoked after each chunk
+    Returns: dict with rows, rows_skipped (rows with a malformed stored date,
+             which the columnar format cannot hold), bytes, seconds,
+             rows_per_sec, mb_per_sec
+    Raises: ValueError for an unknown format or invalid date range
+    """
+    file_format = file_format or detect_export_format(path)
+    if file_format not in WRITERS:
+        raise ValueError(f"Unknown export format '{file_format}'")
+    date_bounds(start, end)  # fail before any file is touched
+
+    start_time = time.perf_counter()
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        rows, skipped = WRITERS[file_format](
+            temp_path, iter_transaction_chunks(start, end, chunk_size), progress)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    seconds = time.perf_counter() - start_time
+    size = os.path.getsize(path)
+
+    return {
+        'rows': rows,
+        'rows_skipped': skipped,
+        'bytes': size,
+        'seconds': seconds,
+        'rows_per_sec': rows / seconds if seconds > 0 else 0.0,
+        'mb_per_sec': size / 1e6 / seconds if seconds > 0 else 0.0
+    }
+
+
+if __name__ == "__main__":
+    # python -m personal_finance_tool.core.exporter OUT [--format F] [--start D] [--end D]
+    import argparse
+    from .database import init_db
+
+    parser = argparse.ArgumentParser(description="Stream transactions to CSV, JSONL or columnar.")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=sorted(WRITERS), help="default: from the file extension")
+    parser.add_argument("--start", help="first date, YYYY-MM-DD")
+    parser.add_argument("--end", help="last date, YYYY-MM-DD")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    init_db()
+    stats = export_transactions(args.path, args.format, args.start, args.end, args.chunk_size)
+    print(f"Exported {stats['rows']} rows ({stats['bytes'] / 1e6:.1f} MB) in {stats['seconds']:.2f}s: "
+          f"{stats['rows_per_sec']:,.0f} rows/sec, {stats['mb_per_sec']:.1f} MB/sec")
+    if stats['rows_skipped']:
+        print(f"Skipped {stats['rows_skipped']} rows with malformed dates")
@@ -0,0 +1,242 @@
+# core/importer.py
+"""
+Bulk transaction import from CSV and OFX/QFX bank statements.
+
+Files are parsed lazily, rows are validated one at a time and inserted
+with executemany in fixed-size chunks inside a single transaction, so an
+import is all-or-nothing and memory stays flat regardless of file size.
+Large imports suspend index and rollup maintenance (see bulk_load()).
+"""
+import csv
+import os
+import re
+import time
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from .database import transaction, bulk_load, get_db_connection, get_pool, to_cents
+
+CHUNK_SIZE = 50000
+MAX_REPORTED_ERRORS = 100
+
+# Rough on-disk size of one statement row, used to estimate import size
+# before reading the file. Imports that would grow the ledger by more than
+# BULK_LOAD_RATIO (and at least BULK_LOAD_MIN_ROWS rows) go through
+# bulk_load(), which rebuilds indexes once instead of row by row.
+ESTIMATED_BYTES_PER_ROW = 48
+BULK_LOAD_MIN_ROWS = 20000
+BULK_LOAD_RATIO = 0.25
+
+CSV_DATE_FORMATS = ('%Y-%m-%d', '%Y/%m/%d', '%m/%d/%Y', '%d.%m.%Y')
+
+# OFX 1.x is SGML (closing tags optional), OFX 2.x is XML; matching
+# "<TAG>value" pairs handles both.
+OFX_TAG = re.compile(r'<(/?)([A-Z0-9.]+)>([^<\r\n]*)')
+OFX_CREDIT_TYPES = {'CREDIT', 'DEP', 'INT', 'DIV', 'DIRECTDEP'}
+
+
+# ==================== Parsing ====================
+
+def iter_csv_rows(path):
+    """
+    Lazily read a CSV file with a header row.
+    Recognised columns (case-insensitive): date, type, category, amount,
+    description. Without a type column, negative amounts are expenses.
+    Yields: (line_number, dict)
+    """
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        header = [name.strip().lower() for name in next(reader, [])]
+        for line_number, values in enumerate(reader, start=2):
+            if values:
+                yield line_number, dict(zip(header, values))
+
+
+def iter_ofx_rows(path):
+    """
+    Lazily read <STMTTRN> records from an OFX/QFX file.
+    Yields: (line_number, dict)
+    """
+    record = None
+    start_line = 0
+    with open(path, encoding='utf-8', errors='replace') as f:
+        for line_number, line in enumerate(f, start=1):
+            for closing, tag, value in OFX_TAG.findall(line):
+                if tag == 'STMTTRN':
+                    if closing and record is not None:
+                        yield start_line, _ofx_record(record)
+                        record = None
+                    elif not closing:
+                        record, start_line = {}, line_number
+                elif record is not None and not closing:
+                    record[tag] = value.strip()
+    if record:
+        yield start_line, _ofx_record(record)
+
+
+def _ofx_record(record):
+    amount = record.get('TRNAMT', '')
+    trans_type = 'income' if record.get('TRNTYPE', '').upper() in OFX_CREDIT_TYPES else None
+    return {
+        'date': record.get('DTPOSTED', '')[:8],
+        'type': trans_type,
+        'amount': amount,
+        'description': record.get('NAME') or record.get('MEMO', ''),
+    }
+
+
+# ==================== Validation ====================
+
+def parse_date(value):
+    """
+    Normalise a date string to YYYY-MM-DD.
+    Returns: str
+    Raises: ValueError
+    """
+    value = value.strip()
+    # Fast path for values that are already ISO dates; fromisoformat also
+    # rejects days the month does not have, such as 2024-02-31
+    if len(value) == 10 and value[4] == '-' and value[7] == '-':
+        try:
+            date.fromisoformat(value)
+        except ValueError:
+            raise ValueError(f"invalid date '{value}'") from None
+        return value
+    if len(value) == 8 and value.isdigit():     # OFX YYYYMMDD
+        return datetime.strptime(value, '%Y%m%d').strftime('%Y-%m-%d')
+    for fmt in CSV_DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).strftime('%Y-%m-%d')
+        except ValueError:
+            continue
+    raise ValueError(f"unrecognised date '{value}'")
+
+
+def validate_row(raw, default_category='Other'):
+    """
+    Turn a parsed record into an insertable row.
+    Returns: (date, type, category, amount_cents, description)
+    Raises: ValueError
+    """
+    amount_str = (raw.get('amount') or '').strip().replace(',', '').replace('$', '')
+    if not amount_str:
+        raise ValueError("missing amount")
+    try:
+        amount = Decimal(amount_str)
+    except InvalidOperation:
+        raise ValueError(f"invalid amount '{amount_str}'") from None
+    if not amount.is_finite():
+        raise ValueError(f"invalid amount '{amount_str}'")
+
+    trans_type = (raw.get('type') or '').strip().lower()
+    if not trans_type:
+        trans_type = 'expense' if amount < 0 else 'income'
+    elif trans_type not in ('income', 'expense'):
+        raise ValueError(f"unknown type '{trans_type}'")
+
+    amount_cents = to_cents(abs(amount))
+    if amount_cents == 0:
+        raise ValueError("amount must be non-zero")
+
+    category = (raw.get('category') or '').strip() or default_category
+    description = (raw.get('description') or '').strip()
+    return parse_date(raw.get('date') or ''), trans_type, category, amount_cents, description
+
+
+# ==================== Import ====================
+
+def detect_format(path):
+    """
+    Guess the file format from its extension.
+    Returns: 'csv' or 'ofx'
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext in ('.ofx', '.qfx'):
+        return 'ofx'
+    if ext in ('.csv', '.txt'):
+        return 'csv'
+    raise ValueError(f"Unsupported import file type '{ext}'. Use CSV, OFX or QFX.")
+
+
+def should_bulk_load(path):
+    """
+    Decide whether an import is large enough, relative to the existing
+    ledger, to be worth suspending index maintenance.
+    Returns: bool
+    """
+    estimated_rows = os.path.getsize(path) / ESTIMATED_BYTES_PER_ROW
+    existing_rows = get_db_connection().execute(
+        "SELECT COALESCE(MAX(id), 0) FROM transactions"
+    ).fetchone()[0]
+    return estimated_rows >= BULK_LOAD_MIN_ROWS and estimated_rows >= existing_rows * BULK_LOAD_RATIO
+
+
+def import_file(path, file_format=None, default_category='Other', chunk_size=CHUNK_SIZE,
+                progress=None, bulk=None):
+    """
+    Import every valid row of a CSV or OFX/QFX file in one transaction.
+    Invalid rows are skipped and reported. Budget alerts and UI refreshes
+    are left to the caller, to run once after the whole batch.
+
+    progress: optional callable(rows_imported) invoked after each chunk
+    bulk: force (True) or skip (False) bulk_load(); None decides by size
+    Returns: dict with rows_read, rows_imported, rows_invalid, errors
+             (first MAX_REPORTED_ERRORS (line, message) pairs), bulk_load,
+             seconds, rows_per_sec
+    """
+    file_format = file_format or detect_format(path)
+    records = iter_ofx_rows(path) if file_format == 'ofx' else iter_csv_rows(path)
+
+    errors = []
+    counts = {'read': 0, 'invalid': 0}
+    categories = set()
+
+    def valid_rows():
+        for line_number, raw in records:
+            counts['read'] += 1
+            try:
+                row = validate_row(raw, default_category)
+            except ValueError as e:
+                counts['invalid'] += 1
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    errors.append((line_number, str(e)))
+                continue
+            categories.add(row[2])
+            yield row
+
+    if bulk is None:
+        bulk = should_bulk_load(path)
+
+    start = time.perf_counter()
+    imported = 0
+    rows = valid_rows()
+    with (bulk_load() if bulk else transaction()) as conn:
+        get_pool().touch('transactions', 'budgets')
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            conn.executemany('''
+                INSERT INTO transactions (date, type, category, amount_cents, description)
+                VALUES (?, ?, ?, ?, ?)
+            ''', chunk)
+            imported += len(chunk)
+            if progress:
+                progress(imported)
+
+        # Make imported categories selectable in the UI
+        conn.executemany(
+            "INSERT OR IGNORE INTO budgets (category, limit_cents) VALUES (?, 0)",
+            [(category,) for category in categories]
+        )
+    seconds = time.perf_counter() - start
+
+    return {
+        'rows_read': counts['read'],
+        'rows_imported': imported,
+        'rows_invalid': counts['invalid'],
+        'errors': errors,
+        'bulk_load': bulk,
+        'seconds': seconds,
+        'rows_per_sec': imported / seconds if seconds > 0 else 0.0
+    }
@@ -0,0 +1,281 @@
+# core/ledger.py
+"""
+Columnar, in-memory copy of the transactions table for multi-year analytics.
+
+The table is loaded once into parallel NumPy arrays (one element per
+transaction) and kept current by appending rows with a higher id:
+
+    ids         int64   transaction id
+    days        int32   date as days since 1970-01-01
+    categories  int32   index into Ledger.category_names
+    types       uint8   TYPE_INCOME or TYPE_EXPENSE bit
+    cents       int64   amount in integer cents
+
+Group-bys, rolling sums and top-N run as vectorized operations over these
+arrays instead of per-row Python tuples. NumPy comes with matplotlib, which
+the reports already need; import this module lazily so the GUI and CLI do
+not pay for it at startup.
+"""
+from datetime import date
+
+import numpy as np
+
+from .database import get_db_connection, from_cents
+
+TYPE_INCOME = 1
+TYPE_EXPENSE = 2
+TYPE_BITS = {'income': TYPE_INCOME, 'expense': TYPE_EXPENSE, None: TYPE_INCOME | TYPE_EXPENSE}
+
+CHUNK_SIZE = 100000
+_EPOCH = date(1970, 1, 1).toordinal()
+
+
+def to_day(value):
+    """
+    Convert a 'YYYY-MM-DD' string or date to a day number.
+    Returns: int
+    """
+    if isinstance(value, str):
+        value = date.fromisoformat(value)
+    return value.toordinal() - _EPOCH
+
+
+def from_day(day):
+    """
+    Convert a day number back to 'YYYY-MM-DD'.
+    Returns: str
+    """
+    return date.fromordinal(int(day) + _EPOCH).isoformat()
+
+
+def _month_label(month_index):
+    year, month = divmod(int(month_index), 12)
+    return f"{1970 + year:04d}-{month + 1:02d}"
+
+
+class Ledger:
+    """
+    Columnar analytics view of the transactions table.
+    Call refresh() to pick up new transactions before querying.
+    """
+
+    def __init__(self, chunk_size=CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self._reset()
+
+    def _reset(self):
+        self.last_id = 0           # highest id read, loaded or skipped
+        self.skipped_ids = []      # rows whose date SQLite cannot parse
+        self._rollup = {}          # monthly_totals as of the last refresh
+        self.category_names = []
+        self._category_codes = {}
+        self.ids = np.empty(0, dtype=np.int64)
+        self.days = np.empty(0, dtype=np.int32)
+        self.categories = np.empty(0, dtype=np.int32)
+        self.types = np.empty(0, dtype=np.uint8)
+        self.cents = np.empty(0, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.ids)
+
+    # ==================== Loading ====================
+
+    def _encode_categories(self, names):
+        """Dictionary-encode a chunk of category names. Returns: int32 array"""
+        unique, inverse = np.unique(np.asarray(names, dtype=object), return_inverse=True)
+        codes = np.empty(len(unique), dtype=np.int32)
+        for i, name in enumerate(unique):
+            code = self._category_codes.get(name)
+            if code is None:
+                code = self._category_codes[name] = len(self.category_names)
+                self.category_names.append(name)
+            codes[i] = code
+        return codes[inverse]
+
+    def refresh(self):
+        """
+        Load transactions added since the last refresh (id > last_id).
+        Rows whose date is not a valid YYYY-MM-DD have no day number; they
+        are left out and their ids listed in skipped_ids.
+
+        Changes to rows already loaded force a full reload. They are found
+        without a table scan: since the last refresh, every (month, type,
+        category) total and count in the monthly_totals rollup must have
+        changed by exactly the new rows' share. A deleted row, or an update to
+        an amount, type, category or month, breaks that. An update that
+        only moves a date within its month leaves the rollup unchanged and
+        is not noticed; use a new Ledger after such edits.
+        Returns: number of rows loaded
+        """
+        conn = get_db_connection()
+        rollup = {
+            (month, trans_type, category): (total, count)
+            for month, trans_type, category, total, count in conn.execute(
+                "SELECT month, type, category, total_cents, count FROM monthly_totals")
+        }
+        if self.last_id:
+            changed = {}
+            for key in rollup.keys() | self._rollup.keys():
+                total, count = rollup.get(key, (0, 0))
+                old_total, old_count = self._rollup.get(key, (0, 0))
+                if (total, count) != (old_total, old_count):
+                    changed[key] = (total - old_total, count - old_count)
+            appended = {
+                (month, trans_type, category): (total, count)
+                for month, trans_type, category, total, count in conn.execute('''
+                    SELECT month, type, category, SUM(amount_cents), COUNT(*)
+                    FROM transactions
+                    WHERE id > ?
+                    GROUP BY month, type, category
+                ''', (self.last_id,))
+            }
+            if changed != appended:
+                self._reset()
+        self._rollup = rollup
+
+        cur = conn.execute('''
+            SELECT id,
+                   CAST(julianday(date) - 2440587.5 AS INTEGER),
+                   CASE type WHEN 'income' THEN ? ELSE ? END,
+                   category,
+                   amount_cents
+            FROM transactions
+            WHERE id > ?
+            ORDER BY id
+        ''', (TYPE_INCOME, TYPE_EXPENSE, self.last_id))
+
+        chunks = []
+        while True:
+            rows = cur.fetchmany(self.chunk_size)
+            if not rows:
+                break
+            self.last_id = rows[-1][0]
+            if any(row[1] is None for row in rows):
+                self.skipped_ids.extend(row[0] for row in rows if row[1] is None)
+                rows = [row for row in rows if row[1] is not None]
+                if not rows:
+                    continue
+            ids, days, types, categories, cents = zip(*rows)
+            chunks.append((
+                np.array(ids, dtype=np.int64),
+                np.array(days, dtype=np.int32),
+                self._encode_categories(categories),
+                np.array(types, dtype=np.uint8),
+                np.array(cents, dtype=np.int64),
+            ))
+        if not chunks:
+            return 0
+
+        ids, days, categories, types, cents = zip(*chunks)
+        self.ids = np.concatenate((self.ids, *ids))
+        self.days = np.concatenate((self.days, *days))
+        self.categories = np.concatenate((self.categories, *categories))
+        self.types = np.concatenate((self.types, *types))
+        self.cents = np.concatenate((self.cents, *cents))
+        return sum(len(chunk) for chunk in ids)
+
+    # ==================== Queries ====================
+
+    def _mask(self, trans_type=None, start=None, end=None):
+        """
+        Select rows by type ('income', 'expense' or None for both) and an
+        inclusive 'YYYY-MM-DD' date range.
+        Returns: bool array
+        """
+        mask = (self.types & TYPE_BITS[trans_type]) != 0
+        if start is not None:
+            mask &= self.days >= to_day(start)
+        if end is not None:
+            mask &= self.days <= to_day(end)
+        return mask
+
+    @staticmethod
+    def _months(days):
+        """Returns: int64 array of months since 1970-01"""
+        return days.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64)
+
+    @staticmethod
+    def _group_sum(keys, cents):
+        """
+        Sum cents per distinct key.
+        Returns: (sorted unique keys, int64 totals)
+        """
+        unique, inverse = np.unique(keys, return_inverse=True)
+        # bincount sums in float64, which is exact for totals below 2**53 cents
+        totals = np.bincount(inverse, weights=cents, minlength=len(unique))
+        return unique, totals.astype(np.int64)
+
+    def totals_by_month(self, trans_type='expense', start=None, end=None):
+        """
+        Returns: list of ('YYYY-MM', total), oldest first
+        """
+        mask = self._mask(trans_type, start, end)
+        months, totals = self._group_sum(self._months(self.days[mask]), self.cents[mask])
+        return [(_month_label(m), from_cents(int(t))) for m, t in zip(months, totals)]
+
+    def totals_by_category(self, trans_type='expense', start=None, end=None):
+        """
+        Returns: list of (category, total), largest first
+        """
+        mask = self._mask(trans_type, start, end)
+        codes, totals = self._group_sum(self.categories[mask], self.cents[mask])
+        order = np.argsort(-totals, kind='stable')
+        return [(self.category_names[codes[i]], from_cents(int(totals[i]))) for i in order]
+
+    def totals_by_month_category(self, trans_type='expense', start=None, end=None):
+        """
+        Returns: list of ('YYYY-MM', category, total), by month then category
+        """
+        mask = self._mask(trans_type, start, end)
+        months = self._months(self.days[mask])
+        # Pack (month, category) into one key so a single group-by handles both
+        keys = months * len(self.category_names) + self.categories[mask]
+        unique, totals = self._group_sum(keys, self.cents[mask])
+        month_keys, codes = np.divmod(unique, max(len(self.category_names), 1))
+        rows = [(_month_label(m), self.category_names[c], from_cents(int(t)))
+                for m, c, t in zip(month_keys, codes, totals)]
+        return sorted(rows, key=lambda row: (row[0], row[1]))
+
+    def rolling_sum(self, window_days=30, trans_type='expense', start=None, end=None):
+        """
+        Trailing window_days total for every day in the range (default: the
+        span of the data).
+        Returns: list of ('YYYY-MM-DD', total)
+        """
+        mask = self._mask(trans_type, start, end)
+        days = self.days[mask]
+        if not len(days) and (start is None or end is None):
+            return []
+        first = to_day(start) if start is not None else int(days.min())
+        last = to_day(end) if end is not None else int(days.max())
+        if last < first:
+            return []
+
+        daily = np.bincount(days - first, weights=self.cents[mask], minlength=last - first + 1)
+        cumulative = np.concatenate(([0], np.cumsum(daily.astype(np.int64))))
+        offsets = np.arange(1, len(cumulative))
+        window = cumulative[offsets] - cumulative[np.maximum(offsets - window_days, 0)]
+        return [(from_day(first + i), from_cents(int(total))) for i, total in enumerate(window)]
+
+    def top_transactions(self, n=10, trans_type='expense', start=None, end=None):
+        """
+        The n largest transactions in the range.
+        Returns: list of (id, 'YYYY-MM-DD', category, amount), largest first
+        """
+        if n <= 0:
+            return []
+        rows = np.flatnonzero(self._mask(trans_type, start, end))
+        if len(rows) > n:
+            rows = rows[np.argpartition(-self.cents[rows], n - 1)[:n]]
+        rows = rows[np.argsort(-self.cents[rows], kind='stable')]
+        return [
+            (int(self.ids[i]), from_day(self.days[i]),
+             self.category_names[self.categories[i]], from_cents(int(self.cents[i])))
+            for i in rows
+        ]
+
+    def top_categories(self, n=5, trans_type='expense', start=None, end=None):
+        """
+        Returns: list of (category, total) for the n largest categories
+        """
+        return self.totals_by_category(trans_type, start, end)[:n]
@@ -0,0 +1,265 @@
+# core/ledgers.py
+"""
+Many ledgers (one database file each) served by one process.
+
+LedgerRegistry maps ledger IDs to database files and keeps one
+ConnectionPool, with its own query cache, per ledger. Inside
+`with registry.use(ledger_id):` every core function reads and writes that
+ledger: get_pool() returns the pool selected by a context variable, so
+nothing else needs a ledger argument. The selection is per thread and
+carries over to QueryExecutor tasks submitted from inside the block.
+
+Reports across ledgers (get_aggregate_report, or map_ledgers for any
+module-level function) fan out over a process pool shared by all calls,
+one task per ledger, so large portfolios use every core instead of one
+thread holding the GIL. Worker processes keep their connections and
+query caches between tasks. Like the pools in this process, each cache is
+cleared whenever a connection outside its pool commits (see
+ConnectionPool.check_external_writes), so both paths serve the same,
+current results. Workers are spawned, so scripts that run cross-ledger
+reports need the usual `if __name__ == "__main__":` guard.
+
+Opening a ledger whose database file does not exist raises
+FileNotFoundError, so a mistyped path is not silently created and counted
+as an empty ledger; pass create=True to start a new one.
+
+A registry can be saved to and loaded from a JSON file:
+    {"ledgers": {"smith": "households/smith.db", "jones": "/data/jones.db"}}
+Relative paths are resolved against the file's directory.
+"""
+import json
+import os
+import re
+import threading
+from contextlib import contextmanager
+
+from .database import ConnectionPool, use_pool, init_db
+from .periods import as_period, get_period_totals
+
+LEDGER_ID = re.compile(r'^[A-Za-z0-9][A-Za-z0-9_.-]*$')
+
+
+def require_database(path):
+    """
+    Check that a ledger database file exists.
+    Raises: FileNotFoundError
+    """
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"Ledger database {path} does not exist.")
+
+
+class LedgerRegistry:
+    """Ledger IDs -> database files, with a connection pool per open ledger."""
+
+    def __init__(self, ledgers=None, base_dir=None, workers=None):
+        """
+        ledgers: dict of ledger ID -> database path
+        base_dir: directory relative paths are resolved against (default cwd)
+        workers: processes for cross-ledger reports (default: CPU count)
+        """
+        self.base_dir = base_dir or os.getcwd()
+        self.workers = workers
+        self.paths = {}
+        self.pools = {}
+        self._processes = None
+        self._lock = threading.Lock()
+        for ledger_id, path in (ledgers or {}).items():
+            self.register(ledger_id, path)
+
+    # ==================== Registry File ====================
+
+    @classmethod
+    def load(cls, path, workers=None):
+        """
+        Read a registry file.
+        Returns: LedgerRegistry
+        Raises: OSError, ValueError for malformed files
+        """
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        ledgers = data.get('ledgers') if isinstance(data, dict) else None
+        if not isinstance(ledgers, dict):
+            raise ValueError(f"{path}: expected {{\"ledgers\": {{id: path, ...}}}}")
+        return cls(ledgers, base_dir=os.path.dirname(os.path.abspath(path)), workers=workers)
+
+    def save(self, path):
+        """Write the registry file, with paths relative to its directory where possible."""
+        base_dir = os.path.dirname(os.path.abspath(path))
+        ledgers = {}
+        for ledger_id, db_path in sorted(self.paths.items()):
+            relative = os.path.relpath(db_path, base_dir)
+            ledgers[ledger_id] = db_path if relative.startswith('..') else relative
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'ledgers': ledgers}, f, indent=2)
+
+    # ==================== Ledgers ====================
+
+    def register(self, ledger_id, path):
+        """
+        Add a ledger. Re-registering an ID with the same file is a no-op.
+        Returns: absolute database path
+        Raises: ValueError for invalid IDs or an ID already used for another file
+        """
+        if not LEDGER_ID.match(ledger_id):
+            raise ValueError(f"Invalid ledger ID '{ledger_id}'. Use letters, digits, '.', '_' or '-'.")
+        path = os.path.abspath(os.path.join(self.base_dir, path))
+        with self._lock:
+            if self.paths.get(ledger_id, path) != path:
+                raise ValueError(f"Ledger '{ledger_id}' is already registered for {self.paths[ledger_id]}.")
+            self.paths[ledger_id] = path
+        return path
+
+    def unregister(self, ledger_id):
+        """Remove a ledger and close its connections. The file is left alone."""
+        with self._lock:
+            self.path(ledger_id)
+            del self.paths[ledger_id]
+            pool = self.pools.pop(ledger_id, None)
+        if pool is not None:
+            pool.close_all()
+
+    def ids(self):
+        """Returns: sorted list of ledger IDs"""
+        return sorted(self.paths)
+
+    def path(self, ledger_id):
+        """
+        Returns: absolute database path of a ledger
+        Raises: ValueError for unknown IDs
+        """
+        try:
+            return self.paths[ledger_id]
+        except KeyError:
+            raise ValueError(f"Unknown ledger '{ledger_id}'.") from None
+
+    def pool(self, ledger_id, create=False):
+        """
+        Get a ledger's connection pool, opening and migrating the database
+        on first use.
+        create: create the database file if it does not exist yet
+        Returns: ConnectionPool
+        Raises: ValueError for unknown IDs, FileNotFoundError for a missing
+                database file unless create is set
+        """
+        with self._lock:
+            pool = self.pools.get(ledger_id)
+            if pool is None:
+                path = self.path(ledger_id)
+                if not create:
+                    require_database(path)
+                pool = self.pools[ledger_id] = ConnectionPool(path)
+        with use_pool(pool):
+            init_db()
+        return pool
+
+    @contextmanager
+    def use(self, ledger_id, create=False):
+        """Context manager selecting a ledger for every database function (create: as pool())."""
+        with use_pool(self.pool(ledger_id, create)) as pool:
+            yield pool
+
+    # ==================== Cross-Ledger Work ====================
+
+    def _executor(self):
+        # Spawned, not forked: a forked child would inherit open SQLite
+        # connections (and in the GUI, Tk state) from this process.
+        with self._lock:
+            if self._processes is None:
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+                self._processes = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'))
+            return self._processes
+
+    def map_ledgers(self, func, *args, ledger_ids=None, parallel=None):
+        """
+        Call func(*args) once in each ledger. func and args must be
+        picklable (a module-level function and plain data).
+        parallel: run in the process pool; by default only for two or more
+                  ledgers when more than one worker is allowed
+        Returns: dict of ledger ID -> result, in ledger_ids order
+        Raises: RuntimeError naming the ledger whose call failed (including
+                a missing database file)
+        """
+        ledger_ids = list(ledger_ids) if ledger_ids is not None else self.ids()
+        paths = [self.path(ledger_id) for ledger_id in ledger_ids]
+        if parallel is None:
+            parallel = len(ledger_ids) > 1 and (self.workers or os.cpu_count() or 1) > 1
+
+        results = {}
+        if parallel:
+            executor = self._executor()
+            futures = [executor.submit(_run_in_ledger, path, func, args) for path in paths]
+            for ledger_id, future in zip(ledger_ids, futures):
+                try:
+                    results[ledger_id] = future.result()
+                except Exception as e:
+                    raise RuntimeError(f"Ledger '{ledger_id}': {e}") from e
+        else:
+            for ledger_id in ledger_ids:
+                try:
+                    with self.use(ledger_id):
+                        results[ledger_id] = func(*args)
+                except Exception as e:
+                    raise RuntimeError(f"Ledger '{ledger_id}': {e}") from e
+        return results
+
+    def get_aggregate_report(self, periods=None, ledger_ids=None, parallel=None):
+        """
+        Income and expense reports for each ledger and for all of them
+        combined, for one or more periods (default: the current month).
+        Each ledger answers every period with one get_period_totals() call.
+        Returns: dict with
+            periods  - list of period labels
+            ledgers  - dict of ledger ID -> list of reports (one per period)
+            combined - list of reports over all the ledgers
+        Reports are dicts as get_month_report().
+        """
+        from .report_data import report_from_totals
+
+        periods = tuple(as_period(period) for period in (periods or [None]))
+        totals = self.map_ledgers(get_period_totals, periods, ledger_ids=ledger_ids, parallel=parallel)
+
+        combined = [{} for _ in periods]
+        for ledger_totals in totals.values():
+            for merged, period_totals in zip(combined, ledger_totals):
+                for key, (cents, count) in period_totals.items():
+                    previous_cents, previous_count = merged.get(key, (0, 0))
+                    merged[key] = (previous_cents + cents, previous_count + count)
+
+        return {
+            'periods': [period.label for period in periods],
+            'ledgers': {
+                ledger_id: [report_from_totals(period.label, period_totals)
+                            for period, period_totals in zip(periods, ledger_totals)]
+                for ledger_id, ledger_totals in totals.items()
+            },
+            'combined': [report_from_totals(period.label, merged)
+                         for period, merged in zip(periods, combined)]
+        }
+
+    def close_all(self):
+        """Shut down the worker processes and close every ledger's connections."""
+        with self._lock:
+            processes, self._processes = self._processes, None
+            pools, self.pools = list(self.pools.values()), {}
+        if processes is not None:
+            processes.shutdown(wait=True, cancel_futures=True)
+        for pool in pools:
+            pool.close_all()
+
+
+# ==================== Worker Processes ====================
+
+_worker_pools = {}     # database path -> ConnectionPool, per worker process
+
+
+def _run_in_ledger(path, func, args):
+    """Process pool task: func(*args) against the database at path."""
+    pool = _worker_pools.get(path)
+    if pool is None:
+        require_database(path)
+        pool = _worker_pools[path] = ConnectionPool(path)
+    with use_pool(pool):
+        init_db()
+        return func(*args)
@@ -0,0 +1,294 @@
+# core/periods.py
+"""
+Reporting periods beyond "the current month".
+
+A Period is a half-open date range [start, end) with a label: a calendar
+month, quarter or year, a custom range, or the rolling last N days.
+get_period_totals() answers any number of periods with at most two grouped
+queries, however many periods or months they span: whole months are read
+from the monthly_totals rollup and only the partial months at the edges of
+custom and rolling ranges from the transactions table.
+
+Specs accepted by parse_period():
+    2024-06                     month
+    2024-Q2                     quarter
+    2024                        year
+    2024-01-15..2024-03-10      custom range, both ends inclusive
+    30d                         rolling: the last 30 days, today included
+"""
+import re
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+
+from .database import get_db_connection, cached, from_cents
+
+AVERAGE_MONTH_DAYS = 365.25 / 12
+
+
+def _month_start(day):
+    return day.replace(day=1)
+
+
+def _next_month(day):
+    """Returns: first day of the month after day's month"""
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+class Period(namedtuple('Period', 'kind label start end')):
+    """
+    kind: 'month', 'quarter', 'year', 'range' or 'rolling'
+    start/end: ISO dates, start inclusive, end exclusive
+    """
+    __slots__ = ()
+
+    @property
+    def start_date(self):
+        return date.fromisoformat(self.start)
+
+    @property
+    def end_date(self):
+        return date.fromisoformat(self.end)
+
+    @property
+    def days(self):
+        return (self.end_date - self.start_date).days
+
+    @property
+    def phrase(self):
+        """How report text refers to the period, e.g. 'this month', 'in 2024-Q2'."""
+        if self.kind == 'month' and self.label == datetime.now().strftime("%Y-%m"):
+            return "this month"
+        if self.kind == 'range':
+            return f"from {self.start} to {(self.end_date - timedelta(days=1)).isoformat()}"
+        if self.kind == 'rolling':
+            return f"in the {self.label}"
+        return f"in {self.label}"
+
+    @property
+    def months(self):
+        """Returns: list of 'YYYY-MM' months the period touches"""
+        months, day = [], _month_start(self.start_date)
+        while day < self.end_date:
+            months.append(day.strftime("%Y-%m"))
+            day = _next_month(day)
+        return months
+
+    @property
+    def budget_months(self):
+        """How many monthly budgets the period is worth. Returns: float"""
+        start, end = self.start_date, self.end_date
+        if start.day == 1 and end.day == 1:
+            return float(len(self.months))
+        return self.days / AVERAGE_MONTH_DAYS
+
+    def pieces(self):
+        """
+        Split into whole months and partial-month date ranges.
+        Returns: (list of 'YYYY-MM', list of (start, end) ISO date pairs)
+        """
+        start, end = self.start_date, self.end_date
+        whole, partial = [], []
+        day = start
+        while day < end:
+            next_month = _next_month(day)
+            if day.day == 1 and next_month <= end:
+                whole.append(day.strftime("%Y-%m"))
+            else:
+                partial.append((day.isoformat(), min(next_month, end).isoformat()))
+            day = next_month
+        return whole, partial
+
+
+# ==================== Constructors ====================
+
+def month(value=None):
+    """Calendar month from 'YYYY-MM', a date, or None for the current month."""
+    if value is None:
+        value = datetime.now()
+    if isinstance(value, str):
+        value = datetime.strptime(value, "%Y-%m")
+    start = date(value.year, value.month, 1)
+    return Period('month', start.strftime("%Y-%m"), start.isoformat(), _next_month(start).isoformat())
+
+
+def quarter(year, number):
+    """Calendar quarter (number 1-4) of year."""
+    if not 1 <= number <= 4:
+        raise ValueError(f"Quarter must be 1-4, got {number}.")
+    start = date(year, 3 * number - 2, 1)
+    end = date(year + 1, 1, 1) if number == 4 else date(year, 3 * number + 1, 1)
+    return Period('quarter', f"{year}-Q{number}", start.isoformat(), end.isoformat())
+
+
+def year(value):
+    """Calendar year."""
+    value = int(value)
+    return Period('year', str(value), date(value, 1, 1).isoformat(), date(value + 1, 1, 1).isoformat())
+
+
+def date_range(first, last, label=None):
+    """Custom range from first to last ('YYYY-MM-DD'), both inclusive."""
+    first, last = date.fromisoformat(str(first)), date.fromisoformat(str(last))
+    if last < first:
+        raise ValueError(f"Range ends ({last}) before it starts ({first}).")
+    return Period('range', label or f"{first}..{last}",
+                  first.isoformat(), (last + timedelta(days=1)).isoformat())
+
+
+def rolling(days, end=None):
+    """The last `days` days up to and including end (default today)."""
+    if days < 1:
+        raise ValueError(f"A rolling period needs at least one day, got {days}.")
+    last = date.fromisoformat(str(end)) if end else date.today()
+    start = last - timedelta(days=days - 1)
+    return Period('rolling', f"last {days} days", start.isoformat(), (last + timedelta(days=1)).isoformat())
+
+
+def months_back(count, end=None):
+    """
+    The `count` calendar months ending with end's month (default current).
+    Returns: list of Period, oldest first
+    """
+    current = month(end).start_date
+    periods = []
+    for _ in range(count):
+        periods.append(month(current))
+        current = _month_start(current - timedelta(days=1))
+    return periods[::-1]
+
+
+_PATTERNS = [
+    (re.compile(r'^(\d{4})-(\d{2})$'), lambda m: month(m.group(0))),
+    (re.compile(r'^(\d{4})-?Q([1-4])$', re.I), lambda m: quarter(int(m.group(1)), int(m.group(2)))),
+    (re.compile(r'^(\d{4})$'), lambda m: year(m.group(1))),
+    (re.compile(r'^(\d{4}-\d{2}-\d{2})\.\.(\d{4}-\d{2}-\d{2})$'), lambda m: date_range(m.group(1), m.group(2))),
+    (re.compile(r'^(\d+)d$', re.I), lambda m: rolling(int(m.group(1)))),
+]
+
+
+def parse_period(spec):
+    """
+    Parse a period spec (see the module docstring).
+    Returns: Period
+    Raises: ValueError for unrecognised specs
+    """
+    spec = spec.strip()
+    for pattern, build in _PATTERNS:
+        match = pattern.match(spec)
+        if match:
+            return build(match)
+    raise ValueError(f"Unrecognised period '{spec}'. Use YYYY-MM, YYYY-Qn, YYYY, "
+                     "YYYY-MM-DD..YYYY-MM-DD or Nd.")
+
+
+def as_period(value=None):
+    """
+    Normalise None (current month), a spec string or a Period.
+    Returns: Period
+    """
+    if value is None:
+        return month()
+    if isinstance(value, Period):
+        return value
+    return parse_period(value)
+
+
+# ==================== Grouped Queries ====================
+
+def get_period_totals(periods):
+    """
+    Income and expense totals per category for many periods at once.
+    Periods may overlap. Costs at most two grouped queries and is cached
+    until a write touches one of the months involved.
+    Returns: list (one per period, same order) of dicts
+             (type, category) -> (total_cents, count)
+    """
+    periods = tuple(as_period(period) for period in periods)
+    tags = {'transactions'}
+    for period in periods:
+        tags.update(f'transactions:{m}' for m in period.months)
+    return cached('period_totals', periods, tuple(sorted(tags)), lambda: _load_period_totals(periods))
+
+
+def _load_period_totals(periods):
+    whole, partial = [], []
+    for index, period in enumerate(periods):
+        months, ranges = period.pieces()
+        # Consecutive whole months become one BETWEEN range
+        for m in months:
+            if whole and whole[-1][0] == index and _follows(whole[-1][2], m):
+                whole[-1][2] = m
+            else:
+                whole.append([index, m, m])
+        partial += [(index, start, end, start[:7]) for start, end in ranges]
+
+    totals = [{} for _ in periods]
+    conn = get_db_connection()
+    if whole:
+        rows = conn.execute(f'''
+            WITH periods(idx, first_month, last_month) AS (VALUES {_placeholders(len(whole), 3)})
+            SELECT p.idx, m.type, m.category, SUM(m.total_cents), SUM(m.count)
+            FROM periods p
+            JOIN monthly_totals m ON m.month BETWEEN p.first_month AND p.last_month
+            GROUP BY p.idx, m.type, m.category
+        ''', [value for piece in whole for value in piece])
+        _accumulate(totals, rows)
+    if partial:
+        rows = conn.execute(f'''
+            WITH periods(idx, start, end, month) AS (VALUES {_placeholders(len(partial), 4)})
+            SELECT p.idx, t.type, t.category, SUM(t.amount_cents), COUNT(*)
+            FROM periods p
+            JOIN transactions t ON t.month = p.month AND t.date >= p.start AND t.date < p.end
+            GROUP BY p.idx, t.type, t.category
+        ''', [value for piece in partial for value in piece])
+        _accumulate(totals, rows)
+    return totals
+
+
+def _follows(previous, current):
+    return _next_month(date.fromisoformat(previous + '-01')).strftime("%Y-%m") == current
+
+
+def _placeholders(rows, columns):
+    row = '(' + ', '.join('?' * columns) + ')'
+    return ', '.join([row] * rows)
+
+
+def _accumulate(totals, rows):
+    for index, trans_type, category, cents, count in rows:
+        key = (trans_type, category)
+        previous_cents, previous_count = totals[index].get(key, (0, 0))
+        totals[index][key] = (previous_cents + cents, previous_count + count)
+
+
+def get_budget_snapshots(periods):
+    """
+    Budget and spending per category for many periods at once. Monthly
+    limits are scaled by each period's length (see Period.budget_months).
+    Returns: list (one per period) of lists of dicts with category, budget,
+             spent, remaining, percentage (as get_budget_snapshot)
+    """
+    periods = [as_period(period) for period in periods]
+    totals = get_period_totals(periods)
+
+    def query():
+        conn = get_db_connection()
+        return conn.execute("SELECT category, limit_cents FROM budgets ORDER BY category").fetchall()
+
+    limits = cached('budget_limits_cents', (), ('budgets',), query)
+    snapshots = []
+    for period, period_totals in zip(periods, totals):
+        factor = period.budget_months
+        snapshot = []
+        for category, limit in limits:
+            budget = round(limit * factor)
+            spent = period_totals.get(('expense', category), (0, 0))[0]
+            snapshot.append({
+                'category': category,
+                'budget': from_cents(budget),
+                'spent': from_cents(spent),
+                'remaining': from_cents(budget - spent),
+                'percentage': (spent * 100 / budget) if budget > 0 else 0
+            })
+        snapshots.append(snapshot)
+    return snapshots
@@ -0,0 +1,271 @@
+# core/profiler.py
+"""
+Opt-in query profiler.
+
+When enabled, every statement run on a pooled connection (see
+PooledConnection in database.py) is recorded with its SQL, the shape of its
+parameters (never the values), rows returned, wall time including fetches,
+the thread, and the UI action that caused it. Actions are named with the
+action() context manager or the @profiled_action decorator, and follow work
+submitted to the QueryExecutor onto its worker threads. Actions nest: a
+query is attributed to the outermost one (the user's action, such as
+FinanceApp.refresh_all) and also records the full action path.
+
+Enable with PFT_PROFILE=1 or from the Performance dialog. Statements slower
+than slow_query_ms (PFT_SLOW_QUERY_MS, default 50) are printed as they
+happen. dump_trace() writes the records as Chrome trace JSON, viewable in
+chrome://tracing or Perfetto.
+"""
+import functools
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+
+MAX_RECORDS = 10000
+
+
+def param_shape(params):
+    """
+    Describe parameters without their values, e.g. 'tuple[5]'.
+    Returns: str
+    """
+    if params is None:
+        return '-'
+    if isinstance(params, (tuple, list, dict)):
+        return f"{type(params).__name__}[{len(params)}]"
+    return type(params).__name__
+
+
+class QueryProfiler:
+    """Collects query and action records; cheap no-op while disabled."""
+
+    def __init__(self, enabled=False, slow_query_ms=50.0, max_records=MAX_RECORDS):
+        self.enabled = enabled
+        self.slow_query_ms = slow_query_ms
+        self.records = deque(maxlen=max_records)
+        self.spans = deque(maxlen=max_records)
+        self._local = threading.local()
+        self._origin = time.perf_counter()
+
+    # ==================== Actions ====================
+
+    def current_actions(self):
+        """
+        Returns: tuple of the action names open on this thread, outermost first
+        """
+        return tuple(getattr(self._local, 'actions', ()))
+
+    def action(self, name):
+        """Context manager attributing the queries run inside it to name."""
+        return _ActionScope(self, self.current_actions() + (name,))
+
+    def resume(self, actions):
+        """
+        Context manager re-opening actions captured with current_actions()
+        on another thread, e.g. a worker running a submitted query.
+        """
+        return _ActionScope(self, tuple(actions))
+
+    # ==================== Recording ====================
+
+    def start_query(self, sql, params):
+        """
+        Open a record for a statement about to run.
+        Returns: dict (updated in place as rows are fetched)
+        """
+        actions = self.current_actions()
+        record = {
+            'sql': ' '.join(sql.split()),
+            'params': params,
+            'rows': 0,
+            'ms': 0.0,
+            'action': actions[0] if actions else None,
+            'path': ' > '.join(actions),
+            'thread': threading.current_thread().name,
+            'tid': threading.get_ident(),
+            'start': time.perf_counter() - self._origin,
+            'slow': False,
+        }
+        self.records.append(record)
+        return record
+
+    def add_time(self, record, seconds, rows=0):
+        """Add execution or fetch time (and rows) to a record."""
+        record['ms'] += seconds * 1000
+        record['rows'] += rows
+        if not record['slow'] and record['ms'] >= self.slow_query_ms:
+            record['slow'] = True
+            print(f"🐢 Slow query ({record['ms']:.1f} ms, action {record['action'] or '-'}): "
+                  f"{record['sql'][:200]}")
+
+    def clear(self):
+        self.records.clear()
+        self.spans.clear()
+
+    # ==================== Reporting ====================
+
+    def summary(self, key='sql'):
+        """
+        Aggregate records by 'sql' or 'action'.
+        Returns: list of dicts with key, calls, total_ms, mean_ms, max_ms,
+                 rows, slow; slowest total first
+        """
+        groups = {}
+        for record in list(self.records):
+            name = record[key] or '-'
+            group = groups.setdefault(name, {key: name, 'calls': 0, 'total_ms': 0.0,
+                                             'max_ms': 0.0, 'rows': 0, 'slow': 0})
+            group['calls'] += 1
+            group['total_ms'] += record['ms']
+            group['max_ms'] = max(group['max_ms'], record['ms'])
+            group['rows'] += record['rows']
+            group['slow'] += record['slow']
+        for group in groups.values():
+            group['mean_ms'] = group['total_ms'] / group['calls']
+        return sorted(groups.values(), key=lambda group: -group['total_ms'])
+
+    def dump_trace(self, path):
+        """
+        Write actions and queries as a Chrome trace (JSON object format).
+        Returns: number of events written
+        """
+        spans, records = list(self.spans), list(self.records)
+        threads = {item['tid']: item['thread'] for item in spans + records}
+        events = [
+            {'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': tid, 'args': {'name': name}}
+            for tid, name in threads.items()
+        ]
+        events += [
+            {'name': span['action'], 'cat': 'action', 'ph': 'X', 'pid': 1, 'tid': span['tid'],
+             'ts': span['start'] * 1e6, 'dur': span['ms'] * 1000}
+            for span in spans
+        ]
+        events += [
+            {'name': record['sql'][:80], 'cat': 'query', 'ph': 'X', 'pid': 1, 'tid': record['tid'],
+             'ts': record['start'] * 1e6, 'dur': record['ms'] * 1000,
+             'args': {'sql': record['sql'], 'params': record['params'], 'rows': record['rows'],
+                      'action': record['path']}}
+            for record in records
+        ]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+        return len(events)
+
+
+class _ActionScope:
+    """Replaces the thread's action stack for the duration of a block."""
+
+    def __init__(self, profiler, actions):
+        self.profiler = profiler
+        self.actions = actions
+
+    def __enter__(self):
+        local = self.profiler._local
+        self.previous = getattr(local, 'actions', ())
+        local.actions = self.actions
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        profiler = self.profiler
+        profiler._local.actions = self.previous
+        if profiler.enabled and self.actions:
+            profiler.spans.append({
+                'action': self.actions[-1],
+                'thread': threading.current_thread().name,
+                'tid': threading.get_ident(),
+                'start': self.start - profiler._origin,
+                'ms': (time.perf_counter() - self.start) * 1000,
+            })
+        return False
+
+
+class ProfiledCursor(sqlite3.Cursor):
+    """Cursor that reports each statement and its fetches to the profiler."""
+
+    _record = None
+
+    def _run(self, method, sql, params, shape):
+        self._record = profiler.start_query(sql, shape)
+        start = time.perf_counter()
+        try:
+            return method(sql, params)
+        finally:
+            profiler.add_time(self._record, time.perf_counter() - start)
+
+    def execute(self, sql, parameters=()):
+        return self._run(super().execute, sql, parameters, param_shape(parameters))
+
+    def executemany(self, sql, seq_of_parameters):
+        if not isinstance(seq_of_parameters, (list, tuple)):
+            seq_of_parameters = list(seq_of_parameters)
+        first = param_shape(seq_of_parameters[0]) if seq_of_parameters else '-'
+        shape = f"{len(seq_of_parameters)} x {first}"
+        return self._run(super().executemany, sql, seq_of_parameters, shape)
+
+    def _fetched(self, start, rows):
+        if self._record is not None:
+            profiler.add_time(self._record, time.perf_counter() - start, rows)
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(start, row is not None)
+        return row
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._fetched(start, len(rows))
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(start, len(rows))
+        return rows
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._fetched(start, 0)
+            raise
+        self._fetched(start, 1)
+        return row
+
+
+def _env_float(name, default):
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+profiler = QueryProfiler(
+    enabled=os.environ.get('PFT_PROFILE', '') not in ('', '0'),
+    slow_query_ms=_env_float('PFT_SLOW_QUERY_MS', 50.0),
+)
+
+
+def get_profiler():
+    """
+    Get the process-wide profiler.
+    Returns: QueryProfiler
+    """
+    return profiler
+
+
+def profiled_action(func):
+    """Decorator naming the queries a method runs after it, e.g. 'FinanceApp.refresh_all'."""
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with profiler.action(name):
+            return func(*args, **kwargs)
+    return wrapper
@@ -1,54 +1,37 @@
 # core/report.py
+import base64
+import re
 import tkinter as tk
 from tkinter import messagebox
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import sqlite3
-from datetime import datetime
-from .database import get_db_connection, get_transactions_for_month, get_all_transactions
-
-def show_spending_pie_chart():
+from .charts import get_chart_cache
+from .report_data import (
+    get_month_report,
+    get_monthly_summary_stats,
+    get_monthly_trend,
+    get_balance_trend,
+    format_text_report
+)
+from .periods import as_period
+
+
+def _show_chart(title, png, geometry, minsize):
     """
-    Show a pie chart of current month's spending by category.
+    Show a rendered chart (PNG bytes from core.charts) in a new window.
+    The window owns the only reference to its image, which is deleted
+    from Tk when the window closes.
     """
-    conn = get_db_connection()
-    c = conn.cursor()
-    
-    current_month = datetime.now().strftime("%Y-%m")
-    
-    c.execute('''
-        SELECT category, SUM(amount) 
-        FROM transactions 
-        WHERE type = 'expense' 
-        AND strftime('%Y-%m', date) = ? 
-        GROUP BY category
-        ORDER BY SUM(amount) DESC
-    ''', (current_month,))
-    
-    data = c.fetchall()
-    conn.close()
-
-    if not data:
-        messagebox.showinfo("No Data", "No expenses recorded this month.")
-        return
-
-    categories, amounts = zip(*data)
-
-    # Create pie chart
-    fig, ax = plt.subplots(figsize=(8, 6))
-    ax.pie(amounts, labels=categories, autopct='%1.1f%%', startangle=90)
-    ax.axis('equal')
-    plt.title(f"Monthly Spending by Category ({current_month})", fontsize=14, pad=20)
-
-    # Display in Tkinter window
     top = tk.Toplevel()
-    top.title("📊 Spending Report")
-    top.geometry("800x600")
-    top.minsize(600, 500)
+    top.title(title)
+    top.geometry(geometry)
+    top.minsize(*minsize)
+
+    image = tk.PhotoImage(master=top, data=base64.b64encode(png))
+    tk.Label(top, image=image).pack(fill="both", expand=True, padx=10, pady=10)
 
-    canvas = FigureCanvasTkAgg(fig, master=top)
-    canvas.draw()
-    canvas.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=10)
+    def release(event):
+        if event.widget is top:
+            image.tk.call("image", "delete", image.name)
+    top.bind("<Destroy>", release)
 
     # Close button
     close_btn = tk.Button(top, text="Close", command=top.destroy, bg="#f44336", fg="white")
@@ -56,335 +39,228 @@ def show_spending_pie_chart():
 
     top.transient()
     top.grab_set()
+    return top
 
 
-def show_income_vs_expense_chart():
+def _run_report(executor, title, load, render):
     """
-    Show a bar chart comparing income vs expenses for current month.
+    Run a report's query and draw it.
+    Without an executor both steps run inline. With one (see
+    core.executor.QueryExecutor) the query runs on a worker thread while a
+    small loading window is shown, and render() runs back on the Tk thread.
     """
-    conn = get_db_connection()
-    c = conn.cursor()
-    
-    current_month = datetime.now().strftime("%Y-%m")
-    
-    # Get total income
-    c.execute('''
-        SELECT COALESCE(SUM(amount), 0) 
-        FROM transactions 
-        WHERE type = 'income' 
-        AND strftime('%Y-%m', date) = ?
-    ''', (current_month,))
-    income = c.fetchone()[0]
-    
-    # Get total expenses
-    c.execute('''
-        SELECT COALESCE(SUM(amount), 0) 
-        FROM transactions 
-        WHERE type = 'expense' 
-        AND strftime('%Y-%m', date) = ?
-    ''', (current_month,))
-    expenses = c.fetchone()[0]
-    
-    conn.close()
-
-    if income == 0 and expenses == 0:
-        messagebox.showinfo("No Data", "No transactions recorded this month.")
+    if executor is None:
+        render(load())
         return
 
-    # Create bar chart
-    fig, ax = plt.subplots(figsize=(8, 6))
-    categories = ['Income', 'Expenses']
-    amounts = [income, expenses]
-    colors = ['#4CAF50', '#f44336']
-    
-    bars = ax.bar(categories, amounts, color=colors)
-    ax.set_ylabel('Amount ($)')
-    ax.set_title(f"Income vs Expenses ({current_month})", fontsize=14, pad=20)
-    
-    # Add value labels on bars
-    for bar, amount in zip(bars, amounts):
-        ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 5,
-                f'${amount:.2f}', ha='center', va='bottom')
+    loading = tk.Toplevel()
+    loading.title(title)
+    tk.Label(loading, text=f"⏳ Loading {title}…", font=("Helvetica", 11), padx=30, pady=20).pack()
 
-    # Display in Tkinter window
-    top = tk.Toplevel()
-    top.title("💰 Income vs Expenses Report")
-    top.geometry("800x600")
-    top.minsize(600, 500)
+    def on_done(result):
+        loading.destroy()
+        render(result)
 
-    canvas = FigureCanvasTkAgg(fig, master=top)
-    canvas.draw()
-    canvas.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=10)
+    def on_error(error):
+        loading.destroy()
+        messagebox.showerror("Report Failed", f"Failed to load {title}: {error}")
 
-    # Close button
-    close_btn = tk.Button(top, text="Close", command=top.destroy, bg="#f44336", fg="white")
-    close_btn.pack(pady=10)
+    executor.submit(load, on_done=on_done, on_error=on_error)
 
-    top.transient()
-    top.grab_set()
 
+# ==================== Chart Loaders ====================
+# Run on a worker thread: query the data, then get its image from the chart
+# cache (drawn only when the data has changed). None means nothing to plot.
 
-def show_monthly_trend_chart():
-    """
-    Show a line chart of monthly spending trends over the last 6 months.
-    """
-    conn = get_db_connection()
-    c = conn.cursor()
-    
-    # Get last 6 months of expense data
-    c.execute('''
-        SELECT strftime('%Y-%m', date) as month, SUM(amount) 
-        FROM transactions 
-        WHERE type = 'expense' 
-        AND date >= date('now', '-6 months')
-        GROUP BY strftime('%Y-%m', date)
-        ORDER BY month
-    ''')
-    
-    data = c.fetchall()
-    conn.close()
+def load_spending_chart(period=None):
+    """Returns: PNG bytes, or None without expenses"""
+    report = get_month_report(period)
+    if not report['expense']:
+        return None
+    return get_chart_cache().get('spending', (report['month'], report['expense']))
 
-    if not data:
-        messagebox.showinfo("No Data", "No expense data available for trend analysis.")
-        return
 
-    months, amounts = zip(*data)
-    
-    # Create line chart
-    fig, ax = plt.subplots(figsize=(10, 6))
-    ax.plot(months, amounts, marker='o', linewidth=2, markersize=8, color='#2196F3')
-    ax.set_ylabel('Total Expenses ($)')
-    ax.set_xlabel('Month')
-    ax.set_title("Monthly Spending Trend (Last 6 Months)", fontsize=14, pad=20)
-    ax.grid(True, alpha=0.3)
-    
-    # Rotate x-axis labels for better readability
-    plt.setp(ax.get_xticklabels(), rotation=45, ha="right")
-    
-    # Add value labels on points
-    for i, (month, amount) in enumerate(zip(months, amounts)):
-        ax.annotate(f'${amount:.0f}', (month, amount), 
-                   textcoords="offset points", xytext=(0,10), ha='center')
+def load_income_vs_expense_chart(period=None):
+    """Returns: PNG bytes, or None without transactions"""
+    report = get_month_report(period)
+    income, expenses = report['total_income'], report['total_expenses']
+    if income == 0 and expenses == 0:
+        return None
+    return get_chart_cache().get('income_vs_expense', (report['month'], income, expenses))
 
-    # Display in Tkinter window
-    top = tk.Toplevel()
-    top.title("📈 Monthly Spending Trend")
-    top.geometry("900x600")
-    top.minsize(800, 500)
 
-    canvas = FigureCanvasTkAgg(fig, master=top)
-    canvas.draw()
-    canvas.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=10)
+def load_monthly_trend_chart():
+    """Returns: PNG bytes, or None without expenses in the last 6 months"""
+    trend = get_monthly_trend()
+    if not trend:
+        return None
+    return get_chart_cache().get('trend', (trend, get_balance_trend()))
 
-    # Close button
-    close_btn = tk.Button(top, text="Close", command=top.destroy, bg="#f44336", fg="white")
-    close_btn.pack(pady=10)
 
-    top.transient()
-    top.grab_set()
+# ==================== Report Windows ====================
+
+def show_spending_pie_chart(executor=None, period=None):
+    """
+    Show a pie chart of a period's spending by category (default current month).
+    """
+    def render(png):
+        if png is None:
+            messagebox.showinfo("No Data", f"No expenses recorded {as_period(period).phrase}.")
+            return
+        _show_chart("📊 Spending Report", png, "800x600", (600, 500))
+
+    _run_report(executor, "Spending Report", lambda: load_spending_chart(period), render)
 
 
-def show_category_breakdown_report():
+def show_income_vs_expense_chart(executor=None, period=None):
     """
-    Show a detailed breakdown report in a new window.
+    Show a bar chart comparing income vs expenses for a period (default current month).
     """
-    conn = get_db_connection()
-    c = conn.cursor()
-    
-    current_month = datetime.now().strftime("%Y-%m")
-    
-    # Get income by category
-    c.execute('''
-        SELECT category, SUM(amount) 
-        FROM transactions 
-        WHERE type = 'income' 
-        AND strftime('%Y-%m', date) = ? 
-        GROUP BY category
-        ORDER BY SUM(amount) DESC
-    ''', (current_month,))
-    income_data = c.fetchall()
-    
-    # Get expenses by category
-    c.execute('''
-        SELECT category, SUM(amount) 
-        FROM transactions 
-        WHERE type = 'expense' 
-        AND strftime('%Y-%m', date) = ? 
-        GROUP BY category
-        ORDER BY SUM(amount) DESC
-    ''', (current_month,))
-    expense_data = c.fetchall()
-    
-    conn.close()
+    def render(png):
+        if png is None:
+            messagebox.showinfo("No Data", f"No transactions recorded {as_period(period).phrase}.")
+            return
+        _show_chart("💰 Income vs Expenses Report", png, "800x600", (600, 500))
 
-    if not income_data and not expense_data:
-        messagebox.showinfo("No Data", "No transactions recorded this month.")
-        return
+    _run_report(executor, "Income vs Expenses Report", lambda: load_income_vs_expense_chart(period), render)
 
-    # Create report window
-    top = tk.Toplevel()
-    top.title("📋 Detailed Category Breakdown")
-    top.geometry("800x600")
-    top.minsize(600, 500)
-
-    # Title
-    title_label = tk.Label(top, text=f"Category Breakdown Report - {current_month}", 
-                          font=("Helvetica", 16, "bold"))
-    title_label.pack(pady=10)
-
-    # Create notebook for tabs
-    from tkinter import ttk
-    notebook = ttk.Notebook(top)
-    notebook.pack(fill="both", expand=True, padx=10, pady=5)
-
-    # Income Tab
-    income_frame = tk.Frame(notebook)
-    notebook.add(income_frame, text="💰 Income")
-
-    if income_data:
-        income_text = tk.Text(income_frame, wrap=tk.WORD, font=("Courier", 10))
-        income_text.pack(fill="both", expand=True, padx=10, pady=10)
+
+def show_monthly_trend_chart(executor=None):
+    """
+    Show a line chart of monthly spending trends over the last 6 months,
+    next to the account balance at the end of each of those months.
+    """
+    def render(png):
+        if png is None:
+            messagebox.showinfo("No Data", "No expense data available for trend analysis.")
+            return
+        _show_chart("📈 Monthly Spending Trend", png, "1200x600", (800, 500))
+
+    _run_report(executor, "Monthly Spending Trend", load_monthly_trend_chart, render)
+
+
+def show_category_breakdown_report(executor=None, period=None):
+    """
+    Show a detailed breakdown report for a period (default current month) in a new window.
+    """
+    def render(report):
+        income_data, expense_data = report['income'], report['expense']
+        current_month = report['month']
+        phrase = as_period(period).phrase
+        if not income_data and not expense_data:
+            messagebox.showinfo("No Data", f"No transactions recorded {phrase}.")
+            return
+
+        # Create report window
+        top = tk.Toplevel()
+        top.title("📋 Detailed Category Breakdown")
+        top.geometry("800x600")
+        top.minsize(600, 500)
+
+        # Title
+        title_label = tk.Label(top, text=f"Category Breakdown Report - {current_month}", 
+                              font=("Helvetica", 16, "bold"))
+        title_label.pack(pady=10)
+
+        # Create notebook for tabs
+        from tkinter import ttk
+        notebook = ttk.Notebook(top)
+        notebook.pack(fill="both", expand=True, padx=10, pady=5)
+
+        # Income Tab
+        income_frame = tk.Frame(notebook)
+        notebook.add(income_frame, text="💰 Income")
+
+        if income_data:
+            income_text = tk.Text(income_frame, wrap=tk.WORD, font=("Courier", 10))
+            income_text.pack(fill="both", expand=True, padx=10, pady=10)
         
-        total_income = sum(amount for _, amount in income_data)
-        income_text.insert(tk.END, f"{'Category':<20} {'Amount ($)':<15}\n")
-        income_text.insert(tk.END, "-" * 35 + "\n")
+            total_income = report['total_income']
+            income_text.insert(tk.END, f"{'Category':<20} {'Amount ($)':<15}\n")
+            income_text.insert(tk.END, "-" * 35 + "\n")
         
-        for category, amount in income_data:
-            income_text.insert(tk.END, f"{category:<20} ${amount:<14.2f}\n")
+            for category, amount in income_data:
+                income_text.insert(tk.END, f"{category:<20} ${amount:<14.2f}\n")
         
-        income_text.insert(tk.END, "-" * 35 + "\n")
-        income_text.insert(tk.END, f"{'TOTAL INCOME':<20} ${total_income:<14.2f}\n")
-        income_text.config(state=tk.DISABLED)
-    else:
-        no_income_label = tk.Label(income_frame, text="No income recorded this month.", 
-                                  font=("Helvetica", 12))
-        no_income_label.pack(pady=50)
-
-    # Expenses Tab
-    expense_frame = tk.Frame(notebook)
-    notebook.add(expense_frame, text="💸 Expenses")
-
-    if expense_data:
-        expense_text = tk.Text(expense_frame, wrap=tk.WORD, font=("Courier", 10))
-        expense_text.pack(fill="both", expand=True, padx=10, pady=10)
+            income_text.insert(tk.END, "-" * 35 + "\n")
+            income_text.insert(tk.END, f"{'TOTAL INCOME':<20} ${total_income:<14.2f}\n")
+            income_text.config(state=tk.DISABLED)
+        else:
+            no_income_label = tk.Label(income_frame, text=f"No income recorded {phrase}.", 
+                                      font=("Helvetica", 12))
+            no_income_label.pack(pady=50)
+
+        # Expenses Tab
+        expense_frame = tk.Frame(notebook)
+        notebook.add(expense_frame, text="💸 Expenses")
+
+        if expense_data:
+            expense_text = tk.Text(expense_frame, wrap=tk.WORD, font=("Courier", 10))
+            expense_text.pack(fill="both", expand=True, padx=10, pady=10)
         
-        total_expenses = sum(amount for _, amount in expense_data)
-        expense_text.insert(tk.END, f"{'Category':<20} {'Amount ($)':<15}\n")
-        expense_text.insert(tk.END, "-" * 35 + "\n")
+            total_expenses = report['total_expenses']
+            expense_text.insert(tk.END, f"{'Category':<20} {'Amount ($)':<15}\n")
+            expense_text.insert(tk.END, "-" * 35 + "\n")
         
-        for category, amount in expense_data:
-            expense_text.insert(tk.END, f"{category:<20} ${amount:<14.2f}\n")
+            for category, amount in expense_data:
+                expense_text.insert(tk.END, f"{category:<20} ${amount:<14.2f}\n")
         
-        expense_text.insert(tk.END, "-" * 35 + "\n")
-        expense_text.insert(tk.END, f"{'TOTAL EXPENSES':<20} ${total_expenses:<14.2f}\n")
-        expense_text.config(state=tk.DISABLED)
-    else:
-        no_expense_label = tk.Label(expense_frame, text="No expenses recorded this month.", 
-                                   font=("Helvetica", 12))
-        no_expense_label.pack(pady=50)
-
-    # Summary Tab
-    summary_frame = tk.Frame(notebook)
-    notebook.add(summary_frame, text="📊 Summary")
-
-    summary_text = tk.Text(summary_frame, wrap=tk.WORD, font=("Courier", 10))
-    summary_text.pack(fill="both", expand=True, padx=10, pady=10)
+            expense_text.insert(tk.END, "-" * 35 + "\n")
+            expense_text.insert(tk.END, f"{'TOTAL EXPENSES':<20} ${total_expenses:<14.2f}\n")
+            expense_text.config(state=tk.DISABLED)
+        else:
+            no_expense_label = tk.Label(expense_frame, text=f"No expenses recorded {phrase}.", 
+                                       font=("Helvetica", 12))
+            no_expense_label.pack(pady=50)
+
+        # Summary Tab
+        summary_frame = tk.Frame(notebook)
+        notebook.add(summary_frame, text="📊 Summary")
+
+        summary_text = tk.Text(summary_frame, wrap=tk.WORD, font=("Courier", 10))
+        summary_text.pack(fill="both", expand=True, padx=10, pady=10)
     
-    total_income = sum(amount for _, amount in income_data)
-    total_expenses = sum(amount for _, amount in expense_data)
-    net = total_income - total_expenses
+        total_income = report['total_income']
+        total_expenses = report['total_expenses']
+        net = report['net_savings']
     
-    summary_text.insert(tk.END, "MONTHLY SUMMARY\n")
-    summary_text.insert(tk.END, "=" * 30 + "\n\n")
-    summary_text.insert(tk.END, f"Total Income:    ${total_income:.2f}\n")
-    summary_text.insert(tk.END, f"Total Expenses:  ${total_expenses:.2f}\n")
-    summary_text.insert(tk.END, f"Net Savings:     ${net:.2f}\n\n")
+        summary_text.insert(tk.END, "MONTHLY SUMMARY\n" if as_period(period).kind == 'month' else "SUMMARY\n")
+        summary_text.insert(tk.END, "=" * 30 + "\n\n")
+        summary_text.insert(tk.END, f"Total Income:    ${total_income:.2f}\n")
+        summary_text.insert(tk.END, f"Total Expenses:  ${total_expenses:.2f}\n")
+        summary_text.insert(tk.END, f"Net Savings:     ${net:.2f}\n\n")
     
-    if net >= 0:
-        summary_text.insert(tk.END, "✅ You saved money this month!\n", "green")
-    else:
-        summary_text.insert(tk.END, "⚠️ You spent more than you earned.\n", "red")
+        if net >= 0:
+            summary_text.insert(tk.END, f"✅ You saved money {phrase}!\n", "green")
+        else:
+            summary_text.insert(tk.END, "⚠️ You spent more than you earned.\n", "red")
     
-    summary_text.tag_config("green", foreground="green")
-    summary_text.tag_config("red", foreground="red")
-    summary_text.config(state=tk.DISABLED)
+        summary_text.tag_config("green", foreground="green")
+        summary_text.tag_config("red", foreground="red")
+        summary_text.config(state=tk.DISABLED)
 
-    # Close button
-    close_btn = tk.Button(top, text="Close", command=top.destroy, bg="#f44336", fg="white")
-    close_btn.pack(pady=10)
+        # Close button
+        close_btn = tk.Button(top, text="Close", command=top.destroy, bg="#f44336", fg="white")
+        close_btn.pack(pady=10)
 
-    top.transient()
-    top.grab_set()
+        top.transient()
+        top.grab_set()
+
+    _run_report(executor, "Category Breakdown", lambda: get_month_report(period), render)
 
 
-def export_report_to_text():
+def export_report_to_text(period=None):
     """
-    Export current month's report to a text file.
+    Export a period's report (default current month) to a text file.
     Returns: bool (success)
     """
     try:
-        conn = get_db_connection()
-        c = conn.cursor()
-        
-        current_month = datetime.now().strftime("%Y-%m")
-        filename = f"finance_report_{current_month.replace('-', '_')}.txt"
-        
-        # Get income data
-        c.execute('''
-            SELECT category, SUM(amount) 
-            FROM transactions 
-            WHERE type = 'income' 
-            AND strftime('%Y-%m', date) = ? 
-            GROUP BY category
-            ORDER BY SUM(amount) DESC
-        ''', (current_month,))
-        income_data = c.fetchall()
-        
-        # Get expense data
-        c.execute('''
-            SELECT category, SUM(amount) 
-            FROM transactions 
-            WHERE type = 'expense' 
-            AND strftime('%Y-%m', date) = ? 
-            GROUP BY category
-            ORDER BY SUM(amount) DESC
-        ''', (current_month,))
-        expense_data = c.fetchall()
-        
-        conn.close()
+        report = get_month_report(period)
+        filename = f"finance_report_{re.sub(r'[^0-9A-Za-z]+', '_', report['month'])}.txt"
 
         # Write to file
         with open(filename, 'w', encoding='utf-8') as f:
-            f.write(f"PERSONAL FINANCE REPORT - {current_month}\n")
-            f.write("=" * 50 + "\n\n")
-            
-            # Income section
-            f.write("INCOME BREAKDOWN:\n")
-            f.write("-" * 20 + "\n")
-            total_income = sum(amount for _, amount in income_data)
-            for category, amount in income_data:
-                f.write(f"{category:<20} ${amount:>10.2f}\n")
-            f.write("-" * 20 + "\n")
-            f.write(f"{'TOTAL INCOME':<20} ${total_income:>10.2f}\n\n")
-            
-            # Expenses section
-            f.write("EXPENSE BREAKDOWN:\n")
-            f.write("-" * 20 + "\n")
-            total_expenses = sum(amount for _, amount in expense_data)
-            for category, amount in expense_data:
-                f.write(f"{category:<20} ${amount:>10.2f}\n")
-            f.write("-" * 20 + "\n")
-            f.write(f"{'TOTAL EXPENSES':<20} ${total_expenses:>10.2f}\n\n")
-            
-            # Summary
-            net = total_income - total_expenses
-            f.write("SUMMARY:\n")
-            f.write("-" * 10 + "\n")
-            f.write(f"Net Savings: ${net:>10.2f}\n")
-            if net >= 0:
-                f.write("Status: You saved money this month! 🎉\n")
-            else:
-                f.write("Status: You spent more than you earned. 💰\n")
+            f.write(format_text_report(report, period))
 
         messagebox.showinfo("Export Complete", f"Report exported to {filename}")
         return True
@@ -392,44 +268,3 @@ def export_report_to_text():
     except Exception as e:
         messagebox.showerror("Export Failed", f"Failed to export report: {str(e)}")
         return False
-
-
-def get_monthly_summary_stats():
-    """
-    Get summary statistics for current month.
-    Returns: dict with income, expenses, net, and transaction count
-    """
-    conn = get_db_connection()
-    c = conn.cursor()
-    
-    current_month = datetime.now().strftime("%Y-%m")
-    
-    # Get income
-    c.execute('''
-        SELECT COALESCE(SUM(amount), 0), COUNT(*) 
-        FROM transactions 
-        WHERE type = 'income' 
-        AND strftime('%Y-%m', date) = ?
-    ''', (current_month,))
-    income_sum, income_count = c.fetchone()
-    
-    # Get expenses
-    c.execute('''
-        SELECT COALESCE(SUM(amount), 0), COUNT(*) 
-        FROM transactions 
-        WHERE type = 'expense' 
-        AND strftime('%Y-%m', date) = ?
-    ''', (current_month,))
-    expense_sum, expense_count = c.fetchone()
-    
-    conn.close()
-    
-    return {
-        'period': current_month,
-        'total_income': income_sum,
-        'total_expenses': expense_sum,
-        'net_savings': income_sum - expense_sum,
-        'income_transactions': income_count,
-        'expense_transactions': expense_count,
-        'total_transactions': income_count + expense_count
-    }
\ No newline at end of file
@@ -0,0 +1,173 @@
+# core/report_data.py
+"""
+Report data layer shared by the chart windows, text exports and the CLI.
+
+A month's income and expense breakdowns, totals and counts come from one
+grouped query over the monthly_totals rollup. Results are cached until the
+next write to that month, so opening several report windows costs one query.
+Other periods (quarters, years, ranges, rolling days; see periods.py) are
+answered the same way, and get_period_reports() builds many at once.
+No tkinter or matplotlib here.
+"""
+from .database import get_db_connection, cached, month_tags, from_cents
+from .periods import as_period, get_period_totals, months_back
+from .balance import get_balance_series
+
+
+def get_month_report(period=None):
+    """
+    Get the full income/expense picture for a period: a month ('YYYY-MM'),
+    another period spec or Period, default the current month.
+    Returns: dict with
+        month, income, expense  - period label ('YYYY-MM' for a month), and
+                                  lists of (category, total), largest first
+        total_income, total_expenses, net_savings
+        income_transactions, expense_transactions, total_transactions
+    """
+    period = as_period(period)
+    if period.kind != 'month':
+        return get_period_reports([period])[0]
+    month = period.label
+    return cached('month_report', (month,), month_tags(month), lambda: _load_month_report(month))
+
+
+def get_period_reports(periods):
+    """
+    Reports (as get_month_report) for many periods from one grouped query,
+    e.g. the twelve months of a year or this quarter against last year's.
+    Returns: list of dicts, one per period
+    """
+    periods = [as_period(period) for period in periods]
+    return [report_from_totals(period.label, totals)
+            for period, totals in zip(periods, get_period_totals(periods))]
+
+
+def report_from_totals(label, totals):
+    """
+    Build a report from one period's get_period_totals() dict, e.g. totals
+    combined across ledgers (see ledgers.py).
+    Returns: dict (as get_month_report)
+    """
+    rows = sorted(((trans_type, category, cents, count)
+                   for (trans_type, category), (cents, count) in totals.items()),
+                  key=lambda row: (row[0], -row[2]))
+    return _build_report(label, rows)
+
+
+def _load_month_report(month):
+    conn = get_db_connection()
+    rows = conn.execute('''
+        SELECT type, category, total_cents, count
+        FROM monthly_totals
+        WHERE type IN ('income', 'expense')
+        AND month = ?
+        ORDER BY type, total_cents DESC
+    ''', (month,)).fetchall()
+    return _build_report(month, rows)
+
+
+def _build_report(label, rows):
+    """Report dict from (type, category, total_cents, count) rows, largest first per type."""
+    # Totals are summed as integer cents, so they are exact
+    breakdown = {'income': [], 'expense': []}
+    cents = {'income': 0, 'expense': 0}
+    counts = {'income': 0, 'expense': 0}
+    for trans_type, category, total, count in rows:
+        if trans_type not in breakdown:
+            continue
+        breakdown[trans_type].append((category, from_cents(total)))
+        cents[trans_type] += total
+        counts[trans_type] += count
+
+    return {
+        'month': label,
+        'income': breakdown['income'],
+        'expense': breakdown['expense'],
+        'total_income': from_cents(cents['income']),
+        'total_expenses': from_cents(cents['expense']),
+        'net_savings': from_cents(cents['income'] - cents['expense']),
+        'income_transactions': counts['income'],
+        'expense_transactions': counts['expense'],
+        'total_transactions': counts['income'] + counts['expense']
+    }
+
+
+def get_monthly_summary_stats(period=None):
+    """
+    Get summary statistics for a period (default current month).
+    Returns: dict with income, expenses, net, and transaction count
+    """
+    report = get_month_report(period)
+    return {
+        'period': report['month'],
+        'total_income': report['total_income'],
+        'total_expenses': report['total_expenses'],
+        'net_savings': report['net_savings'],
+        'income_transactions': report['income_transactions'],
+        'expense_transactions': report['expense_transactions'],
+        'total_transactions': report['total_transactions']
+    }
+
+
+def get_monthly_trend():
+    """
+    Get total expenses per month over the last 6 months.
+    Returns: list of (month, total), oldest first
+    """
+    conn = get_db_connection()
+    return conn.execute('''
+        SELECT month, SUM(amount_cents) / 100.0
+        FROM transactions
+        WHERE type = 'expense'
+        AND month >= strftime('%Y-%m', 'now', '-6 months')
+        AND date >= date('now', '-6 months')
+        GROUP BY month
+        ORDER BY month
+    ''').fetchall()
+
+
+def get_balance_trend(months=6):
+    """
+    Get the balance at the end of each of the last `months` months
+    (see balance.py; each point is an index lookup, not a re-aggregation).
+    Returns: list of (month, balance), oldest first
+    """
+    return get_balance_series(months_back(months))
+
+
+def format_text_report(report, period=None):
+    """
+    Render a report as the plain-text summary used by exports.
+    period: the report's Period or spec, for the wording of the summary
+            (default: read from the report's label)
+    Returns: str
+    """
+    lines = [f"PERSONAL FINANCE REPORT - {report['month']}", "=" * 50, ""]
+
+    # Income section
+    lines += ["INCOME BREAKDOWN:", "-" * 20]
+    lines += [f"{category:<20} ${amount:>10.2f}" for category, amount in report['income']]
+    lines += ["-" * 20, f"{'TOTAL INCOME':<20} ${report['total_income']:>10.2f}", ""]
+
+    # Expenses section
+    lines += ["EXPENSE BREAKDOWN:", "-" * 20]
+    lines += [f"{category:<20} ${amount:>10.2f}" for category, amount in report['expense']]
+    lines += ["-" * 20, f"{'TOTAL EXPENSES':<20} ${report['total_expenses']:>10.2f}", ""]
+
+    # Summary
+    net = report['net_savings']
+    lines += ["SUMMARY:", "-" * 10, f"Net Savings: ${net:>10.2f}"]
+    if net >= 0:
+        lines.append(f"Status: You saved money {_period_phrase(report, period)}! 🎉")
+    else:
+        lines.append("Status: You spent more than you earned. 💰")
+    return "\n".join(lines) + "\n"
+
+
+def _period_phrase(report, period):
+    if period is None:
+        try:
+            period = as_period(report['month'])
+        except ValueError:
+            return f"in {report['month']}"  # e.g. 'last 90 days', not a spec
+    return as_period(period).phrase
@@ -30,6 +30,7 @@ def main():
     def on_closing():
         """Handle application closing with confirmation dialog."""
         if messagebox.askyesno("Quit", "Are you sure you want to exit the finance app?"):
+            app.executor.shutdown()
             root.destroy()
             root.quit()
 
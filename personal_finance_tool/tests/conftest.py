@@ -0,0 +1,36 @@
+# tests/conftest.py
+import os
+import sys
+
+import pytest
+
+# Import the app as the personal_finance_tool package, as the CLI does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from personal_finance_tool.core import database
+
+
+@pytest.fixture
+def db(tmp_path):
+    """A fresh, migrated ledger selected for the test. Yields: ConnectionPool"""
+    pool = database.ConnectionPool(str(tmp_path / 'test.db'))
+    with database.use_pool(pool):
+        database.init_db()
+        yield pool
+    pool.close_all()
+
+
+@pytest.fixture
+def insert_rows(db):
+    """
+    Insert raw transaction rows in one write, bypassing add_transaction's
+    validation (e.g. to store malformed dates).
+    Yields: callable(rows), rows as (date, type, category, amount_cents, description)
+    """
+    def insert(rows):
+        with db.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO transactions (date, type, category, amount_cents, description) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+    yield insert
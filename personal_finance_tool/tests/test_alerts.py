@@ -0,0 +1,75 @@
+# tests/test_alerts.py
+from datetime import datetime
+
+import pytest
+
+from personal_finance_tool.core import database
+from personal_finance_tool.core.alerts import BudgetAlertEngine
+from personal_finance_tool.core.importer import import_file
+
+MONTH = datetime.now().strftime("%Y-%m")
+
+
+@pytest.fixture
+def engine(db):
+    """A BudgetAlertEngine listening to add_transaction, with a $100 Groceries budget."""
+    database.set_category_budget('Groceries', 100)
+    engine = BudgetAlertEngine()
+    database.add_transaction_listener(engine.record)
+    yield engine
+    database.remove_transaction_listener(engine.record)
+
+
+def spend(amount):
+    database.add_transaction(f'{MONTH}-01', 'expense', 'Groceries', amount, '')
+
+
+def test_alerts_once_per_threshold_crossed(engine):
+    alerts = []
+    engine.subscribe(alerts.append)
+    spend(40)
+    assert alerts == []
+
+    spend(15)
+    spend(5)
+    assert [alert['threshold'] for alert in alerts] == [50]
+
+    # One expense can cross two thresholds; the alert names the highest
+    spend(50)
+    assert [alert['threshold'] for alert in alerts] == [50, 100]
+    assert alerts[-1]['spent'] == 110
+
+
+def test_budget_change_reseeds(engine):
+    spend(60)
+    assert engine.status()[0]['threshold'] == 50
+
+    database.set_category_budget('Groceries', 70)
+    assert [alert['threshold'] for alert in engine.sync()] == [80]
+    assert engine.sync() == []
+    assert engine.status()[0]['budget'] == 70
+
+
+def test_sync_after_import(engine, tmp_path):
+    spend(10)
+    path = tmp_path / 'statement.csv'
+    path.write_text("date,type,category,amount,description\n"
+                    f"{MONTH}-02,expense,Groceries,75.00,market\n")
+
+    assert import_file(str(path))['rows_imported'] == 1
+    assert [alert['threshold'] for alert in engine.sync()] == [80]
+    assert engine.status()[0]['spent'] == 85
+
+
+def test_seed_between_commit_and_listener_counts_once(db):
+    database.set_category_budget('Groceries', 100)
+    engine = BudgetAlertEngine()
+    engine.sync()
+
+    # Another thread re-seeds after the insert commits, before the listener runs
+    commits_before = db.commits
+    spend(60)
+    engine._token = None
+    assert [alert['threshold'] for alert in engine.sync()] == [50]
+    assert engine.record(f'{MONTH}-01', 'expense', 'Groceries', 6000, commits_before) == []
+    assert engine.status()[0]['spent'] == 60
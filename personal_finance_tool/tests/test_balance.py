@@ -0,0 +1,102 @@
+# tests/test_balance.py
+import random
+
+import pytest
+
+from personal_finance_tool.core import database
+from personal_finance_tool.core.balance import (
+    BalanceIndex,
+    FenwickTree,
+    get_balance_index,
+    get_transactions_page_with_balance
+)
+
+
+def test_fenwick_prefix_sums_match_naive_sums():
+    rng = random.Random(7)
+    values = [rng.randint(-1000, 1000) for _ in range(200)]
+    tree = FenwickTree(values)
+
+    for _ in range(100):
+        index, delta = rng.randrange(len(values)), rng.randint(-500, 500)
+        tree.add(index, delta)
+        values[index] += delta
+
+    for index in range(len(values)):
+        assert tree.prefix_sum(index) == sum(values[:index + 1])
+    assert tree.prefix_sum(-1) == 0
+    assert tree.prefix_sum(len(values) + 10) == sum(values)
+
+
+def test_balance_follows_inserts(db):
+    database.add_transaction('2024-06-01', 'income', 'Salary', 1000, 'pay')
+    database.add_transaction('2024-06-03', 'expense', 'Rent', 400, 'rent')
+    index = get_balance_index()
+
+    assert index.balance_at('2024-05-31') == 0
+    assert index.balance_at('2024-06-02') == 100000
+    assert index.balance_at('2024-06-30') == 60000
+
+    # Applied incrementally to the loaded tree, not by a reload
+    loads = index.stats['loads']
+    database.add_transaction('2024-06-02', 'expense', 'Groceries', 12.34, 'food')
+    assert index.balance_at('2024-06-02') == 100000 - 1234
+    assert index.between('2024-06-02', '2024-06-03') == -1234 - 40000
+    assert index.stats['loads'] == loads
+
+
+def test_running_balance_column(db):
+    database.add_transaction('2024-06-01', 'income', 'Salary', 1000, 'pay')
+    database.add_transaction('2024-06-02', 'expense', 'Rent', 400, 'rent')
+    database.add_transaction('2024-06-02', 'expense', 'Groceries', 50, 'food')
+
+    rows = get_transactions_page_with_balance('2024-06')
+
+    assert [(row[5], row[6]) for row in rows] == [('food', 550.0), ('rent', 600.0), ('pay', 1000.0)]
+    # A later page starts from the balance where the previous one ended
+    second_page = get_transactions_page_with_balance('2024-06', after=(rows[0][1], rows[0][0]))
+    assert [row[6] for row in second_page] == [600.0, 1000.0]
+
+
+def test_add_transaction_rejects_malformed_dates(db):
+    for day in ('2026-10-1', '2026-02-30', '20261001', '2026-W40-1', ''):
+        with pytest.raises(ValueError):
+            database.add_transaction(day, 'expense', 'Rent', 1, '')
+    assert database.get_db_connection().execute("SELECT COUNT(*) FROM transactions").fetchone()[0] == 0
+
+
+def test_malformed_stored_dates_are_left_out_of_balances(insert_rows):
+    database.add_transaction('2026-10-01', 'income', 'Salary', 1000, 'pay')
+    database.add_transaction('2026-10-03', 'expense', 'Rent', 400, 'rent')
+    insert_rows([('2026-10-5', 'expense', 'Food', 5000, 'typed by hand')])
+    index = get_balance_index()
+
+    assert index.balance_at('2026-10-1') is None
+    assert index.between('2026-10-1', '2026-10-31') is None
+    assert index.balance_at('2026-10-31') == 60000
+
+    rows = get_transactions_page_with_balance('2026-10')
+    assert [(row[1], row[-1]) for row in rows] == [
+        ('2026-10-5', None), ('2026-10-03', 600.0), ('2026-10-01', 1000.0)]
+
+
+def test_reload_between_commit_and_listener_counts_once(db):
+    database.add_transaction('2026-10-01', 'income', 'Salary', 1000, 'pay')
+    index = BalanceIndex()    # not registered: its listener call is made by hand
+    index.balance_at('2026-10-01')
+
+    # A worker reloads (forced here) after the insert commits, before the listener runs
+    commits_before = db.commits
+    database.add_transaction('2026-10-02', 'expense', 'Rent', 400, 'rent')
+    index._token = None
+    assert index.balance_at('2026-10-02') == 60000
+    index.record('2026-10-02', 'expense', 'Rent', 40000, commits_before)
+    assert index.balance_at('2026-10-02') == 60000
+
+    # Loaded before the commit: the listener applies the row without a reload
+    loads = index.stats['loads']
+    commits_before = db.commits
+    database.add_transaction('2026-10-03', 'expense', 'Food', 50, 'food')
+    index.record('2026-10-03', 'expense', 'Food', 5000, commits_before)
+    assert index.balance_at('2026-10-03') == 55000
+    assert index.stats['loads'] == loads
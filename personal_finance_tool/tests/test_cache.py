@@ -0,0 +1,97 @@
+# tests/test_cache.py
+import contextvars
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+from personal_finance_tool.core import database
+from personal_finance_tool.core.database import QueryCache
+
+
+def test_tag_invalidation_recomputes_only_dependent_entries():
+    cache = QueryCache()
+    calls = []
+
+    def compute(value):
+        def run():
+            calls.append(value)
+            return value
+        return run
+
+    cache.get('june', ('transactions', 'transactions:2024-06'), compute('june'))
+    cache.get('budgets', ('budgets',), compute('budgets'))
+    cache.invalidate('transactions:2024-06')
+
+    assert cache.get('june', ('transactions', 'transactions:2024-06'), compute('june')) == 'june'
+    assert cache.get('budgets', ('budgets',), compute('budgets')) == 'budgets'
+    assert calls == ['june', 'budgets', 'june']
+
+
+def test_invalidate_without_tags_clears_everything():
+    cache = QueryCache()
+    token = cache.version('budgets')
+    cache.get('key', ('budgets',), lambda: 1)
+
+    cache.invalidate()
+
+    assert cache.version('budgets') != token
+    assert cache.get('key', ('budgets',), lambda: 2) == 2
+
+
+def test_writes_invalidate_cached_reads(db):
+    database.add_transaction('2024-06-01', 'expense', 'Groceries', 10, 'first')
+    assert len(database.get_transactions_for_month('2024-06')) == 1
+    assert database.get_category_spending('Groceries', '2024-06') == 10
+
+    database.add_transaction('2024-06-02', 'expense', 'Groceries', 2.5, 'second')
+
+    assert len(database.get_transactions_for_month('2024-06')) == 2
+    assert database.get_category_spending('Groceries', '2024-06') == 12.5
+
+
+def test_write_to_another_month_keeps_entry(db):
+    database.add_transaction('2024-06-01', 'expense', 'Groceries', 10, 'june')
+    database.get_transactions_for_month('2024-06')
+    hits = db.cache.stats['hits']
+
+    database.add_transaction('2024-07-01', 'expense', 'Groceries', 5, 'july')
+    database.get_transactions_for_month('2024-06')
+
+    assert db.cache.stats['hits'] == hits + 1
+
+
+def test_commits_from_other_connections_invalidate(db):
+    database.add_transaction('2024-06-01', 'expense', 'Groceries', 10, 'app')
+    assert database.get_category_spending('Groceries', '2024-06') == 10
+    assert len(database.get_transactions_for_month('2024-06')) == 1
+
+    # e.g. a CLI import from cron while the GUI is running
+    other = sqlite3.connect(db.path)
+    with other:
+        other.execute("INSERT INTO transactions (date, type, category, amount_cents, description) "
+                      "VALUES ('2024-06-02', 'expense', 'Groceries', 1263, 'cron')")
+    other.close()
+
+    assert database.get_category_spending('Groceries', '2024-06') == 22.63
+    assert len(database.get_transactions_for_month('2024-06')) == 2
+
+
+def test_app_writes_seen_from_worker_threads_keep_other_months_cached(db):
+    database.add_transaction('2024-06-01', 'expense', 'Groceries', 10, 'june')
+    database.add_transaction('2024-07-01', 'expense', 'Groceries', 20, 'july')
+
+    with ThreadPoolExecutor(max_workers=1) as worker:
+        def spending(month):
+            # Like QueryExecutor: the worker has its own pooled connection
+            return worker.submit(contextvars.copy_context().run,
+                                 database.get_category_spending, 'Groceries', month).result()
+
+        assert (spending('2024-06'), spending('2024-07')) == (10, 20)
+
+        # Written on this thread's connection, read from the worker's
+        database.add_transaction('2024-06-02', 'expense', 'Groceries', 5, 'june')
+        hits = db.cache.stats['hits']
+
+        assert spending('2024-07') == 20
+        assert db.cache.stats['hits'] == hits + 1
+        assert spending('2024-06') == 15
+        assert db.cache.stats['hits'] == hits + 1
@@ -0,0 +1,36 @@
+# tests/test_executor.py
+from personal_finance_tool.core.executor import QueryExecutor
+
+
+class FakeRoot:
+    """Collects after() callbacks so the test can run them like Tk's event loop."""
+
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, ms, func):
+        self.scheduled.append(func)
+
+    def run_pending(self):
+        while self.scheduled:
+            self.scheduled.pop(0)()
+
+
+def test_raising_callback_does_not_stop_delivery():
+    root = FakeRoot()
+    executor = QueryExecutor(root, frame_budget_ms=1000)
+    delivered = []
+
+    def broken(result):
+        raise RuntimeError("callback bug")
+
+    executor.submit(lambda: 1, on_done=broken).exception()
+    root.run_pending()
+    executor.submit(lambda: 2, on_done=delivered.append).exception()
+    executor.submit(lambda: 1 / 0, on_error=lambda e: delivered.append(type(e))).exception()
+    root.run_pending()
+    executor.shutdown()
+
+    assert delivered == [2, ZeroDivisionError]
+    assert executor.stats['callback_errors'] == 1
+    assert not executor._polling
@@ -0,0 +1,72 @@
+# tests/test_exporter.py
+import pytest
+
+from personal_finance_tool.core import database
+from personal_finance_tool.core.exporter import export_transactions, iter_columnar
+
+
+def test_columnar_round_trip(insert_rows, tmp_path):
+    expected = [
+        ('2024-01-05', 'income', 'Salary', 250000, 'payroll'),
+        ('2024-01-06', 'expense', 'Groceries', 1234, 'Crème brûlée'),
+        ('2024-02-01', 'expense', 'Rent', 90000, ''),
+        ('2024-02-03', 'expense', 'Groceries', 5, 'gum'),
+        ('2024-03-09', 'expense', 'Transport', 275, 'bus'),
+    ]
+    insert_rows(expected)
+    path = tmp_path / 'out.pfcol'
+
+    # Small chunks so categories are spread over several blocks
+    result = export_transactions(str(path), chunk_size=2)
+    rows = [row for block in iter_columnar(str(path)) for row in block]
+
+    assert result['rows'] == len(expected)
+    assert [row[1:] for row in rows] == expected
+    assert [row[0] for row in rows] == [1, 2, 3, 4, 5]
+
+
+def test_export_date_range_is_inclusive(db, tmp_path):
+    for day in ('2024-01-31', '2024-02-01', '2024-02-29', '2024-03-01'):
+        database.add_transaction(day, 'expense', 'Groceries', 1, day)
+    path = tmp_path / 'feb.pfcol'
+
+    export_transactions(str(path), start='2024-02-01', end='2024-02-29')
+
+    assert [row[1] for block in iter_columnar(str(path)) for row in block] == ['2024-02-01', '2024-02-29']
+
+
+def test_export_rejects_invalid_range(db, tmp_path):
+    path = tmp_path / 'out.csv'
+    for start, end in [('2026-13-01', None), (None, '2026-02-30'), ('2026-1-01', None),
+                       ('2026-03-01', '2026-02-01')]:
+        with pytest.raises(ValueError):
+            export_transactions(str(path), start=start, end=end)
+    assert not path.exists()
+
+
+def test_columnar_export_skips_malformed_dates(insert_rows, tmp_path):
+    insert_rows([
+        ('2026-10-01', 'expense', 'Rent', 90000, ''),
+        ('2026-10-1', 'expense', 'Groceries', 1234, 'bad date'),
+    ])
+    path = tmp_path / 'out.pfcol'
+
+    result = export_transactions(str(path))
+    rows = [row for block in iter_columnar(str(path)) for row in block]
+
+    assert (result['rows'], result['rows_skipped']) == (1, 1)
+    assert [row[1] for row in rows] == ['2026-10-01']
+
+
+def test_failed_export_keeps_previous_file(insert_rows, tmp_path):
+    insert_rows([('2026-10-01', 'expense', 'Rent', 90000, '')])
+    path = tmp_path / 'out.csv'
+    path.write_text('previous export')
+
+    def fail(written):
+        raise RuntimeError("disk full")
+
+    with pytest.raises(RuntimeError):
+        export_transactions(str(path), progress=fail)
+    assert path.read_text() == 'previous export'
+    assert not list(tmp_path.glob('out.csv.*'))
@@ -0,0 +1,21 @@
+# tests/test_importer.py
+import pytest
+
+from personal_finance_tool.core.importer import parse_date
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('2024-02-29', '2024-02-29'),
+    (' 2024-06-01 ', '2024-06-01'),
+    ('20240601', '2024-06-01'),
+    ('06/01/2024', '2024-06-01'),
+    ('2024-6-1', '2024-06-01'),
+])
+def test_parse_date_normalises(value, expected):
+    assert parse_date(value) == expected
+
+
+@pytest.mark.parametrize('value', ['2024-02-31', '2023-02-29', '2024-13-01', '2024-00-10', '2024-06-xx', 'June'])
+def test_parse_date_rejects_impossible_dates(value):
+    with pytest.raises(ValueError):
+        parse_date(value)
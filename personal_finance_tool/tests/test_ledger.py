@@ -0,0 +1,63 @@
+# tests/test_ledger.py
+import pytest
+
+from personal_finance_tool.core import database
+from personal_finance_tool.core.ledger import Ledger, from_day
+
+
+def test_refresh_skips_malformed_dates(insert_rows):
+    insert_rows([
+        ('2026-10-01', 'expense', 'Rent', 90000, ''),
+        ('2026-10-1', 'expense', 'Groceries', 1234, 'bad date'),
+        ('2026-10-03', 'income', 'Salary', 250000, ''),
+    ])
+    ledger = Ledger(chunk_size=1)
+
+    assert ledger.refresh() == 2
+    assert list(ledger.ids) == [1, 3]
+    assert ledger.skipped_ids == [2]
+    assert [from_day(day) for day in ledger.days] == ['2026-10-01', '2026-10-03']
+
+    # Nothing changed: no reload, nothing new
+    assert ledger.refresh() == 0
+    assert len(ledger) == 2
+
+
+def test_refresh_appends_and_reloads_after_deletes(insert_rows):
+    insert_rows([('2026-10-01', 'expense', 'Rent', 90000, ''),
+                 ('2026-10-02', 'expense', 'Food', 500, '')])
+    ledger = Ledger()
+    ledger.refresh()
+
+    insert_rows([('2026-10-04', 'income', 'Salary', 250000, '')])
+    assert ledger.refresh() == 1
+    assert list(ledger.ids) == [1, 2, 3]
+
+    with database.transaction() as conn:
+        conn.execute("DELETE FROM transactions WHERE id = 2")
+    assert ledger.refresh() == 2
+    assert list(ledger.ids) == [1, 3]
+    assert list(ledger.cents) == [90000, 250000]
+
+
+@pytest.mark.parametrize('change', [
+    "amount_cents = 700",
+    "category = 'Dining'",
+    "date = '2026-11-02'",
+    "type = 'income'",
+])
+def test_refresh_reloads_after_updates(insert_rows, change):
+    insert_rows([('2026-10-01', 'expense', 'Rent', 90000, ''),
+                 ('2026-10-02', 'expense', 'Food', 500, '')])
+    ledger = Ledger()
+    ledger.refresh()
+
+    with database.transaction() as conn:
+        conn.execute(f"UPDATE transactions SET {change} WHERE id = 2")
+    insert_rows([('2026-10-04', 'income', 'Salary', 250000, '')])
+    assert ledger.refresh() == 3
+
+    expected = database.get_db_connection().execute(
+        "SELECT amount_cents, category FROM transactions ORDER BY id").fetchall()
+    assert [(int(cents), ledger.category_names[code])
+            for cents, code in zip(ledger.cents, ledger.categories)] == expected
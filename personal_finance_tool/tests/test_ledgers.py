@@ -0,0 +1,53 @@
+# tests/test_ledgers.py
+import sqlite3
+
+import pytest
+
+from personal_finance_tool.core import database
+from personal_finance_tool.core.ledgers import LedgerRegistry
+from personal_finance_tool.core.periods import get_period_totals
+
+MONTH = '2026-10'
+
+
+@pytest.fixture
+def registry(tmp_path):
+    registry = LedgerRegistry({'smith': 'smith.db', 'jones': 'jones.db'}, base_dir=str(tmp_path), workers=2)
+    for ledger_id in registry.ids():
+        with registry.use(ledger_id, create=True):
+            database.add_transaction(f'{MONTH}-01', 'expense', 'Rent', 100, ledger_id)
+    yield registry
+    registry.close_all()
+
+
+def test_missing_ledger_file_is_not_created(tmp_path):
+    registry = LedgerRegistry({'typo': 'smtih.db'}, base_dir=str(tmp_path))
+
+    with pytest.raises(FileNotFoundError):
+        registry.pool('typo')
+    for parallel in (False, True):
+        with pytest.raises(RuntimeError, match="typo"):
+            registry.map_ledgers(get_period_totals, (MONTH,), parallel=parallel)
+    registry.close_all()
+    assert not (tmp_path / 'smtih.db').exists()
+
+
+def test_serial_and_parallel_see_external_writes(registry):
+    def rent():
+        results = {}
+        for parallel in (False, True):
+            totals = registry.map_ledgers(get_period_totals, (MONTH,), parallel=parallel)
+            results[parallel] = {ledger_id: t[0][('expense', 'Rent')] for ledger_id, t in totals.items()}
+        assert results[False] == results[True]
+        return results[False]
+
+    assert rent() == {'jones': (10000, 1), 'smith': (10000, 1)}
+
+    # Another process (e.g. a CLI import) writes to one ledger
+    other = sqlite3.connect(registry.path('smith'))
+    with other:
+        other.execute("INSERT INTO transactions (date, type, category, amount_cents, description) "
+                      "VALUES ('2026-10-02', 'expense', 'Rent', 5000, 'cron')")
+    other.close()
+
+    assert rent() == {'jones': (10000, 1), 'smith': (15000, 2)}
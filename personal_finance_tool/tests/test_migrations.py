@@ -0,0 +1,44 @@
+# tests/test_migrations.py
+import sqlite3
+
+from personal_finance_tool.core import database
+
+
+def test_baseline_database_migrates_to_current_schema(tmp_path):
+    # A database written before schema versioning: user_version 0, REAL dollars
+    path = str(tmp_path / 'baseline.db')
+    conn = sqlite3.connect(path)
+    conn.executescript('''
+        CREATE TABLE transactions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date TEXT NOT NULL,
+            type TEXT NOT NULL,
+            category TEXT NOT NULL,
+            amount REAL NOT NULL,
+            description TEXT
+        );
+        CREATE TABLE budgets (
+            category TEXT PRIMARY KEY,
+            limit_amount REAL NOT NULL DEFAULT 0
+        );
+        INSERT INTO transactions (date, type, category, amount, description) VALUES
+            ('2024-01-05', 'expense', 'Groceries', 0.285, 'gum'),
+            ('2024-01-06', 'expense', 'Groceries', 19.99, 'market'),
+            ('2024-01-31', 'income', 'Salary', 2500.1, 'pay'),
+            ('2024-02-01', 'expense', 'Rent', 1.005, 'fee');
+        INSERT INTO budgets (category, limit_amount) VALUES ('Groceries', 150.575), ('Rent', 0);
+    ''')
+    conn.close()
+
+    pool = database.ConnectionPool(path)
+    with database.use_pool(pool):
+        assert database.init_db() == 0
+        conn = database.get_db_connection()
+
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == database.SCHEMA_VERSION
+        assert conn.execute("SELECT amount_cents FROM transactions ORDER BY id").fetchall() == [
+            (29,), (1999,), (250010,), (101,)]
+        assert dict(conn.execute("SELECT category, limit_cents FROM budgets")) == {'Groceries': 15058, 'Rent': 0}
+        assert database.verify_monthly_totals() == []
+        assert database.get_category_spending('Groceries', '2024-01') == 20.28
+    pool.close_all()
@@ -0,0 +1,74 @@
+# tests/test_periods.py
+import pytest
+
+from personal_finance_tool.core import database, periods
+
+
+def test_month_range_splits_into_whole_and_partial_months():
+    period = periods.date_range('2024-01-15', '2024-04-10')
+
+    assert period.pieces() == (
+        ['2024-02', '2024-03'],
+        [('2024-01-15', '2024-02-01'), ('2024-04-01', '2024-04-11')]
+    )
+    assert period.months == ['2024-01', '2024-02', '2024-03', '2024-04']
+
+
+def test_range_inside_one_month_is_a_single_partial_piece():
+    assert periods.date_range('2024-02-10', '2024-02-20').pieces() == ([], [('2024-02-10', '2024-02-21')])
+
+
+def test_calendar_periods_are_whole_months():
+    assert periods.quarter(2024, 4).pieces() == (['2024-10', '2024-11', '2024-12'], [])
+    assert periods.year(2024).budget_months == 12.0
+
+
+@pytest.mark.parametrize('spec, kind, start, end', [
+    ('2024-06', 'month', '2024-06-01', '2024-07-01'),
+    ('2024-Q1', 'quarter', '2024-01-01', '2024-04-01'),
+    ('2024', 'year', '2024-01-01', '2025-01-01'),
+    ('2024-02-27..2024-03-02', 'range', '2024-02-27', '2024-03-03'),
+])
+def test_parse_period(spec, kind, start, end):
+    period = periods.parse_period(spec)
+    assert (period.kind, period.start, period.end) == (kind, start, end)
+
+
+def test_parse_period_rejects_unknown_specs():
+    with pytest.raises(ValueError):
+        periods.parse_period('June')
+
+
+def test_period_totals_match_direct_sums(db):
+    for day, amount in [('2024-01-10', 1), ('2024-01-20', 2), ('2024-02-05', 4),
+                        ('2024-03-31', 8), ('2024-04-01', 16)]:
+        database.add_transaction(day, 'expense', 'Groceries', amount, 'x')
+    requested = [periods.date_range('2024-01-15', '2024-03-31'), periods.month('2024-01'), periods.year(2024)]
+
+    totals = periods.get_period_totals(requested)
+
+    assert [t[('expense', 'Groceries')] for t in totals] == [(1400, 3), (300, 2), (3100, 5)]
+
+
+@pytest.mark.parametrize('spec, phrase', [
+    ('2024-06', 'in 2024-06'),
+    ('2024-Q2', 'in 2024-Q2'),
+    ('2024', 'in 2024'),
+    ('2024-01-15..2024-03-10', 'from 2024-01-15 to 2024-03-10'),
+    ('90d', 'in the last 90 days'),
+])
+def test_text_report_names_its_period(db, spec, phrase):
+    from personal_finance_tool.core.report_data import format_text_report, get_period_reports
+
+    assert periods.as_period(spec).phrase == phrase
+    report, = get_period_reports([spec])
+    assert f"You saved money {phrase}!" in format_text_report(report, spec)
+    assert periods.as_period(None).phrase == 'this month'
+
+
+def test_cli_rejects_month_with_period(capsys):
+    from personal_finance_tool.cli import main
+
+    with pytest.raises(SystemExit):
+        main(['report', '--period', '2024-Q2', '--month', '2024-06'])
+    assert 'not allowed with' in capsys.readouterr().err
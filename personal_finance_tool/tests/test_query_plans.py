@@ -0,0 +1,17 @@
+# tests/test_query_plans.py
+import pytest
+
+from personal_finance_tool.benchmarks.check_query_plans import MONTH, check_plans, month_query_calls
+from personal_finance_tool.core import database
+
+CALLS = month_query_calls()
+
+
+@pytest.mark.parametrize('name, call', CALLS, ids=[name for name, _ in CALLS])
+def test_month_queries_are_index_searches(db, name, call):
+    database.add_transaction(f'{MONTH}-15', 'expense', 'Groceries', 42.0, 'check')
+
+    results = check_plans(db.acquire(), [(name, call)])
+
+    assert results, f"{name} ran no queries"
+    assert [(sql, scans) for _, sql, scans in results if scans] == []
@@ -0,0 +1,23 @@
+# tests/test_search.py
+from personal_finance_tool.core import database
+
+
+def test_pages_cover_every_match_once_across_the_rank_window(insert_rows, monkeypatch):
+    monkeypatch.setattr(database, 'SEARCH_RANK_WINDOW', 5)
+    insert_rows([(f'2024-06-{day:02d}', 'expense', 'Dining', 100, f'coffee {day}') for day in range(1, 13)]
+                + [('2024-06-15', 'expense', 'Rent', 100000, 'landlord')])
+
+    pages = [database.search_transactions('coff', limit=4, offset=offset) for offset in range(0, 16, 4)]
+    ids = [row[0] for page in pages for row in page]
+
+    assert [len(page) for page in pages] == [4, 4, 4, 0]
+    assert sorted(ids) == list(range(1, 13))
+    # Past the ranked window, older matches follow newest first
+    assert ids[5:] == sorted(ids[5:], reverse=True)
+
+
+def test_search_sees_new_transactions(db):
+    database.add_transaction('2024-06-01', 'expense', 'Dining', 5, 'Café Nero')
+
+    assert [row[5] for row in database.search_transactions('cafe')] == ['Café Nero']
+    assert database.search_transactions('   ') == []
@@ -1,19 +1,26 @@
 # ui/dialogs.py
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog, scrolledtext
+from tkinter import ttk, messagebox, simpledialog, scrolledtext, filedialog
 from datetime import datetime
-import sqlite3
-from ..core.budget import check_budget_alerts
-from ..core.database import (
-    get_db_connection, 
-    get_transactions_for_month, 
+from core.budget import get_budgeted_snapshot
+from core.balance import get_transactions_page_with_balance
+from core.database import (
+    add_transaction as db_add_transaction,
+    search_transactions,
     get_all_categories, 
     add_category as db_add_category,
     delete_category as db_delete_category,
-    get_category_budgets,
-    get_category_spending,
-    set_category_budget
+    get_budget_snapshot,
+    set_category_budget,
+    get_cache_stats
 )
+from core.profiler import get_profiler, profiled_action
+
+
+def _row_values(row):
+    """Treeview values for a transaction row; no balance shows as blank, not 'None'."""
+    return tuple('' if value is None else value for value in row[1:])
+
 
 class AddTransactionTab:
     def __init__(self, app, frame):
@@ -41,7 +48,6 @@ class AddTransactionTab:
         tk.Label(entry_frame, text="Category:", bg="#f9f9f9").grid(row=1, column=0, sticky="w")
         self.category_combo = ttk.Combobox(entry_frame, state="readonly", width=15)
         self.category_combo.grid(row=1, column=1, padx=5, pady=2)
-        self.refresh_categories()
 
         tk.Button(entry_frame, text="Add Custom", command=self.add_category, bg="#4CAF50", fg="white").grid(row=1, column=2, padx=5)
         tk.Button(entry_frame, text="Delete", command=self.delete_category, bg="#f44336", fg="white").grid(row=1, column=3, padx=5)
@@ -60,12 +66,18 @@ class AddTransactionTab:
         tk.Button(entry_frame, text="➕ Add Transaction", command=self.add_transaction,
                 bg="#2196F3", fg="white", font=("bold")).grid(row=4, column=0, columnspan=5, pady=15)
 
+    @profiled_action
     def refresh_categories(self):
         categories = get_all_categories()
+        selected = self.category_combo.get()
         self.category_combo['values'] = categories
-        if categories:
+        if selected in categories:
+            # Keep the user's choice, e.g. one picked from the budget tab
+            self.category_combo.set(selected)
+        elif categories:
             self.category_combo.current(0)
 
+    @profiled_action
     def add_category(self):
         new_cat = simpledialog.askstring("Add Category", "Enter new category name:")
         if not new_cat:
@@ -76,12 +88,12 @@ class AddTransactionTab:
             return
 
         if db_add_category(new_cat):
-            self.refresh_categories()
             self.app.refresh_categories()
             messagebox.showinfo("Success", f"✅ Category '{new_cat}' added!")
         else:
             messagebox.showwarning("Duplicate", f"Category '{new_cat}' already exists.")
 
+    @profiled_action
     def delete_category(self):
         categories = get_all_categories()
         if not categories:
@@ -101,11 +113,11 @@ class AddTransactionTab:
         success, message = db_delete_category(cat_to_delete)
         if success:
             messagebox.showinfo("Success", message)
-            self.refresh_categories()
             self.app.refresh_categories()
         else:
             messagebox.showerror("Cannot Delete", message)
 
+    @profiled_action
     def add_transaction(self):
         date = self.date_entry.get().strip()
         trans_type = self.type_var.get()
@@ -127,74 +139,256 @@ class AddTransactionTab:
             return
 
         # Insert into DB
-        conn = get_db_connection()
-        c = conn.cursor()
-        c.execute('''
-            INSERT INTO transactions (date, type, category, amount, description)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (date, trans_type, category, amount, desc))
-        conn.commit()
-        conn.close()
+        try:
+            db_add_transaction(date, trans_type, category, amount, desc)
+        except ValueError as e:
+            messagebox.showerror("Invalid Date", str(e))
+            return
 
         # Refresh UI
         self.app.refresh_transactions()
         self.app.refresh_budget_summary()
         self.amount_entry.delete(0, tk.END)
         self.desc_entry.delete(0, tk.END)
-        check_budget_alerts()  # Check if budget exceeded
+        # Budget alerts come from the alert engine (see FinanceApp.on_budget_alert)
         messagebox.showinfo("Success", "✅ Transaction added!")
 
 
 class ViewTransactionsTab:
+    PAGE_SIZE = 200        # rows fetched per page
+    LOAD_MORE_AT = 0.9     # scroll fraction that triggers the next page
+    SEARCH_DELAY_MS = 250  # typing pause before a search runs
+
     def __init__(self, app, frame):
         self.app = app
         self.frame = frame
+        self.month = None
+        self.rows = {}             # Treeview iid (transaction id) -> displayed values
+        self.last_key = None       # (date, id) of the oldest loaded row
+        self.exhausted = False     # True once the whole month is loaded
+        self.loading = False       # a page or refresh query is in flight
+        self.refresh_pending = False
+        self.search_text = ""      # active search; empty shows the month
+        self.search_job = None     # pending debounced search (after() id)
+        self.generation = 0        # bumped when the list changes source; late results are dropped
+        self.search_offset = 0
+        self.search_exhausted = False
+        self.search_loading = False
         self.create_widgets()
 
     def create_widgets(self):
+        # Search box: searches descriptions and categories across all months
+        search_frame = tk.Frame(self.frame)
+        search_frame.pack(fill="x", padx=10, pady=(10, 0))
+        tk.Label(search_frame, text="🔍 Search:").pack(side="left")
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add("write", self.on_search_changed)
+        search_entry = tk.Entry(search_frame, textvariable=self.search_var, width=40)
+        search_entry.pack(side="left", padx=5)
+        search_entry.bind("<Escape>", lambda e: self.search_var.set(""))
+
         # Transactions List
-        list_frame = tk.LabelFrame(self.frame, text="Transactions This Month", padx=10, pady=10)
-        list_frame.pack(padx=10, pady=10, fill="both", expand=True)
+        self.list_frame = tk.LabelFrame(self.frame, text="Transactions This Month", padx=10, pady=10)
+        self.list_frame.pack(padx=10, pady=10, fill="both", expand=True)
 
-        self.tree = ttk.Treeview(list_frame, columns=("Date", "Type", "Category", "Amount", "Desc"), show="headings")
+        self.tree = ttk.Treeview(self.list_frame, columns=("Date", "Type", "Category", "Amount", "Desc", "Balance"), show="headings")
         self.tree.heading("Date", text="Date")
         self.tree.heading("Type", text="Type")
         self.tree.heading("Category", text="Category")
         self.tree.heading("Amount", text="Amount ($)")
         self.tree.heading("Desc", text="Description")
+        self.tree.heading("Balance", text="Balance ($)")
 
         self.tree.column("Date", width=100)
         self.tree.column("Type", width=80)
         self.tree.column("Category", width=120)
         self.tree.column("Amount", width=100)
         self.tree.column("Desc", width=250)
+        self.tree.column("Balance", width=100)
 
         self.tree.pack(fill="both", expand=True)
 
-        # Scrollbar
-        scroll = tk.Scrollbar(self.tree, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scroll.set)
-        scroll.pack(side="right", fill="y")
+        # Scrollbar (also drives loading of further pages)
+        self.scroll = tk.Scrollbar(self.tree, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self.on_tree_scroll)
+        self.scroll.pack(side="right", fill="y")
+
+    def on_tree_scroll(self, first, last):
+        """Update the scrollbar and fetch the next page when nearing the end."""
+        self.scroll.set(first, last)
+        if float(last) >= self.LOAD_MORE_AT:
+            if self.search_text:
+                self.load_more_results()
+            else:
+                self.load_more()
+
+    # ==================== Search ====================
+    def on_search_changed(self, *args):
+        """Debounce typing: only the last keystroke in a pause runs a search."""
+        if self.search_job is not None:
+            self.frame.after_cancel(self.search_job)
+        self.search_job = self.frame.after(self.SEARCH_DELAY_MS, self.apply_search)
+
+    def apply_search(self):
+        self.search_job = None
+        text = self.search_var.get().strip()
+        if text == self.search_text:
+            return
+        self.search_text = text
+        if text:
+            self.start_search()
+        else:
+            # Back to the month view, reloaded from its first page
+            self.generation += 1
+            self.last_key = None
+            self.refresh_transactions()
+
+    @profiled_action
+    def start_search(self):
+        """Replace the list with the first page of search results."""
+        self.generation += 1
+        self.search_offset = 0
+        self.search_exhausted = False
+        self.search_loading = False
+        self.tree.delete(*self.tree.get_children())
+        self.rows = {}
+        self.load_more_results()
+
+    @profiled_action
+    def load_more_results(self):
+        if self.search_exhausted or self.search_loading:
+            return
+        self.search_loading = True
+        self.list_frame.config(text=f"Search results for “{self.search_text}” (loading…)")
+        generation = self.generation
+        self.app.executor.submit(
+            search_transactions, self.search_text, limit=self.PAGE_SIZE, offset=self.search_offset,
+            on_done=lambda rows: self.append_results(generation, rows), on_error=self.on_search_error
+        )
 
-        # Load data
-        self.refresh_transactions()
+    def append_results(self, generation, rows):
+        if generation != self.generation:
+            return  # results of an earlier search
+        self.search_loading = False
+        for row in rows:
+            iid, values = str(row[0]), row[1:]
+            if iid in self.rows:
+                continue  # shifted onto this page by an insert since the last one
+            self.tree.insert("", "end", iid=iid, values=values)
+            self.rows[iid] = values
+        self.search_offset += len(rows)
+        self.search_exhausted = len(rows) < self.PAGE_SIZE
+        more = "" if self.search_exhausted else "+"
+        self.list_frame.config(text=f"Search results for “{self.search_text}” ({len(self.rows)}{more})")
+
+    def on_search_error(self, error):
+        self.search_loading = False
+        self.list_frame.config(text=f"Search failed: {error}")
+
+    def set_loading(self, loading):
+        """Show or clear the loading state; runs a refresh requested meanwhile."""
+        self.loading = loading
+        if not self.search_text:
+            title = "Transactions This Month"
+            self.list_frame.config(text=f"{title} (loading…)" if loading else title)
+        if not loading and self.refresh_pending:
+            self.refresh_pending = False
+            self.refresh_transactions()
+
+    def on_load_error(self, error):
+        self.refresh_pending = False
+        self.set_loading(False)
+        self.list_frame.config(text=f"Transactions This Month (failed to load: {error})")
+
+    @profiled_action
+    def load_more(self):
+        """Fetch the next page of older transactions in the background."""
+        if self.exhausted or self.loading:
+            return
+        self.set_loading(True)
+        generation = self.generation
+        self.app.executor.submit(
+            get_transactions_page_with_balance, self.month, after=self.last_key, limit=self.PAGE_SIZE,
+            on_done=lambda rows: self.append_page(generation, rows), on_error=self.on_load_error
+        )
 
+    def append_page(self, generation, rows):
+        if generation != self.generation:
+            # Requested before a search started or ended; the month view
+            # reloads from its first page when it is shown again
+            self.set_loading(False)
+            return
+        for row in rows:
+            iid, values = str(row[0]), _row_values(row)
+            self.tree.insert("", "end", iid=iid, values=values)
+            self.rows[iid] = values
+        if rows:
+            self.last_key = (rows[-1][1], rows[-1][0])
+        self.exhausted = len(rows) < self.PAGE_SIZE
+        self.set_loading(False)
+
+    @profiled_action
     def refresh_transactions(self):
-        # Clear current rows
-        for row in self.tree.get_children():
-            self.tree.delete(row)
+        if self.search_text:
+            # Data changed while searching: re-run the search
+            self.start_search()
+            return
+        if self.loading:
+            # Coalesce with the load already in flight
+            self.refresh_pending = True
+            return
 
         current_month = datetime.now().strftime("%Y-%m")
-        transactions = get_transactions_for_month(current_month)
+        if current_month != self.month or self.last_key is None:
+            # New month (or nothing loaded yet): start over from the first page
+            self.tree.delete(*self.tree.get_children())
+            self.month = current_month
+            self.rows = {}
+            self.last_key = None
+            self.exhausted = False
+            self.load_more()
+            return
+
+        # Re-read only the loaded window and apply the difference, so an
+        # insert touches one Treeview row instead of rebuilding the list.
+        self.set_loading(True)
+        generation = self.generation
+        self.app.executor.submit(
+            get_transactions_page_with_balance, self.month, through=None if self.exhausted else self.last_key,
+            on_done=lambda rows: self.apply_refresh(generation, rows), on_error=self.on_load_error
+        )
+
+    def apply_refresh(self, generation, rows):
+        if generation != self.generation:
+            self.set_loading(False)
+            return
+        fresh = {str(row[0]): _row_values(row) for row in rows}
 
-        for row in transactions:
-            self.tree.insert("", "end", values=row)
+        # Rows that were deleted, or whose date moved them, come out first
+        for iid in [iid for iid, values in self.rows.items()
+                    if iid not in fresh or fresh[iid][0] != values[0]]:
+            self.tree.delete(iid)
+            del self.rows[iid]
+
+        for index, row in enumerate(rows):
+            iid, values = str(row[0]), _row_values(row)
+            if iid not in self.rows:
+                self.tree.insert("", index, iid=iid, values=values)
+                self.rows[iid] = values
+            elif self.rows[iid] != values:
+                self.tree.item(iid, values=values)
+                self.rows[iid] = values
+        self.set_loading(False)
 
 
 class BudgetStatusTab:
     def __init__(self, app, frame):
         self.app = app
         self.frame = frame
+        self.loading = False
+        self.refresh_pending = False
+        self.budget_rows = {}      # category -> BudgetRow
+        self.row_order = []        # categories in display order
         self.create_widgets()
 
     def create_widgets(self):
@@ -202,81 +396,89 @@ class BudgetStatusTab:
         self.budget_summary_frame = tk.Frame(self.frame, bg="#fff8e1")
         self.budget_summary_frame.pack(fill="both", expand=True, padx=10, pady=10)
 
+        # Loading / error status line (empty when idle)
+        self.status_label = tk.Label(self.budget_summary_frame, text="", bg="#fff8e1", fg="gray", font=("Helvetica", 9))
+        self.status_label.pack(anchor="e")
+
         # Placeholder for budget rows
         self.budget_rows_container = tk.Frame(self.budget_summary_frame, bg="#fff8e1")
         self.budget_rows_container.pack(fill="both", expand=True)
 
-        # Load data
-        self.refresh_budget_summary()
+        # Header row (shown while there are budgets)
+        self.header = tk.Frame(self.budget_rows_container, bg="#fff8e1")
+        tk.Label(self.header, text="Category", width=15, anchor="w", font=("Helvetica", 9, "bold"), bg="#fff8e1").pack(side="left")
+        tk.Label(self.header, text="Budget", width=10, anchor="center", font=("Helvetica", 9, "bold"), bg="#fff8e1").pack(side="left")
+        tk.Label(self.header, text="Spent", width=10, anchor="center", font=("Helvetica", 9, "bold"), bg="#fff8e1").pack(side="left")
+        tk.Label(self.header, text="Remaining", width=12, anchor="center", font=("Helvetica", 9, "bold"), bg="#fff8e1").pack(side="left")
+        tk.Label(self.header, text="Progress", width=20, anchor="center", font=("Helvetica", 9, "bold"), bg="#fff8e1").pack(side="left")
 
-    def refresh_budget_summary(self):
-        """Refresh the budget summary panel with current month's data."""
-        # Clear previous rows
-        for widget in self.budget_rows_container.winfo_children():
-            widget.destroy()
+        self.empty_label = tk.Label(self.budget_rows_container, text="No budgets set.", bg="#fff8e1", fg="gray", font=("Helvetica", 12))
 
-        budgets = get_category_budgets()
-        budgets_with_limits = [(cat, limit) for cat, limit in budgets if limit > 0]
+        # Category rows live in their own frame, below the header
+        self.rows_frame = tk.Frame(self.budget_rows_container, bg="#fff8e1")
+        self.rows_frame.pack(fill="x")
 
-        if not budgets_with_limits:
-            tk.Label(self.budget_rows_container, text="No budgets set.", bg="#fff8e1", fg="gray", font=("Helvetica", 12)).pack(pady=20)
+    @profiled_action
+    def refresh_budget_summary(self):
+        """Reload the current month's budget data in the background."""
+        if self.loading:
+            # Coalesce with the load already in flight
+            self.refresh_pending = True
             return
-
-        # Header row
-        header = tk.Frame(self.budget_rows_container, bg="#fff8e1")
-        header.pack(fill="x", pady=5)
-        tk.Label(header, text="Category", width=15, anchor="w", font=("Helvetica", 9, "bold"), bg="#fff8e1").pack(side="left")
-        tk.Label(header, text="Budget", width=10, anchor="center", font=("Helvetica", 9, "bold"), bg="#fff8e1").pack(side="left")
-        tk.Label(header, text="Spent", width=10, anchor="center", font=("Helvetica", 9, "bold"), bg="#fff8e1").pack(side="left")
-        tk.Label(header, text="Remaining", width=12, anchor="center", font=("Helvetica", 9, "bold"), bg="#fff8e1").pack(side="left")
-        tk.Label(header, text="Progress", width=20, anchor="center", font=("Helvetica", 9, "bold"), bg="#fff8e1").pack(side="left")
-
-        # Add each category row
-        current_month = datetime.now().strftime("%Y-%m")
-        for category, limit in budgets_with_limits:
-            spent = get_category_spending(category, current_month)
-            remaining = limit - spent
-
-            # Create clickable row
-            row = tk.Frame(self.budget_rows_container, bg="#fff8e1", pady=3, relief="solid", bd=1)
-            row.pack(fill="x", padx=2, pady=1)
-            
-            # Make the entire row clickable
-            row.bind("<Button-1>", lambda e, cat=category: self.on_category_click(cat))
-            
-            # Category label (clickable)
-            cat_label = tk.Label(row, text=category, width=15, anchor="w", bg="#fff8e1", cursor="hand2")
-            cat_label.pack(side="left")
-            cat_label.bind("<Button-1>", lambda e, cat=category: self.on_category_click(cat))
-
-            # Budget amount
-            budget_label = tk.Label(row, text=f"${limit:.2f}", width=10, anchor="center", bg="#fff8e1")
-            budget_label.pack(side="left")
-
-            # Spent amount
-            spent_label = tk.Label(row, text=f"${spent:.2f}", width=10, anchor="center", bg="#fff8e1")
-            spent_label.pack(side="left")
-
-            # Remaining amount (color-coded)
-            remaining_label = tk.Label(row, text=f"${remaining:.2f}", width=12, anchor="center", bg="#fff8e1",
-                                     fg="red" if remaining < 0 else "green")
-            remaining_label.pack(side="left")
-
-            # Progress bar
-            bar_frame = tk.Frame(row, width=100, height=15, bg="lightgray")
-            bar_frame.pack(side="left", padx=5)
-            bar_frame.pack_propagate(False)
-
-            if limit > 0:
-                pct = min(100, max(0, (spent / limit) * 100))
-                color = "green" if pct <= 100 else "red"
-                bar = tk.Frame(bar_frame, bg=color, width=pct, height=15)
-                bar.pack(side="left", fill="y")
-                bar.pack_propagate(False)
-
-                # Show % label
-                pct_label = tk.Label(bar_frame, text=f"{pct:.0f}%", font=("Helvetica", 7), bg="white")
-                pct_label.pack(side="right")
+        self.loading = True
+        self.status_label.config(text="⏳ Loading…", fg="gray")
+        self.app.executor.submit(get_budgeted_snapshot, on_done=self.render_budget_summary,
+                                 on_error=self.on_load_error)
+
+    def on_load_error(self, error):
+        self.loading = False
+        self.refresh_pending = False
+        self.status_label.config(text=f"⚠️ Failed to load budgets: {error}", fg="red")
+
+    def render_budget_summary(self, snapshot):
+        """
+        Bring the budget summary panel in line with a budget snapshot.
+        Rows are kept per category and only changed ones are touched.
+        """
+        self.loading = False
+        if self.refresh_pending:
+            # Data changed while this snapshot was loading; skip the stale one
+            self.refresh_pending = False
+            self.refresh_budget_summary()
+            return
+        self.status_label.config(text="")
+
+        if not snapshot:
+            self.header.pack_forget()
+            for row in self.budget_rows.values():
+                row.frame.destroy()
+            self.budget_rows = {}
+            self.row_order = []
+            self.empty_label.pack(pady=20)
+            return
+        self.empty_label.pack_forget()
+        if not self.header.winfo_manager():
+            self.header.pack(fill="x", pady=5, before=self.rows_frame)
+
+        # Drop rows for categories that no longer have a budget
+        categories = [entry['category'] for entry in snapshot]
+        for category in set(self.budget_rows) - set(categories):
+            self.budget_rows.pop(category).frame.destroy()
+        self.row_order = [category for category in self.row_order if category in self.budget_rows]
+
+        for entry in snapshot:
+            row = self.budget_rows.get(entry['category'])
+            if row is None:
+                row = self.budget_rows[entry['category']] = BudgetRow(self, entry['category'])
+            row.update(entry['budget'], entry['spent'], entry['remaining'])
+
+        # Repack only when categories were added or reordered
+        if categories != self.row_order:
+            for category in self.row_order:
+                self.budget_rows[category].frame.pack_forget()
+            for category in categories:
+                self.budget_rows[category].frame.pack(fill="x", padx=2, pady=1)
+            self.row_order = categories
 
     def on_category_click(self, category):
         """Handle click on category row - switch to Add Transaction tab and pre-select category."""
@@ -290,11 +492,13 @@ class BudgetStatusTab:
         # Focus on amount field for quick entry
         add_tab.amount_entry.focus_set()
 
+    @profiled_action
     def view_budgets(self):
         """Show a popup window with all category budgets and current spending."""
-        budgets = get_category_budgets()
+        current_month = datetime.now().strftime("%Y-%m")
+        snapshot = get_budget_snapshot(current_month)
         
-        if not budgets:
+        if not snapshot:
             messagebox.showinfo("Budgets", "No categories found.")
             return
 
@@ -303,11 +507,10 @@ class BudgetStatusTab:
         header += "-" * 50 + "\n"
 
         lines = [header]
-        current_month = datetime.now().strftime("%Y-%m")
 
-        for category, limit in budgets:
-            spent = get_category_spending(category, current_month)
-            remaining = limit - spent
+        for entry in snapshot:
+            category, limit = entry['category'], entry['budget']
+            spent, remaining = entry['spent'], entry['remaining']
 
             # Format line
             line = f"{category:<15} ${limit:<9.2f} ${spent:<9.2f} "
@@ -334,4 +537,155 @@ class BudgetStatusTab:
         text_widget.config(state=tk.DISABLED)  # Read-only
 
         # Close button
-        tk.Button(top, text="Close", command=top.destroy, bg="#f44336", fg="white").pack(pady=5)
\ No newline at end of file
+        tk.Button(top, text="Close", command=top.destroy, bg="#f44336", fg="white").pack(pady=5)
+
+
+class BudgetRow:
+    """One category's row in the budget summary, updated in place."""
+
+    BAR_WIDTH = 100
+
+    def __init__(self, tab, category):
+        # Create clickable row
+        self.frame = tk.Frame(tab.rows_frame, bg="#fff8e1", pady=3, relief="solid", bd=1)
+        self.frame.bind("<Button-1>", lambda e: tab.on_category_click(category))
+
+        # Category label (clickable)
+        cat_label = tk.Label(self.frame, text=category, width=15, anchor="w", bg="#fff8e1", cursor="hand2")
+        cat_label.pack(side="left")
+        cat_label.bind("<Button-1>", lambda e: tab.on_category_click(category))
+
+        self.budget_label = tk.Label(self.frame, width=10, anchor="center", bg="#fff8e1")
+        self.budget_label.pack(side="left")
+        self.spent_label = tk.Label(self.frame, width=10, anchor="center", bg="#fff8e1")
+        self.spent_label.pack(side="left")
+        self.remaining_label = tk.Label(self.frame, width=12, anchor="center", bg="#fff8e1")
+        self.remaining_label.pack(side="left")
+
+        # Progress bar
+        bar_frame = tk.Frame(self.frame, width=self.BAR_WIDTH, height=15, bg="lightgray")
+        bar_frame.pack(side="left", padx=5)
+        bar_frame.pack_propagate(False)
+        self.bar = tk.Frame(bar_frame, bg="green", width=0, height=15)
+        self.bar.pack(side="left", fill="y")
+        self.bar.pack_propagate(False)
+        self.pct_label = tk.Label(bar_frame, font=("Helvetica", 7), bg="white")
+        self.pct_label.pack(side="right")
+
+        self.values = None
+
+    def update(self, limit, spent, remaining):
+        """Apply new amounts. Returns: True if anything changed"""
+        values = (limit, spent, remaining)
+        if values == self.values:
+            return False
+        self.values = values
+
+        self.budget_label.config(text=f"${limit:.2f}")
+        self.spent_label.config(text=f"${spent:.2f}")
+        self.remaining_label.config(text=f"${remaining:.2f}", fg="red" if remaining < 0 else "green")
+
+        pct = min(100, max(0, (spent / limit) * 100)) if limit > 0 else 0
+        self.bar.config(width=round(pct * self.BAR_WIDTH / 100), bg="green" if spent <= limit else "red")
+        self.pct_label.config(text=f"{pct:.0f}%" if limit > 0 else "")
+        return True
+
+
+class PerformanceDialog:
+    """Window showing what the query profiler has recorded (see core/profiler.py)."""
+
+    COLUMNS = ('calls', 'total_ms', 'mean_ms', 'max_ms', 'rows', 'slow')
+
+    def __init__(self, app):
+        self.app = app
+        self.profiler = get_profiler()
+
+        self.top = tk.Toplevel(app.root)
+        self.top.title("⏱ Performance")
+        self.top.geometry("900x500")
+        self.create_widgets()
+        self.refresh()
+
+    def create_widgets(self):
+        controls = tk.Frame(self.top)
+        controls.pack(fill="x", padx=10, pady=5)
+
+        self.enabled_var = tk.BooleanVar(value=self.profiler.enabled)
+        tk.Checkbutton(controls, text="Record queries", variable=self.enabled_var,
+                       command=self.toggle_recording).pack(side="left")
+
+        tk.Label(controls, text="Slow query threshold (ms):").pack(side="left", padx=(15, 2))
+        self.threshold_entry = tk.Entry(controls, width=6)
+        self.threshold_entry.insert(0, f"{self.profiler.slow_query_ms:g}")
+        self.threshold_entry.pack(side="left")
+        tk.Button(controls, text="Apply", command=self.apply_threshold).pack(side="left", padx=2)
+
+        tk.Button(controls, text="Close", command=self.top.destroy, bg="#f44336", fg="white").pack(side="right", padx=2)
+        tk.Button(controls, text="Save Trace...", command=self.save_trace).pack(side="right", padx=2)
+        tk.Button(controls, text="Clear", command=self.clear).pack(side="right", padx=2)
+        tk.Button(controls, text="Refresh", command=self.refresh).pack(side="right", padx=2)
+
+        self.stats_label = tk.Label(self.top, text="", fg="gray", font=("Helvetica", 9))
+        self.stats_label.pack(anchor="w", padx=10)
+
+        notebook = ttk.Notebook(self.top)
+        notebook.pack(fill="both", expand=True, padx=10, pady=5)
+        self.trees = {}
+        for key, title in (('action', "By Action"), ('sql', "By Query")):
+            frame = tk.Frame(notebook)
+            notebook.add(frame, text=title)
+            tree = ttk.Treeview(frame, columns=(key,) + self.COLUMNS, show="headings")
+            tree.heading(key, text="Action" if key == 'action' else "SQL")
+            tree.column(key, width=380, anchor="w")
+            for column in self.COLUMNS:
+                tree.heading(column, text=column.replace('_', ' '))
+                tree.column(column, width=70, anchor="e")
+            scroll = ttk.Scrollbar(frame, orient="vertical", command=tree.yview)
+            tree.configure(yscrollcommand=scroll.set)
+            tree.pack(side="left", fill="both", expand=True)
+            scroll.pack(side="right", fill="y")
+            self.trees[key] = tree
+
+    def toggle_recording(self):
+        self.profiler.enabled = self.enabled_var.get()
+
+    def apply_threshold(self):
+        try:
+            self.profiler.slow_query_ms = float(self.threshold_entry.get())
+        except ValueError:
+            messagebox.showerror("Invalid Threshold", "Please enter a number of milliseconds.", parent=self.top)
+
+    def refresh(self):
+        for key, tree in self.trees.items():
+            tree.delete(*tree.get_children())
+            for group in self.profiler.summary(key):
+                tree.insert("", "end", values=(
+                    group[key], group['calls'], f"{group['total_ms']:.2f}", f"{group['mean_ms']:.2f}",
+                    f"{group['max_ms']:.2f}", group['rows'], group['slow']
+                ))
+
+        cache = get_cache_stats()
+        executor = self.app.executor.stats
+        refresh = self.app.scheduler.stats
+        self.stats_label.config(text=(
+            f"{len(self.profiler.records)} queries recorded   |   "
+            f"cache: {cache['hits']} hits, {cache['misses']} misses ({cache['hit_rate']:.0%})   |   "
+            f"view refreshes: {refresh['refreshes']} for {refresh['requests']} requests   |   "
+            f"UI frames over budget: {executor['frames_over_budget']} of {executor['frames']} "
+            f"(max {executor['max_frame_ms']:.1f} ms)"
+        ))
+
+    def clear(self):
+        self.profiler.clear()
+        self.refresh()
+
+    def save_trace(self):
+        path = filedialog.asksaveasfilename(
+            parent=self.top, title="Save Trace", defaultextension=".json",
+            filetypes=[("Chrome trace", "*.json")]
+        )
+        if not path:
+            return
+        events = self.profiler.dump_trace(path)
+        messagebox.showinfo("Trace Saved", f"Wrote {events} events to {path}.\n"
+                            "Open it in chrome://tracing or ui.perfetto.dev.", parent=self.top)
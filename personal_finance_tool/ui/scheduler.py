@@ -0,0 +1,64 @@
+# ui/scheduler.py
+import tkinter as tk
+from core.profiler import get_profiler
+
+
+class RefreshScheduler:
+    """
+    Coalesces view refreshes into one pass on the next idle tick.
+
+    Views are registered by name with their refresh function and, for views
+    inside a notebook tab, the tab's frame. mark_dirty() only records that a
+    view is stale; however many times it is called before Tk goes idle, each
+    view refreshes at most once. Views on hidden tabs stay dirty until their
+    tab is selected.
+    """
+
+    def __init__(self, root, notebook=None):
+        self.root = root
+        self.notebook = notebook
+        self.views = {}        # name -> (refresh function, tab frame or None)
+        self.dirty = {}        # name -> profiler actions that first marked it
+        self.scheduled = False
+        self.stats = {'requests': 0, 'refreshes': 0, 'deferred': 0}
+        if notebook is not None:
+            notebook.bind("<<NotebookTabChanged>>", lambda e: self.schedule(), add="+")
+
+    def register(self, name, refresh, frame=None):
+        """Add a view; frame is its notebook tab, or None if always visible."""
+        self.views[name] = (refresh, frame)
+
+    def mark_dirty(self, *names):
+        """Mark views (default: all) stale and schedule a refresh pass."""
+        actions = get_profiler().current_actions()
+        for name in names or self.views:
+            self.stats['requests'] += 1
+            self.dirty.setdefault(name, actions)
+        self.schedule()
+
+    def schedule(self):
+        if self.dirty and not self.scheduled:
+            self.scheduled = True
+            self.root.after_idle(self.flush)
+
+    def is_visible(self, frame):
+        if frame is None or self.notebook is None:
+            return True
+        try:
+            return self.notebook.select() == str(frame)
+        except tk.TclError:
+            return False
+
+    def flush(self):
+        """Refresh every dirty, visible view once."""
+        self.scheduled = False
+        profiler = get_profiler()
+        for name, actions in list(self.dirty.items()):
+            refresh, frame = self.views[name]
+            if not self.is_visible(frame):
+                self.stats['deferred'] += 1
+                continue
+            del self.dirty[name]
+            self.stats['refreshes'] += 1
+            with profiler.resume(actions):
+                refresh()